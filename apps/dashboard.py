@@ -11,9 +11,12 @@ from typing import Any, Callable, Optional
 from dash import Dash, Input, Output, State, dcc, html, ctx
 
 from vsensor import registers as REG
+from vsensor.adaptive import AdaptiveRate
+from vsensor.cache import RegisterCache
 from vsensor.client import VSensorClient
 from vsensor.config import Config
 from vsensor.errors import TimeoutError, TransportError, VSensorError
+from vsensor.poller import Poller
 
 
 logger = logging.getLogger(__name__)
@@ -23,17 +26,27 @@ logger = logging.getLogger(__name__)
 class _Ctx:
     cfg: dict[str, Any]
     client: Optional[VSensorClient] = None
+    poller: Optional[Poller] = None
 
 
 CTX = _Ctx(cfg={k.upper(): v for k, v in asdict(Config.from_env()).items()})
 
 
 def _try_connect(cfg: dict[str, Any]) -> tuple[Optional[VSensorClient], str]:
-    """Try to create a client with retries."""
+    """Try to create a client with retries.
+
+    Clients acquire the serial port from the shared transport registry, so a
+    retry or reconnect reuses an already open port instead of reopening it.
+    Settings left as prefilled come from the stored profile of the selected
+    device, if there is one.
+    """
     err = ""
+    keep = [k.lower() for k, v in cfg.items() if v != CTX.cfg.get(k)]
     for delay in (0.0, 0.2, 0.5):
         try:
-            client = VSensorClient(Config(**cfg))
+            config = Config(**{k.lower(): v for k, v in cfg.items()})
+            config.apply_profile(keep)
+            client = VSensorClient(config, cache=RegisterCache())
             client.connect()
             return client, ""
         except Exception as exc:  # pragma: no cover - hardware specific
@@ -43,6 +56,18 @@ def _try_connect(cfg: dict[str, Any]) -> tuple[Optional[VSensorClient], str]:
     return None, err
 
 
+def _disconnect() -> None:
+    """Stop polling and release the active client."""
+    if CTX.poller is not None:
+        CTX.poller.stop()
+        CTX.poller = None
+    if CTX.client is not None:
+        try:
+            CTX.client.close()
+        finally:
+            CTX.client = None
+
+
 def _call(
     state: dict[str, Any], func: Callable[[VSensorClient], Any]
 ) -> tuple[Any | None, dict[str, Any]]:
@@ -55,10 +80,7 @@ def _call(
         return result, {**state, "error": ""}
     except (TimeoutError, TransportError, VSensorError) as exc:
         logger.info("client error: %s", exc)
-        try:
-            client.close()
-        finally:
-            CTX.client = None
+        _disconnect()
         return None, {"connected": False, "error": str(exc)}
 
 
@@ -303,8 +325,14 @@ def connect(_, __, port, slave, baud, parity, stopbits, ff, state):
     if client is None:
         state = {"connected": False, "error": err}
         return state, True, 0, 0
+    _disconnect()
     CTX.client = client
-    CTX.cfg.update(cfg)
+    # One poller serves every browser tab; update_view never touches the bus.
+    # It polls faster while values move and backs off to poll_interval.
+    adaptive = AdaptiveRate(max_interval=max(client.cfg.poll_interval, 0.1))
+    CTX.poller = Poller(client, adaptive=adaptive)
+    CTX.poller.start()
+    CTX.cfg.update({k: getattr(client.cfg, k.lower()) for k in cfg})
     state = {"connected": True, "error": ""}
     return state, False, 0, 0
 
@@ -321,21 +349,24 @@ def connect(_, __, port, slave, baud, parity, stopbits, ff, state):
     State("state", "data"),
 )
 def update_view(_, state):
-    def read_all(c: VSensorClient):
-        return (
-            c.read_pressure(),
-            c.read_output(),
-            c.read_auto_setpoint(),
-            c.read_mode().name,
-            c.read_u16(REG.HEARTBEAT),
-        )
-
-    values, state = _call(state, read_all)
-    if values is None:
+    poller = CTX.poller if state.get("connected") else None
+    snap = poller.latest() if poller is not None else None
+    if poller is not None:
+        error = poller.last_error
+        if not error and poller.adaptive is not None and poller.adaptive.stalled:
+            error = "HEARTBEAT steht"
+        state = {**state, "error": error}
+    if snap is None:
         vals = ["—", "—", "—", "—", "—"]
     else:
-        p, o, sp, mode, hb = values
-        vals = [f"{p:.1f}", f"{o:.1f} %", f"{sp:.1f}", mode, hb]
+        t = snap.telemetry
+        vals = [
+            f"{t.pressure_pa:.1f}",
+            f"{t.output_percent:.1f} %",
+            f"{t.auto_setpoint:.1f}",
+            t.mode.name,
+            snap.heartbeat,
+        ]
     status = (
         f"Verbunden – {CTX.cfg['PORT']}, ID {CTX.cfg['SLAVE_ID']}, FF {CTX.cfg['FLOAT_FORMAT']}"
         if state.get("connected")
@@ -0,0 +1,182 @@
+"""Benchmark suite against a bus-timing-accurate simulated RTU line.
+
+Uses :class:`vsensor.simulation.SimulatedTransport`, which sleeps for the
+wire time of every frame, so the figures approximate a real RS-485 line
+with the given serial settings.  Reported are single-register transactions
+per second, ``read_telemetry`` latency percentiles and the throughput of an
+:class:`~vsensor.bus.RS485Bus` polling several devices.
+
+Results are written as JSON (``benchmarks/results/<version>.json`` by
+default) so runs of different releases can be compared::
+
+    python benchmarks/bench_bus.py --baudrate 19200 --compare benchmarks/results/0.1.0.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from vsensor import __version__
+from vsensor import registers as REG
+from vsensor.bus import RS485Bus
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.simulation import SimulatedTransport, WireTiming
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Return p50/p90/p99/max of ``samples`` in milliseconds."""
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3
+
+    return {
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1e3,
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+    }
+
+
+def bench_transactions(cfg: Config, timing: WireTiming, n: int) -> Dict[str, Any]:
+    """Single-register reads back to back."""
+    transport = SimulatedTransport(cfg, timing)
+    client = VSensorClient(cfg, transport=transport)
+    start = time.perf_counter()
+    for _ in range(n):
+        client.read_u16(REG.MODE)
+    elapsed = time.perf_counter() - start
+    return {
+        "transactions": n,
+        "seconds": elapsed,
+        "transactions_per_second": n / elapsed,
+        "wire_limit_per_second": n / transport.bus_time,
+    }
+
+
+def bench_telemetry(cfg: Config, timing: WireTiming, n: int) -> Dict[str, Any]:
+    """Latency distribution of ``read_telemetry``."""
+    transport = SimulatedTransport(cfg, timing)
+    client = VSensorClient(cfg, transport=transport)
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        client.read_telemetry()
+        samples.append(time.perf_counter() - start)
+    return {
+        "reads": n,
+        "transactions_per_read": transport.transactions / n,
+        **percentiles(samples),
+    }
+
+
+def bench_bus(cfg: Config, timing: WireTiming, devices: int, cycles: int) -> Dict[str, Any]:
+    """Round-robin ``read_telemetry`` over several slaves on one line."""
+    bus = RS485Bus(cfg, transport=SimulatedTransport(cfg, timing))
+    for slave_id in range(1, devices + 1):
+        bus.add(slave_id)
+    for _ in range(cycles):
+        bus.poll_cycle()
+    stats = bus.stats()
+    return {
+        "devices": devices,
+        "cycles": cycles,
+        "cycle_ms": stats.busy_time / cycles * 1e3,
+        "transactions_per_second": stats.transactions_per_second,
+        "registers_per_second": stats.registers_per_second,
+    }
+
+
+def run(
+    cfg: Config,
+    turnaround: float = 0.005,
+    transactions: int = 200,
+    telemetry_reads: int = 100,
+    devices: int = 8,
+    cycles: int = 10,
+) -> Dict[str, Any]:
+    """Run the whole suite and return the results as plain data."""
+    timing = WireTiming.from_config(cfg, turnaround)
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "timing": {**asdict(timing), "char_time_ms": timing.char_time * 1e3},
+        "transactions": bench_transactions(cfg, timing, transactions),
+        "read_telemetry": bench_telemetry(cfg, timing, telemetry_reads),
+        "bus": bench_bus(cfg, timing, devices, cycles),
+    }
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> List[str]:
+    """Describe the change of the headline figures against an older run."""
+    rows = [
+        ("transactions", "transactions_per_second"),
+        ("read_telemetry", "p50_ms"),
+        ("read_telemetry", "p99_ms"),
+        ("bus", "registers_per_second"),
+    ]
+    lines = []
+    for section, key in rows:
+        old = previous.get(section, {}).get(key)
+        new = current[section][key]
+        if not old:
+            continue
+        lines.append(
+            f"{section}.{key}: {old:.2f} -> {new:.2f} ({(new - old) / old * 100:+.1f}%)"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--parity", default="N")
+    parser.add_argument("--stopbits", type=int, default=1)
+    parser.add_argument("--bytesize", type=int, default=8)
+    parser.add_argument("--turnaround", type=float, default=0.005, help="slave reply delay [s]")
+    parser.add_argument("--transactions", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=100)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="JSON result file")
+    parser.add_argument("--compare", type=Path, help="earlier JSON result to compare with")
+    args = parser.parse_args(argv)
+
+    cfg = Config(
+        baudrate=args.baudrate,
+        parity=args.parity,
+        stopbits=args.stopbits,
+        bytesize=args.bytesize,
+    )
+    result = run(cfg, args.turnaround, args.transactions, args.reads, args.devices, args.cycles)
+
+    tx, tel, bus = result["transactions"], result["read_telemetry"], result["bus"]
+    print(f"{cfg.baudrate} baud {cfg.bytesize}{cfg.parity}{cfg.stopbits}, turnaround {args.turnaround * 1e3:.1f} ms")
+    print(f"  transactions/s     {tx['transactions_per_second']:8.1f} (wire limit {tx['wire_limit_per_second']:.1f})")
+    print(f"  read_telemetry     p50 {tel['p50_ms']:.2f} ms  p90 {tel['p90_ms']:.2f} ms  p99 {tel['p99_ms']:.2f} ms")
+    print(f"  bus ({bus['devices']} devices) {bus['registers_per_second']:8.1f} registers/s, cycle {bus['cycle_ms']:.1f} ms")
+
+    if args.compare:
+        for line in compare(result, json.loads(args.compare.read_text())):
+            print("  " + line)
+
+    output = args.output or RESULTS_DIR / f"{__version__}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Microbenchmark of float register decoding and encoding.
+
+Compares the previous per-call implementation of ``VSensorClient._unpack_float``
+and ``_pack_float`` with the precompiled :class:`vsensor.codec.RegisterCodec`
+and its bulk decoder.  Run with ``python benchmarks/bench_codec.py``.
+"""
+
+from __future__ import annotations
+
+import random
+import struct
+import timeit
+
+from vsensor.codec import FLOAT_FORMATS, RegisterCodec
+
+
+def legacy_unpack(regs: list[int], byteorder: str, wordorder: str) -> float:
+    words = regs if wordorder == "big" else list(reversed(regs))
+    raw = b"".join(int(w).to_bytes(2, byteorder) for w in words)  # type: ignore[arg-type]
+    fmt = ">" if byteorder == "big" else "<"
+    return float(struct.unpack(fmt + "f", raw)[0])
+
+
+def legacy_pack(value: float, byteorder: str, wordorder: str) -> list[int]:
+    fmt = ">" if byteorder == "big" else "<"
+    raw = struct.pack(fmt + "f", float(value))
+    words = [int.from_bytes(raw[i : i + 2], byteorder) for i in (0, 2)]  # type: ignore[arg-type]
+    if wordorder == "little":
+        words.reverse()
+    return words
+
+
+def ns_per_value(stmt, number: int, values: int = 1) -> float:
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return best / number / values * 1e9
+
+
+def main() -> None:
+    fmt = 1
+    byteorder, wordorder = FLOAT_FORMATS[fmt]
+    codec = RegisterCodec(fmt)
+    regs = codec.pack_float(123.456)
+    n = 10_000
+    array = [w for _ in range(n) for w in codec.pack_float(random.uniform(-1e3, 1e3))]
+
+    rows = [
+        ("unpack legacy", ns_per_value(lambda: legacy_unpack(regs, byteorder, wordorder), 100_000)),
+        ("unpack codec", ns_per_value(lambda: codec.unpack_float(regs), 100_000)),
+        ("pack legacy", ns_per_value(lambda: legacy_pack(1.5, byteorder, wordorder), 100_000)),
+        ("pack codec", ns_per_value(lambda: codec.pack_float(1.5), 100_000)),
+        (
+            f"bulk struct ({n})",
+            ns_per_value(lambda: codec.unpack_floats(array, use_numpy=False), 50, n),
+        ),
+    ]
+    try:
+        rows.append(
+            (f"bulk numpy ({n})", ns_per_value(lambda: codec.unpack_floats(array, use_numpy=True), 50, n))
+        )
+    except ImportError:
+        pass
+    for name, ns in rows:
+        print(f"{name:<22} {ns:8.1f} ns/value")
+
+
+if __name__ == "__main__":
+    main()
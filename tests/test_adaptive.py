@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import pytest
+
+from vsensor import registers as REG
+from vsensor.adaptive import AdaptiveRate, AdaptiveScheduler
+from vsensor.bus import RS485Bus
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import TimeoutError
+from vsensor.models import Mode, Snapshot, Telemetry
+from vsensor.poller import Poller
+from vsensor.transport import FakeTransport
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def snap(t: float, pressure: float, hb: int) -> Snapshot:
+    return Snapshot(t, Telemetry(pressure, 0.0, 100.0, Mode.AUTO), hb)
+
+
+class StuckTransport(FakeTransport):
+    """Fake device whose HEARTBEAT can be frozen; counts registers read."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.frozen = False
+        self.registers = 0
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        self.registers += count
+        if self.frozen:
+            return [self._regs.get(address + i, 0) for i in range(count)]
+        return super().read_holding_registers(address, count)
+
+
+def test_rate_backs_off_when_flat_and_speeds_up_on_change() -> None:
+    rate = AdaptiveRate(min_interval=0.1, max_interval=2.0, stall_after=100.0)
+    t = 0.0
+    for hb in range(20):
+        t += rate.interval
+        rate.update(snap(t, 50.0, hb))
+    assert rate.interval == 2.0
+    # 20 Pa/s with a 1 Pa step wants a sample every 50 ms, clamped to 0.1 s.
+    t += rate.interval
+    rate.update(snap(t, 90.0, 21))
+    assert rate.interval == 0.1
+    t += 0.1
+    rate.update(snap(t, 90.2, 22))  # 2 Pa/s
+    assert rate.interval == pytest.approx(0.15)
+
+
+def test_stall_detection_uses_heartbeat() -> None:
+    rate = AdaptiveRate(min_interval=0.1, max_interval=2.0, stall_after=1.0)
+    rate.update(snap(0.0, 1.0, 7))
+    rate.update(snap(0.5, 1.0, 7))
+    assert not rate.stalled
+    rate.update(snap(1.0, 1.0, 7))
+    assert rate.stalled
+    assert rate.interval == 2.0
+    assert not rate.observe_heartbeat(8, 1.5)
+
+
+def test_poller_probes_only_heartbeat_while_stalled() -> None:
+    ft = StuckTransport()
+    client = VSensorClient(Config(), transport=ft)
+    poller = Poller(client, adaptive=AdaptiveRate(stall_after=0.0))
+    first = poller.poll_once()
+    assert first is not None
+    ft.frozen = True
+    assert poller.poll_once() is not None  # same heartbeat again: stalled
+    assert poller.adaptive.stalled
+    assert poller.interval == poller.adaptive.max_interval
+    before = ft.registers
+    assert poller.poll_once() is None
+    assert ft.registers - before == 1
+    assert poller.latest().seq == 2
+    ft.frozen = False
+    assert poller.poll_once() is not None
+    assert not poller.adaptive.stalled
+
+
+def test_budget_is_shared_by_priority() -> None:
+    bus = RS485Bus(Config(), transport=FakeTransport())
+    sched = AdaptiveScheduler(bus, budget=12.0, min_interval=0.1, max_interval=1.0)
+    for sid, prio in ((1, 0), (2, 5), (3, 0)):
+        sched.add(sid, priority=prio)
+    # Everyone wants 10 polls/s; each keeps 1/s and the 9 left go to slave 2.
+    intervals = sched.intervals()
+    assert intervals[2] == pytest.approx(0.1)
+    assert intervals[1] == pytest.approx(1.0)
+    assert intervals[3] == pytest.approx(1.0)
+    sched.budget = None
+    assert sched.intervals() == {1: 0.1, 2: 0.1, 3: 0.1}
+
+
+def test_scheduler_polls_due_devices() -> None:
+    clock = Clock()
+    transport = FakeTransport()
+    bus = RS485Bus(Config(), transport=transport)
+    sched = AdaptiveScheduler(bus, min_interval=0.5, max_interval=4.0, clock=clock)
+    seen: list[int] = []
+    sched.add_listener(lambda sid, s: seen.append(sid))
+    sched.add(1)
+    sched.add(2, priority=1)
+    assert list(sched.poll_due()) == [2, 1]
+    assert sched.poll_due() == {}
+    clock.now = 0.5
+    words = bus.client(1).codec.encode(REG.lookup("PRESSURE_PA"), 50.0)
+    transport.for_slave(1).write_registers(REG.PRESSURE_PA - 1, words)
+    assert set(sched.poll_due()) == {1, 2}
+    assert sched.rate(1).interval == 0.5
+    assert sched.rate(2).interval == 0.75
+    assert sched.next_due() == 1.0
+    assert seen == [2, 1, 2, 1]
+    assert sched.latest(1).telemetry.pressure_pa == 50.0
+
+
+def test_scheduler_retries_failed_devices_after_max_interval() -> None:
+    class Absent(FakeTransport):
+        def read_holding_registers(self, address: int, count: int) -> list[int]:
+            raise TimeoutError("no answer")
+
+    clock = Clock()
+    bus = RS485Bus(Config(), transport=Absent())
+    sched = AdaptiveScheduler(bus, max_interval=3.0, clock=clock)
+    sched.add(1)
+    assert sched.poll_due() == {}
+    assert bus.status(1).consecutive_failures == 1
+    assert sched.next_due() == 3.0
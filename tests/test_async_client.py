@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from vsensor import registers as REG
+from vsensor.async_client import AsyncVSensorClient
+from vsensor.async_transport import AsyncFakeTransport
+from vsensor.config import Config
+from vsensor.errors import TimeoutError
+from vsensor.models import Mode
+
+
+@pytest.mark.parametrize("fmt", [0, 1, 2, 3])
+def test_float_roundtrip(fmt: int) -> None:
+    async def run() -> float:
+        client = AsyncVSensorClient(Config(float_format=fmt), transport=AsyncFakeTransport())
+        await client.set_auto_setpoint(1.23)
+        return await client.read_float(REG.AUTO_SETPOINT)
+
+    assert abs(asyncio.run(run()) - 1.23) < 0.001
+
+
+def test_read_telemetry() -> None:
+    async def run():
+        async with AsyncVSensorClient(Config(), transport=AsyncFakeTransport()) as client:
+            await client.write(auto_setpoint=20.0, mode=Mode.MANUAL)
+            return await client.read_telemetry()
+
+    t = asyncio.run(run())
+    assert t.auto_setpoint == 20.0
+    assert t.mode == Mode.MANUAL
+
+
+def test_per_call_timeout() -> None:
+    async def run() -> None:
+        client = AsyncVSensorClient(Config(), transport=AsyncFakeTransport(delay=1.0))
+        await client.read_mode(timeout=0.01)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_cancellation_releases_bus() -> None:
+    async def run() -> Mode:
+        transport = AsyncFakeTransport(delay=0.05)
+        client = AsyncVSensorClient(Config(), transport=transport)
+        task = asyncio.ensure_future(client.read_mode())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await client.read_mode(timeout=1.0)
+
+    assert asyncio.run(run()) == Mode.AUTO
+
+
+def test_many_clients_share_one_loop() -> None:
+    async def run() -> list[float]:
+        clients = [
+            AsyncVSensorClient(Config(), transport=AsyncFakeTransport(delay=0.02))
+            for _ in range(20)
+        ]
+        for i, c in enumerate(clients):
+            await c.set_auto_setpoint(float(i))
+        return await asyncio.gather(*(c.read_auto_setpoint() for c in clients))
+
+    assert asyncio.run(run()) == [float(i) for i in range(20)]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from vsensor import registers as REG
+from vsensor.async_client import AsyncVSensorClient
+from vsensor.async_transport import AsyncFakeTransport
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import VSensorError
+from vsensor.models import Mode
+from vsensor.transport import FakeTransport
+
+
+class RecordingTransport(FakeTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: list[tuple[str, int, int]] = []
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        self.requests.append(("read", address, count))
+        return super().read_holding_registers(address, count)
+
+    def write_register(self, address: int, value: int) -> None:
+        self.requests.append(("write", address, 1))
+        super().write_register(address, value)
+
+    def write_registers(self, address: int, values) -> None:
+        values = list(values)
+        self.requests.append(("write", address, len(values)))
+        super().write_registers(address, values)
+
+
+def test_batch_merges_writes_and_reads() -> None:
+    transport = RecordingTransport()
+    client = VSensorClient(Config(), transport=transport)
+    with client.batch() as b:
+        b.write(HIGH_ALARM=400.0, LOW_ALARM=10.0, AUTO_SETPOINT=250.0)
+        b.write(MODE=int(Mode.MANUAL))
+        b.read("PRESSURE_PA", "MODE", "AUTO_SETPOINT")
+    assert transport.requests == [
+        ("write", REG.AUTO_SETPOINT - 1, 2),
+        ("write", REG.MODE - 1, 1),
+        ("write", REG.LOW_ALARM - 1, 4),
+        ("read", REG.PRESSURE_PA - 1, 6),
+    ]
+    assert b.results == {"PRESSURE_PA": 0.0, "MODE": int(Mode.MANUAL), "AUTO_SETPOINT": 250.0}
+    assert client.read("LOW_ALARM", "HIGH_ALARM") == {"LOW_ALARM": 10.0, "HIGH_ALARM": 400.0}
+
+
+def test_batch_is_discarded_on_error() -> None:
+    transport = RecordingTransport()
+    client = VSensorClient(Config(), transport=transport)
+    with pytest.raises(RuntimeError):
+        with client.batch() as b:
+            b.write(AUTO_SETPOINT=1.0)
+            raise RuntimeError("abort")
+    assert transport.requests == []
+    assert not b.done
+
+
+def test_batch_validates_names_and_access() -> None:
+    client = VSensorClient(Config(), transport=RecordingTransport())
+    with pytest.raises(KeyError):
+        client.batch().read("NOPE")
+    b = client.batch().write(PRESSURE_PA=1.0)
+    with pytest.raises(VSensorError):
+        b.execute()
+    with pytest.raises(RuntimeError):
+        b.execute()
+
+
+def test_async_batch() -> None:
+    async def main() -> dict:
+        async with AsyncVSensorClient(Config(), AsyncFakeTransport()) as client:
+            async with client.batch() as b:
+                b.write(LOW_ALARM=1.0, HIGH_ALARM=2.0)
+                b.read("LOW_ALARM", "HIGH_ALARM")
+            return b.results
+
+    assert asyncio.run(main()) == {"LOW_ALARM": 1.0, "HIGH_ALARM": 2.0}
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from vsensor.bus import RS485Bus
+from vsensor.config import Config
+from vsensor.errors import TimeoutError
+from vsensor.transport import FakeTransport, Transport
+
+
+class FlakyBus(FakeTransport):
+    """Fake line on which some slave IDs never answer."""
+
+    def __init__(self, dead: set[int]) -> None:
+        super().__init__()
+        self.dead = dead
+        self.requests: list[int] = []
+
+    def for_slave(self, slave_id, timeout=None, retries=None) -> Transport:
+        sim = super().for_slave(slave_id)
+        bus = self
+
+        class View(Transport):
+            def read_holding_registers(self, address: int, count: int) -> list[int]:
+                bus.requests.append(slave_id)
+                if slave_id in bus.dead:
+                    raise TimeoutError("no answer")
+                return sim.read_holding_registers(address, count)
+
+            def write_register(self, address: int, value: int) -> None:
+                sim.write_register(address, value)
+
+            def write_registers(self, address: int, values) -> None:
+                sim.write_registers(address, values)
+
+        return View()
+
+
+def test_views_address_separate_slaves() -> None:
+    bus = RS485Bus(Config(), transport=FakeTransport())
+    a, b = bus.add(1), bus.add(2)
+    a.set_auto_setpoint(10.0)
+    b.set_auto_setpoint(20.0)
+    results = bus.poll_cycle()
+    assert results[1].auto_setpoint == 10.0
+    assert results[2].auto_setpoint == 20.0
+    assert bus.add(1) is a
+
+
+def test_dead_device_backs_off_without_stalling_cycle() -> None:
+    line = FlakyBus(dead={2})
+    bus = RS485Bus(Config(), transport=line)
+    for sid in (1, 2, 3):
+        bus.add(sid)
+
+    for _ in range(8):
+        results = bus.poll_cycle()
+        assert set(results) == {1, 3}
+
+    assert line.requests.count(1) == 8
+    assert line.requests.count(2) < 8
+    status = bus.status(2)
+    assert not status.online
+    assert status.failures == line.requests.count(2)
+
+
+def test_recovered_device_is_polled_again() -> None:
+    line = FlakyBus(dead={1})
+    bus = RS485Bus(Config(), transport=line, max_backoff=1)
+    bus.add(1)
+    for _ in range(4):
+        bus.poll_cycle()
+    line.dead.clear()
+    bus.poll_cycle()
+    assert 1 in bus.poll_cycle()
+    assert bus.status(1).online
+
+
+def test_throughput_stats() -> None:
+    bus = RS485Bus(Config(), transport=FakeTransport())
+    for sid in range(1, 6):
+        bus.add(sid)
+    bus.poll_cycle()
+    stats = bus.stats()
+    assert stats.cycles == 1
+    assert stats.transactions == 5
+    assert stats.registers == 5 * 18
+    assert stats.registers_per_second > 0
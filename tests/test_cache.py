@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from vsensor import registers as REG
+from vsensor.cache import RegisterCache
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.registers import Volatility
+from vsensor.transport import FakeTransport
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingTransport(FakeTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        self.reads += 1
+        return super().read_holding_registers(address, count)
+
+
+def make_client(**kwargs) -> tuple[VSensorClient, CountingTransport, Clock]:
+    clock = Clock()
+    ft = CountingTransport()
+    client = VSensorClient(Config(), transport=ft, cache=RegisterCache(clock=clock, **kwargs))
+    return client, ft, clock
+
+
+def test_config_registers_are_cached_until_ttl() -> None:
+    client, ft, clock = make_client()
+    ft.write_registers(REG.AUTO_SETPOINT - 1, client.codec.pack_float(12.0))
+
+    assert client.read_auto_setpoint() == 12.0
+    assert client.read_auto_setpoint() == 12.0
+    assert ft.reads == 1
+
+    clock.now = 11.0
+    client.read_auto_setpoint()
+    assert ft.reads == 2
+    stats = client.cache.stats()
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+def test_live_registers_bypass_cache() -> None:
+    client, ft, _ = make_client()
+    client.read_pressure()
+    client.read_pressure()
+    assert ft.reads == 2
+    assert client.cache.stats().misses == 0
+
+
+def test_writes_update_cache() -> None:
+    client, ft, _ = make_client()
+    client.set_auto_setpoint(5.0)
+    client.write(mode=1)
+    assert client.read("AUTO_SETPOINT", "MODE") == {"AUTO_SETPOINT": 5.0, "MODE": 1}
+    assert ft.reads == 0
+
+
+def test_partial_hits_only_fetch_missing_registers() -> None:
+    client, ft, _ = make_client()
+    client.set_auto_setpoint(7.0)
+    t = client.read_telemetry()
+    assert t.auto_setpoint == 7.0
+    assert ft.reads == 1
+
+
+def test_refresh_and_invalidate() -> None:
+    client, ft, _ = make_client()
+    client.set_auto_setpoint(1.0)
+    ft.write_registers(REG.AUTO_SETPOINT - 1, client.codec.pack_float(2.0))
+    assert client.read_auto_setpoint() == 1.0
+    assert client.refresh("AUTO_SETPOINT") == {"AUTO_SETPOINT": 2.0}
+    client.invalidate()
+    assert client.cache.stats().entries == 0
+
+
+def test_ttl_overrides() -> None:
+    client, ft, clock = make_client(
+        ttls={Volatility.LIVE: 1.0}, ttl_overrides={"mode": 0.0}
+    )
+    client.read_pressure()
+    client.read_pressure()
+    client.read_mode()
+    client.read_mode()
+    assert ft.reads == 3
@@ -32,6 +32,12 @@ class FakeTransport(Transport):
         pass
 
 
+def test_float_formats_still_exported() -> None:
+    from vsensor import client, codec
+
+    assert client.FLOAT_FORMATS is codec.FLOAT_FORMATS
+
+
 @pytest.mark.parametrize("fmt", [0, 1, 2, 3])
 def test_float_formats(fmt: int) -> None:
     cfg = Config(float_format=fmt)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from vsensor.codec import FLOAT_FORMATS, RegisterCodec
+
+
+def reference_unpack(regs: list[int], byteorder: str, wordorder: str) -> float:
+    words = regs if wordorder == "big" else list(reversed(regs))
+    raw = b"".join(int(w).to_bytes(2, byteorder) for w in words)
+    return struct.unpack((">" if byteorder == "big" else "<") + "f", raw)[0]
+
+
+@pytest.mark.parametrize("fmt", sorted(FLOAT_FORMATS))
+def test_matches_reference_layout(fmt: int) -> None:
+    codec = RegisterCodec(fmt)
+    regs = codec.pack_float(-1234.5)
+    assert reference_unpack(regs, *FLOAT_FORMATS[fmt]) == -1234.5
+    assert codec.unpack_float(regs) == -1234.5
+
+
+@pytest.mark.parametrize("fmt", sorted(FLOAT_FORMATS))
+def test_bulk_decode(fmt: int) -> None:
+    codec = RegisterCodec(fmt)
+    values = [float(i) / 4 for i in range(-10, 10)]
+    regs = [w for v in values for w in codec.pack_float(v)]
+    assert codec.unpack_floats(regs, use_numpy=False) == values
+
+
+@pytest.mark.parametrize("fmt", sorted(FLOAT_FORMATS))
+def test_bulk_decode_numpy(fmt: int) -> None:
+    pytest.importorskip("numpy")
+    codec = RegisterCodec(fmt)
+    values = [float(i) / 8 for i in range(1000)]
+    regs = [w for v in values for w in codec.pack_float(v)]
+    assert codec.unpack_floats(regs).tolist() == values
+
+
+def test_bulk_decode_rejects_odd_length() -> None:
+    with pytest.raises(ValueError):
+        RegisterCodec().unpack_floats([1, 2, 3])
+
+
+def test_unknown_format_falls_back_to_default() -> None:
+    assert RegisterCodec(9).byteorder == RegisterCodec(1).byteorder
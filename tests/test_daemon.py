@@ -0,0 +1,231 @@
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import vsensor.transport as transport_mod
+from vsensor import registers as REG
+from vsensor.client import VSensorClient
+from vsensor.config import Config, DeviceProfile, ProfileStore
+from vsensor.daemon import Daemon, DaemonTransport, connect_daemon, main
+from vsensor.errors import DeadlineExceededError, ModbusExceptionError, TransportError
+from vsensor.registry import TransportRegistry
+from vsensor.scheduler import Priority, priority, request_class
+from vsensor.transport import FakeTransport, create_transport
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets"
+)
+
+
+class RecordingTransport(FakeTransport):
+    """Fake bus remembering the request class each read ran under."""
+
+    def __init__(self):
+        super().__init__()
+        self.classes = []
+
+    def read_holding_registers(self, address, count):
+        if address >= 1000:
+            raise ModbusExceptionError("illegal data address", 2)
+        level, deadline = request_class(3)
+        self.classes.append((level, deadline is not None))
+        return super().read_holding_registers(address, count)
+
+
+@pytest.fixture
+def bus():
+    return RecordingTransport()
+
+
+@pytest.fixture
+def daemon(tmp_path, bus):
+    d = Daemon(bus, str(tmp_path / "vsensord.sock"))
+    d.serve()
+    yield d
+    d.close()
+
+
+@pytest.fixture
+def cfg(daemon):
+    return Config(daemon_socket=daemon.path, profile_cache="")
+
+
+def test_read_write_round_trip(cfg, bus):
+    t = DaemonTransport(cfg)
+    t.write_registers(10, [1, 2, 0xFFFF])
+    t.write_register(20, 7)
+    assert t.read_holding_registers(10, 3) == [1, 2, 0xFFFF]
+    assert t.read_write_registers(20, 1, 21, [9]) == [7]
+    assert bus._regs[21] == 9
+    t.close()
+
+
+def test_errors_are_mapped(cfg):
+    t = DaemonTransport(cfg)
+    with pytest.raises(ModbusExceptionError) as info:
+        t.read_holding_registers(1000, 1)
+    assert info.value.code == 2
+    t.close()
+
+
+def test_priority_and_deadline_reach_the_daemon(cfg, bus):
+    t = DaemonTransport(cfg)
+    t.read_holding_registers(0, 1)
+    with priority(Priority.BACKGROUND, deadline=1.0):
+        t.read_holding_registers(0, 1)
+    assert bus.classes == [(Priority.INTERACTIVE, False), (Priority.BACKGROUND, True)]
+    with priority(Priority.BACKGROUND, deadline=0.0):
+        time.sleep(0.01)
+        with pytest.raises(DeadlineExceededError):
+            t.read_holding_registers(0, 1)
+    t.close()
+
+
+def test_slave_views_share_the_connection(cfg, bus):
+    t = DaemonTransport(cfg)
+    t.for_slave(2).write_register(5, 42)
+    assert bus.for_slave(2).read_holding_registers(5, 1) == [42]
+    assert t._sock is not None and t.for_slave(2).read_holding_registers(5, 1) == [42]
+    t.close()
+
+
+def test_concurrent_clients(cfg):
+    transports = [DaemonTransport(cfg) for _ in range(3)]
+    errors = []
+
+    def work(i, t):
+        try:
+            for n in range(20):
+                t.write_register(100 + i, n)
+                assert t.read_holding_registers(100 + i, 1) == [n]
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(i, t)) for i, t in enumerate(transports)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert errors == []
+    for t in transports:
+        t.close()
+
+
+def test_subscription_notifies_changes_only(cfg, bus):
+    t = DaemonTransport(cfg)
+    seen = []
+    changed = threading.Event()
+
+    def callback(words):
+        seen.append(words)
+        changed.set()
+
+    sub = t.subscribe(50, 2, callback, interval=0.02)
+    assert changed.wait(2.0)
+    time.sleep(0.1)  # several polls of unchanged words
+    assert seen == [[0, 0]]
+    changed.clear()
+    bus.write_registers(50, [3, 4])
+    assert changed.wait(2.0)
+    assert seen[-1] == [3, 4]
+    sub.cancel()
+    time.sleep(0.05)
+    bus.write_registers(50, [5, 6])
+    time.sleep(0.1)
+    assert seen[-1] == [3, 4]
+    t.close()
+
+
+def test_tid_wrap_skips_live_subscriptions(cfg, bus):
+    t = DaemonTransport(cfg)
+    seen = []
+    changed = threading.Event()
+
+    def callback(words):
+        seen.append(words)
+        changed.set()
+
+    sub = t.subscribe(60, 1, callback, interval=0.02)
+    assert changed.wait(2.0)
+    t._next_tid = sub.tid - 1 + 0xFFFF  # the next tid would wrap onto sub.tid
+    t.read_holding_registers(0, 1)
+    assert t._next_tid != sub.tid and t._subs[sub.tid] is sub
+    changed.clear()
+    bus.write_registers(60, [5])
+    assert changed.wait(2.0) and seen[-1] == [5]
+    sub.cancel()
+    t.close()
+
+
+def test_subscriptions_end_with_the_connection(cfg, daemon):
+    t = DaemonTransport(cfg)
+    t.subscribe(0, 1, lambda words: None, interval=0.02)
+    t.close()
+    deadline = time.monotonic() + 2.0
+    while daemon._subs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert daemon._subs == {}
+
+
+def test_client_uses_running_daemon_transparently(cfg, bus):
+    assert isinstance(create_transport(cfg), DaemonTransport)
+    registry = TransportRegistry()
+    client = VSensorClient(cfg, transport=registry.acquire(cfg))
+    client.set_auto_setpoint(12.5)
+    assert client.read_auto_setpoint() == pytest.approx(12.5)
+    assert REG.AUTO_SETPOINT - 1 in bus._regs  # written through the daemon
+    client.close()
+
+
+def test_no_daemon(tmp_path):
+    cfg = Config(daemon_socket=str(tmp_path / "missing.sock"))
+    assert connect_daemon(cfg) is None
+    assert connect_daemon(Config(daemon_socket="")) is None
+    with pytest.raises(TransportError):
+        DaemonTransport(cfg)
+
+
+def test_shared_socket_is_not_used_automatically(cfg, daemon):
+    assert os.stat(daemon.path).st_mode & 0o777 == 0o600
+    os.chmod(daemon.path, 0o620)
+    assert connect_daemon(cfg) is None
+    os.chmod(daemon.path, 0o600)
+    transport = connect_daemon(cfg)
+    assert isinstance(transport, DaemonTransport)
+    transport.close()
+
+
+def test_second_daemon_refuses_socket(daemon):
+    with pytest.raises(TransportError):
+        Daemon(FakeTransport(), daemon.path).serve()
+
+
+def test_default_socket_follows_port(monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    monkeypatch.delenv("VSENSOR_DAEMON_SOCKET", raising=False)
+    path = Config(port="/dev/ttyUSB1").daemon_path()
+    assert path == "/run/user/1000/vsensord-ttyUSB1.sock"
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert Config(port="/dev/ttyUSB1").daemon_path() is None
+
+
+def test_main_keeps_environment_over_profile(monkeypatch, tmp_path):
+    cache = str(tmp_path / "profiles.json")
+    ProfileStore(cache).put(DeviceProfile("/dev/ttyX", 1, 38400, "E", float_format=0))
+    monkeypatch.setenv("VSENSOR_PROFILE_CACHE", cache)
+    monkeypatch.setenv("VSENSOR_FLOAT_FORMAT", "2")
+    monkeypatch.setenv("VSENSOR_DAEMON_SOCKET", str(tmp_path / "d.sock"))
+    for name in ("BAUD", "PARITY", "FAKE", "SIM"):
+        monkeypatch.delenv(f"VSENSOR_{name}", raising=False)
+    seen = []
+
+    def rtu(cfg):
+        seen.append(cfg)
+        raise TransportError("no port")
+
+    monkeypatch.setattr(transport_mod, "RTUTransport", rtu)
+    assert main(["--port", "/dev/ttyX", "--parity", "o"]) == 1
+    assert (seen[0].baudrate, seen[0].parity, seen[0].float_format) == (38400, "O", 2)
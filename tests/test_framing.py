@@ -0,0 +1,39 @@
+import pytest
+
+from vsensor import framing
+
+
+def test_crc_of_known_frame():
+    frame = framing.encode_frame(1, bytes.fromhex("0300000001"))
+    assert frame == bytes.fromhex("010300000001840a")
+    assert framing.check_frame(frame)
+    assert framing.decode_frame(frame) == (1, bytes.fromhex("0300000001"))
+
+
+def test_corrupted_frame_is_rejected():
+    frame = bytearray(framing.encode_frame(1, bytes.fromhex("0300000001")))
+    frame[3] ^= 0x01
+    assert not framing.check_frame(bytes(frame))
+    with pytest.raises(ValueError):
+        framing.decode_frame(bytes(frame))
+
+
+def test_request_length():
+    assert framing.request_length(b"\x01") is None
+    assert framing.request_length(b"\x01\x03") == 8
+    assert framing.request_length(b"\x01\x06") == 8
+    assert framing.request_length(b"\x01\x10\x00\x00\x00") is None
+    assert framing.request_length(b"\x01\x10\x00\x00\x00\x02\x04") == 13
+    assert framing.request_length(b"\x01\x17" + bytes(8) + b"\x04") == 17
+    assert framing.request_length(b"\x01\x2b") == 0
+
+
+def test_exception_pdu():
+    assert framing.exception_pdu(3, framing.ILLEGAL_DATA_ADDRESS) == b"\x83\x02"
+
+
+def test_register_values_checks_byte_count():
+    assert framing.register_values(b"\x03\x04\x00\x01\x00\x02") == [1, 2]
+    for pdu in (b"\x03", b"\x03\x04\x00\x01", b"\x03\x03\x00\x01\x00", b"\x03\x00\x00"):
+        with pytest.raises(ValueError):
+            framing.register_values(pdu)
@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vsensor import framing
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import (
+    DeadlineExceededError,
+    ModbusExceptionError,
+    TimeoutError,
+    TransportError,
+)
+from vsensor.gateway import Gateway
+from vsensor.simulation import SimulatedTransport, WireTiming
+from vsensor.transport import FakeTransport, TcpTransport
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class GatedTransport(FakeTransport):
+    """Fake device whose bus transactions block until the gate opens."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.log = []
+
+    def read_holding_registers(self, address, count):
+        self.gate.wait()
+        self.log.append(("read", address))
+        return super().read_holding_registers(address, count)
+
+    def write_register(self, address, value):
+        self.gate.wait()
+        self.log.append(("write", address))
+        super().write_register(address, value)
+
+
+def test_cache_serves_reads_within_ttl():
+    clock = Clock()
+    transport = FakeTransport()
+    gw = Gateway(transport, ttl=0.5, clock=clock)
+    try:
+        assert gw.read(1, 152, 2) == [0, 0]
+        gw.read(1, 152, 2)
+        gw.read(1, 153, 1)  # covered by the cached block
+        assert gw.stats.bus_reads == 1
+        assert gw.stats.cache_hits == 2
+        clock.now = 1.0
+        gw.read(1, 152, 2)
+        assert gw.stats.bus_reads == 2
+    finally:
+        gw.close()
+
+
+def test_concurrent_identical_reads_are_coalesced():
+    transport = GatedTransport()
+    gw = Gateway(transport, ttl=0.0)
+    try:
+        with ThreadPoolExecutor(10) as pool:
+            futures = [pool.submit(gw.read, 1, 150, 4) for _ in range(10)]
+            time.sleep(0.1)
+            transport.gate.set()
+            results = [f.result() for f in futures]
+    finally:
+        gw.close()
+    assert results == [[0, 0, 0, 0]] * 10
+    assert gw.stats.bus_reads == 1
+    assert gw.stats.coalesced == 9
+
+
+def test_writes_overtake_queued_reads():
+    transport = GatedTransport()
+    gw = Gateway(transport, ttl=0.0)
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            reads = [pool.submit(gw.read, 1, a, 1) for a in (10, 11, 12)]
+            time.sleep(0.05)
+            write = pool.submit(gw.write, 1, 155, [1], True)
+            time.sleep(0.05)
+            transport.gate.set()
+            write.result()
+            for r in reads:
+                r.result()
+    finally:
+        gw.close()
+    # The first read was already on the bus; the write jumps the queue.
+    assert transport.log[:2] == [("read", 10), ("write", 155)]
+
+
+def test_close_fails_queued_jobs():
+    transport = GatedTransport()
+    gw = Gateway(transport, ttl=0.0)
+    with ThreadPoolExecutor(3) as pool:
+        running = pool.submit(gw.read, 1, 10, 1)
+        time.sleep(0.05)
+        queued = pool.submit(gw.read, 1, 11, 1)
+        time.sleep(0.05)
+        closing = pool.submit(gw.close)
+        time.sleep(0.05)
+        transport.gate.set()
+        closing.result(timeout=2.0)
+        assert running.result() == [0]
+        with pytest.raises(TransportError):
+            queued.result()
+    assert transport.log == [("read", 10)]
+    with pytest.raises(TransportError):
+        gw.read(1, 12, 1)
+
+
+def test_stats_count_every_request_from_many_threads():
+    gw = Gateway(FakeTransport(), ttl=10.0)
+    try:
+        gw.read(1, 0, 1)
+        with ThreadPoolExecutor(8) as pool:
+            for _ in range(8):
+                pool.submit(
+                    lambda: [gw.handle(1, framing.read_registers_pdu(0, 1)) for _ in range(500)]
+                )
+    finally:
+        gw.close()
+    assert (gw.stats.requests, gw.stats.cache_hits) == (4000, 4000)
+
+
+def test_write_updates_cache():
+    transport = FakeTransport()
+    gw = Gateway(transport, ttl=10.0)
+    try:
+        gw.read(1, 155, 1)
+        gw.write(1, 155, [1], single=True)
+        assert gw.read(1, 155, 1) == [1]
+        assert gw.stats.bus_reads == 1
+    finally:
+        gw.close()
+
+
+def test_errors_map_to_exception_responses():
+    class Failing(FakeTransport):
+        def __init__(self, exc):
+            super().__init__()
+            self.exc = exc
+
+        def read_holding_registers(self, address, count):
+            raise self.exc
+
+    for exc, code in (
+        (ModbusExceptionError("illegal", 2), 2),
+        (TimeoutError("timeout"), framing.GATEWAY_TARGET_FAILED),
+        (TransportError("CRC"), framing.GATEWAY_PATH_UNAVAILABLE),
+        (DeadlineExceededError("deadline"), framing.GATEWAY_TARGET_FAILED),
+    ):
+        gw = Gateway(Failing(exc), ttl=0.0)
+        try:
+            response = gw.handle(1, framing.read_registers_pdu(0, 1))
+        finally:
+            gw.close()
+        assert response == framing.exception_pdu(3, code)
+
+
+def test_malformed_and_unsupported_requests():
+    gw = Gateway(FakeTransport())
+    try:
+        assert gw.handle(1, b"\x03\x00") == framing.exception_pdu(3, framing.ILLEGAL_DATA_VALUE)
+        assert gw.handle(1, framing.read_registers_pdu(0, 200)) == framing.exception_pdu(
+            3, framing.ILLEGAL_DATA_VALUE
+        )
+        assert gw.handle(1, b"\x2b\x0e") == framing.exception_pdu(0x2B, framing.ILLEGAL_FUNCTION)
+    finally:
+        gw.close()
+
+
+def test_many_tcp_clients_keep_bus_traffic_flat():
+    bus = SimulatedTransport(timing=WireTiming(115200, turnaround=0.002))
+    gw = Gateway(bus, ttl=0.5)
+    server = gw.serve(port=0)
+    port = server.server_address[1]
+    cfg = Config(transport="tcp", host="127.0.0.1", tcp_port=port, breaker_threshold=0)
+    transports = [TcpTransport(cfg) for _ in range(8)]
+    try:
+        clients = [VSensorClient(cfg, transport=t) for t in transports]
+        clients[0].set_auto_setpoint(33.0)
+        with ThreadPoolExecutor(8) as pool:
+            telemetry = list(pool.map(lambda c: [c.read_telemetry() for _ in range(5)], clients))
+    finally:
+        for t in transports:
+            t.close()
+        gw.close()
+    assert all(t.auto_setpoint == 33.0 for reads in telemetry for t in reads)
+    assert gw.stats.requests == 41
+    assert bus.transactions <= 3  # one write, one or two block reads
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vsensor.history import TelemetryHistory  # noqa: E402
+from vsensor.models import Mode, Snapshot, Telemetry  # noqa: E402
+
+
+def fill(history: TelemetryHistory, n: int, start: int = 0) -> None:
+    for i in range(start, start + n):
+        history.append_values(float(i), float(i), i / 10, 100.0, i % 2)
+
+
+def test_append_snapshot() -> None:
+    h = TelemetryHistory(4)
+    h.append(Snapshot(1.0, Telemetry(10.0, 20.0, 30.0, Mode.MANUAL), heartbeat=5))
+    cols = h.range()
+    assert cols["timestamp"].tolist() == [1.0]
+    assert cols["pressure_pa"].tolist() == [10.0]
+    assert cols["mode"].tolist() == [1]
+
+
+def test_ring_wraps_and_keeps_order() -> None:
+    h = TelemetryHistory(5)
+    fill(h, 8)
+    assert len(h) == 5
+    assert h.range()["timestamp"].tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert h.range(4.5, 6.0)["pressure_pa"].tolist() == [5.0, 6.0]
+    assert h.range(100.0)["timestamp"].size == 0
+
+
+def test_downsample_min_max_mean() -> None:
+    h = TelemetryHistory(100)
+    fill(h, 100)
+    out = h.downsample(10)
+    assert out["count"].tolist() == [10] * 10
+    assert out["min"][0] == 0.0
+    assert out["max"][0] == 9.0
+    assert out["mean"][0] == pytest.approx(4.5)
+    assert out["max"][-1] == 99.0
+
+
+def test_downsample_skips_empty_buckets() -> None:
+    h = TelemetryHistory(10)
+    h.append_values(0.0, 1.0, 0.0, 0.0, 0)
+    h.append_values(10.0, 3.0, 0.0, 0.0, 0)
+    out = h.downsample(5)
+    assert out["timestamp"].tolist() == [0.0, 8.0]
+    assert out["mean"].tolist() == [1.0, 3.0]
+
+
+def test_large_downsample_is_fast() -> None:
+    n = 1_000_000
+    h = TelemetryHistory(n)
+    h._cols["timestamp"][:] = np.arange(n, dtype=np.float64)
+    h._cols["pressure_pa"][:] = np.sin(np.arange(n) / 1000.0)
+    h._count = n
+    started = time.perf_counter()
+    out = h.downsample(10_000)
+    elapsed = time.perf_counter() - started
+    assert len(out["mean"]) == 10_000
+    assert elapsed < 0.5
@@ -0,0 +1,87 @@
+"""Import-time guards: nothing heavy until a serial transport is opened."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from vsensor.config import Config
+
+# Modules only real serial transports (or asyncio users) may load.
+HEAVY = ("pymodbus", "serial", "asyncio", "http.server", "importlib.metadata")
+
+# Optional budget for the cumulative import time in seconds, best of three
+# runs.  Wall-clock limits are flaky on shared runners, so only checked when
+# set, e.g. VSENSOR_IMPORT_BUDGET=0.25.
+IMPORT_BUDGET = os.getenv("VSENSOR_IMPORT_BUDGET")
+
+
+def importtime(*args, env=None):
+    """Run python -X importtime; return {module: cumulative seconds}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+        timeout=60,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative) / 1e6
+    return proc, modules
+
+
+def heavy(modules):
+    return sorted(m for m in modules if m.split(".")[0] in HEAVY or m in HEAVY)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import vsensor",
+        "from vsensor import Config, VSensorClient",
+        "import vsensor.__main__, vsensor.scan, vsensor.watch, vsensor.gateway",
+    ],
+)
+def test_import_stays_light(code):
+    proc, modules = importtime("-c", code)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert heavy(modules) == []
+
+
+def test_fake_cli_run_does_not_load_pymodbus():
+    proc, modules = importtime(
+        "-m", "vsensor", "read", "telemetry", env={"VSENSOR_FAKE": "1"}
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert heavy(modules) == []
+
+
+def test_rtu_transport_loads_pymodbus_on_demand():
+    code = (
+        "import sys, vsensor.transport as t\n"
+        "assert 'pymodbus' not in sys.modules\n"
+        "t.ModbusSerialClient\n"
+        "assert 'pymodbus.client' in sys.modules\n"
+    )
+    proc, _ = importtime("-c", code)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+
+@pytest.mark.skipif(not IMPORT_BUDGET, reason="set VSENSOR_IMPORT_BUDGET to check")
+def test_import_time_budget():
+    best = min(importtime("-c", "import vsensor.client")[1]["vsensor.client"] for _ in range(3))
+    assert best < float(IMPORT_BUDGET)
+
+
+def test_config_reads_environment_per_instance(monkeypatch):
+    monkeypatch.setenv("VSENSOR_BAUD", "19200")
+    monkeypatch.setenv("VSENSOR_VERIFY_WRITES", "yes")
+    cfg = Config()
+    assert (cfg.baudrate, cfg.verify_writes) == (19200, True)
+    monkeypatch.delenv("VSENSOR_BAUD")
+    assert Config().baudrate == 9600
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+from pymodbus.exceptions import ModbusIOException
+
+import vsensor.transport as transport_mod
+from vsensor import metrics
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import ModbusExceptionError, TimeoutError
+from vsensor.transport import FakeTransport
+
+
+class FakeSerialClient:
+    script: list[str] = []
+
+    def __init__(self, **kwargs) -> None:
+        pass
+
+    def connect(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def _next(self, count: int):
+        step = self.script.pop(0) if self.script else "ok"
+        if step == "timeout":
+            raise ModbusIOException("no response")
+        if step == "exception":
+            return SimpleNamespace(isError=lambda: True, exception_code=2)
+        return SimpleNamespace(registers=[0] * count, isError=lambda: False)
+
+    def read_holding_registers(self, address: int, count: int, slave: int):
+        return self._next(count)
+
+    def write_register(self, address: int, value: int, slave: int):
+        return self._next(1)
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    monkeypatch.setattr(transport_mod, "ModbusSerialClient", FakeSerialClient)
+    m = metrics.enable()
+    yield m
+    metrics.disable()
+
+
+def test_histogram_buckets() -> None:
+    h = metrics.Histogram((0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v)
+    assert h.cumulative() == [("0.1", 1), ("1.0", 2), ("+Inf", 3)]
+    assert h.sum == pytest.approx(5.55)
+
+
+def test_rtu_frame_sizes() -> None:
+    assert metrics.rtu_frame_sizes(3, 2) == (8, 9)
+    assert metrics.rtu_frame_sizes(16, 2) == (13, 8)
+    assert metrics.rtu_frame_sizes(3, 2, metrics.EXCEPTION) == (8, 5)
+    assert metrics.rtu_frame_sizes(3, 2, metrics.TIMEOUT) == (8, 0)
+
+
+def test_transport_records_transactions(collector) -> None:
+    FakeSerialClient.script = ["timeout", "ok", "exception", "exception", "exception"]
+    t = transport_mod.RTUTransport(Config(slave_id=4, retries=3, retry_backoff=0.0))
+    t.read_holding_registers(150, 2)
+    with pytest.raises(ModbusExceptionError) as info:
+        t.write_register(155, 1)
+    assert info.value.code == 2
+
+    tx = {(e["function_code"], e["address"]): e for e in collector.snapshot()["transactions"]}
+    read = tx[(3, 151)]
+    assert read["slave"] == 4
+    assert read["outcomes"] == {"ok": 1}
+    assert read["attempts"] == 2
+    assert read["retries"] == 1
+    assert read["bytes_tx"] == 16
+    assert read["bytes_rx"] == 9
+    assert read["latency"]["count"] == 1
+    assert tx[(6, 156)]["outcomes"] == {"exception": 1}
+
+
+def test_client_operations_and_prometheus(collector) -> None:
+    client = VSensorClient(Config(slave_id=2), transport=FakeTransport())
+    client.read_telemetry()
+    ops = {o["op"]: o for o in collector.snapshot()["operations"]}
+    assert ops["read_telemetry"]["ok"] == 1
+    assert ops["read"]["slave"] == 2
+
+    text = collector.render_prometheus()
+    assert "# TYPE vsensor_operation_latency_seconds histogram" in text
+    assert 'vsensor_operations_total{op="read_telemetry",slave="2",outcome="ok"} 1' in text
+    assert 'le="+Inf"' in text
+
+
+def test_failed_operation_counted(collector) -> None:
+    class Dead(FakeTransport):
+        def read_holding_registers(self, address: int, count: int) -> list[int]:
+            raise TimeoutError("boom")
+
+    client = VSensorClient(Config(), transport=Dead())
+    with pytest.raises(TimeoutError):
+        client.read_mode()
+    ops = {o["op"]: o for o in collector.snapshot()["operations"]}
+    assert ops["read_u16"]["failed"] == 1
+
+
+def test_disabled_records_nothing() -> None:
+    metrics.disable()
+    assert not metrics.active().enabled
+    VSensorClient(Config(), transport=FakeTransport()).read_telemetry()
+    assert metrics.active().snapshot() == {"transactions": [], "operations": [], "queues": []}
+
+
+def test_http_endpoint(collector) -> None:
+    collector.record_operation("read", 1, 0.01)
+    server = metrics.serve_prometheus(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode()
+    finally:
+        server.shutdown()
+    assert 'vsensor_operations_total{op="read",slave="1",outcome="ok"} 1' in body
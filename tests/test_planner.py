@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+
+from vsensor import registers as REG
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.models import Mode
+from vsensor.planner import MAX_READ_COUNT, MAX_WRITE_COUNT, ReadBlock, WriteBlock, plan_reads, plan_writes
+from vsensor.transport import FakeTransport
+
+
+class CountingTransport(FakeTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: list[tuple[int, int]] = []
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        self.requests.append((address, count))
+        return super().read_holding_registers(address, count)
+
+
+def test_contiguous_spans_merge() -> None:
+    blocks = plan_reads([(151, 2), (153, 2), (155, 1), (156, 1)], max_gap=0)
+    assert blocks == [ReadBlock(151, 6)]
+
+
+def test_gap_tolerance() -> None:
+    spans = [(151, 2), (167, 2)]
+    assert plan_reads(spans, max_gap=14) == [ReadBlock(151, 18)]
+    assert plan_reads(spans, max_gap=13) == [ReadBlock(151, 2), ReadBlock(167, 2)]
+
+
+def test_overlapping_and_duplicate_spans() -> None:
+    assert plan_reads([(10, 2), (10, 2), (11, 1)], max_gap=0) == [ReadBlock(10, 2)]
+
+
+def test_max_count_splits_blocks() -> None:
+    spans = [(1, 2), (MAX_READ_COUNT, 2)]
+    assert plan_reads(spans, max_gap=MAX_READ_COUNT) == [
+        ReadBlock(1, 2),
+        ReadBlock(MAX_READ_COUNT, 2),
+    ]
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        plan_reads([(1, 1)], max_count=126)
+    with pytest.raises(ValueError):
+        plan_reads([(1, 0)])
+
+
+def test_read_telemetry_uses_single_block() -> None:
+    ft = CountingTransport()
+    client = VSensorClient(Config(float_format=0), transport=ft)
+    client.write_float(REG.PRESSURE_PA, 12.5)
+    client.write_float(REG.OUTPUT_PERCENT, 40.0)
+    client.write_float(REG.AUTO_SETPOINT, 100.0)
+    client.set_mode(Mode.MANUAL)
+
+    t = client.read_telemetry()
+
+    assert ft.requests == [(REG.PRESSURE_PA - 1, 18)]
+    assert t.pressure_pa == 12.5
+    assert t.output_percent == 40.0
+    assert t.auto_setpoint == 100.0
+    assert t.mode == Mode.MANUAL
+
+
+def test_fake_heartbeat_in_block_read() -> None:
+    ft = FakeTransport()
+    ft.write_registers(REG.HEARTBEAT - 2, [7, 8, 9])
+    first = ft.read_holding_registers(REG.HEARTBEAT - 2, 3)
+    second = ft.read_holding_registers(REG.HEARTBEAT - 2, 3)
+    # Only the HEARTBEAT word ticks; the block start keeps its value.
+    assert first[0] == second[0] == 7 and first[2] == second[2] == 9
+    assert second[1] == (first[1] + 1) & 0xFFFF
+
+
+def test_read_spans_respects_configured_gap() -> None:
+    ft = CountingTransport()
+    client = VSensorClient(Config(max_read_gap=0), transport=ft)
+    client.read_telemetry()
+    assert ft.requests == [
+        (REG.PRESSURE_PA - 1, 4),
+        (REG.MODE - 1, 1),
+        (REG.OUTPUT_PERCENT - 1, 2),
+    ]
+
+
+def test_adjacent_writes_merge() -> None:
+    blocks = plan_writes([(218, [3, 4]), (153, [1, 2]), (216, [5, 6]), (156, [7])])
+    assert blocks == [
+        WriteBlock(153, (1, 2)),
+        WriteBlock(156, (7,)),
+        WriteBlock(216, (5, 6, 3, 4)),
+    ]
+
+
+def test_write_gaps_are_not_filled_and_last_write_wins() -> None:
+    assert plan_writes([(10, [1]), (12, [2]), (10, [3])]) == [
+        WriteBlock(10, (3,)),
+        WriteBlock(12, (2,)),
+    ]
+
+
+def test_write_blocks_respect_max_count() -> None:
+    blocks = plan_writes([(1, list(range(MAX_WRITE_COUNT + 1)))])
+    assert [b.count for b in blocks] == [MAX_WRITE_COUNT, 1]
+    with pytest.raises(ValueError):
+        plan_writes([], max_count=MAX_WRITE_COUNT + 1)
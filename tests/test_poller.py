@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import dataclasses
+import time
+
+import pytest
+
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import TimeoutError
+from vsensor.models import Mode
+from vsensor.poller import Poller
+from vsensor.transport import FakeTransport
+
+
+class CountingTransport(FakeTransport):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+        self.fail = False
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        if self.fail:
+            raise TimeoutError("boom")
+        self.reads += 1
+        return super().read_holding_registers(address, count)
+
+
+def test_poll_once_publishes_snapshot() -> None:
+    ft = CountingTransport()
+    client = VSensorClient(Config(), transport=ft)
+    client.set_auto_setpoint(42.0)
+    poller = Poller(client, interval=1.0)
+    assert poller.latest() is None
+
+    snap = poller.poll_once()
+
+    assert snap is poller.latest()
+    assert snap.telemetry.auto_setpoint == 42.0
+    assert snap.telemetry.mode == Mode.AUTO
+    assert snap.heartbeat == 1
+    assert ft.reads == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snap.telemetry.pressure_pa = 1.0  # type: ignore[misc]
+
+
+def test_readers_do_not_touch_bus() -> None:
+    ft = CountingTransport()
+    poller = Poller(VSensorClient(Config(), transport=ft))
+    poller.poll_once()
+    for _ in range(100):
+        poller.latest()
+    assert ft.reads == 1
+
+
+def test_errors_keep_last_snapshot() -> None:
+    ft = CountingTransport()
+    poller = Poller(VSensorClient(Config(), transport=ft))
+    first = poller.poll_once()
+    ft.fail = True
+    assert poller.poll_once() is None
+    assert poller.latest() is first
+    assert poller.errors == 1
+    assert poller.last_error
+
+
+def test_background_thread_and_listeners() -> None:
+    ft = CountingTransport()
+    poller = Poller(VSensorClient(Config(), transport=ft), interval=0.01)
+    seen = []
+    poller.add_listener(seen.append)
+    poller.start()
+    deadline = time.monotonic() + 2.0
+    while len(seen) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    poller.stop()
+    assert not poller.running
+    assert len(seen) >= 3
+    assert [s.seq for s in seen[:3]] == [1, 2, 3]
+    assert seen[2].heartbeat > seen[0].heartbeat
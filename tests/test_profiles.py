@@ -0,0 +1,195 @@
+import json
+
+import pytest
+
+import vsensor.__main__ as cli
+import vsensor.client as client_mod
+from vsensor import registers as REG
+from vsensor.client import VSensorClient
+from vsensor.codec import RegisterCodec
+from vsensor.config import Config, DeviceProfile, ProfileStore
+from vsensor.errors import TimeoutError, TransportError
+from vsensor.scan import Device, SerialSettings
+from vsensor.transport import FakeTransport
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(client_mod, "_fc23_support", {})
+    monkeypatch.setattr(client_mod, "_profiles_checked", set())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return str(tmp_path / "vsensor" / "profiles.json")
+
+
+def device(float_format=1, error=None):
+    """A fake device holding plausible floats in ``float_format``."""
+    ft = FakeTransport()
+    codec = RegisterCodec(float_format)
+    values = {"PRESSURE_PA": 123.5, "AUTO_SETPOINT": 50.0, "OUTPUT_PERCENT": 42.0}
+    for name, value in values.items():
+        ft.write_registers(REG.lookup(name).address - 1, codec.pack_float(value))
+    if error is not None:
+
+        def fail(address, count):
+            raise error
+
+        ft.read_holding_registers = fail
+    return ft
+
+
+def connect(monkeypatch, cfg, transport):
+    monkeypatch.delenv("VSENSOR_FAKE", raising=False)
+    monkeypatch.delenv("VSENSOR_SIM", raising=False)
+    monkeypatch.setattr(client_mod, "acquire", lambda c: transport)
+    client = VSensorClient(cfg)
+    client.connect()
+    return client
+
+
+def test_store_round_trip(cache):
+    store = ProfileStore(cache)
+    assert store.get("/dev/ttyX", 1) is None
+    store.put(DeviceProfile("/dev/ttyX", 1, 19200, "E", float_format=2))
+    assert store.get("/dev/ttyX", 1).baudrate == 19200
+    assert store.get("/dev/ttyX", 2) is None
+    assert store.update("/dev/ttyX", 1, fc23=False).fc23 is False
+    assert store.forget("/dev/ttyX", 1)
+    assert not store.forget("/dev/ttyX", 1)
+
+
+def test_corrupt_cache_reads_empty(cache, tmp_path):
+    (tmp_path / "vsensor").mkdir()
+    with open(cache, "w") as fh:
+        fh.write("{not json")
+    assert ProfileStore(cache).load() == {}
+    with open(cache, "w") as fh:
+        json.dump({"/dev/ttyX#1": {"port": "/dev/ttyX", "slave_id": 1, "future": 1}}, fh)
+    assert ProfileStore(cache).get("/dev/ttyX", 1) == DeviceProfile("/dev/ttyX", 1)
+
+
+def test_apply_profile_keeps_explicit_fields(cache):
+    ProfileStore(cache).put(DeviceProfile("/dev/ttyX", 3, 38400, "E", float_format=0))
+    cfg = Config(port="/dev/ttyX", slave_id=3, float_format=1, profile_cache=cache)
+    assert cfg.apply_profile(keep=["float_format"]) is not None
+    assert (cfg.baudrate, cfg.parity, cfg.float_format) == (38400, "E", 1)
+    assert Config(port="/dev/ttyY", profile_cache=cache).apply_profile() is None
+
+
+def test_from_env_applies_profile_unless_set(monkeypatch, cache):
+    ProfileStore(cache).put(DeviceProfile("/dev/ttyX", 3, 38400, "E", float_format=0))
+    for name, value in (("PORT", "/dev/ttyX"), ("SLAVE_ID", "3"), ("FLOAT_FORMAT", "2")):
+        monkeypatch.setenv(f"VSENSOR_{name}", value)
+    monkeypatch.setenv("VSENSOR_PROFILE_CACHE", cache)
+    monkeypatch.delenv("VSENSOR_BAUD", raising=False)
+    monkeypatch.delenv("VSENSOR_PARITY", raising=False)
+    cfg = Config.from_env()
+    assert (cfg.baudrate, cfg.parity, cfg.float_format) == (38400, "E", 2)
+
+
+def test_cli_applies_profile_of_its_own_port(monkeypatch, cache):
+    ProfileStore(cache).put(DeviceProfile("/dev/ttyX", 1, 38400, "E", float_format=0))
+    monkeypatch.setenv("VSENSOR_PORT", "/dev/ttyX")
+    monkeypatch.setenv("VSENSOR_PROFILE_CACHE", cache)
+    for name in ("BAUD", "PARITY", "FLOAT_FORMAT", "FAKE", "SIM"):
+        monkeypatch.delenv(f"VSENSOR_{name}", raising=False)
+    seen = []
+
+    class Client:
+        def __init__(self, cfg):
+            seen.append(cfg)
+
+        def connect(self):
+            raise TransportError("not connected")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(cli, "VSensorClient", Client)
+    cli.main(["--port", "/dev/ttyY", "read", "mode"])
+    cli.main(["read", "mode"])
+    cli.main(["--baud", "9600", "read", "mode"])
+    settings = [(c.port, c.baudrate, c.parity, c.float_format) for c in seen]
+    assert settings == [
+        ("/dev/ttyY", 9600, "N", 1),
+        ("/dev/ttyX", 38400, "E", 0),
+        ("/dev/ttyX", 9600, "E", 0),
+    ]
+
+
+def test_first_contact_stores_profile(monkeypatch, cache):
+    client = connect(monkeypatch, Config(port="/dev/ttyX", profile_cache=cache), device(1))
+    profile = ProfileStore(cache).get("/dev/ttyX", 1)
+    assert profile.float_format == 1 and profile.verified > 0
+    assert client.cfg.float_format == 1
+
+
+def test_float_format_mismatch_invalidates_profile(monkeypatch, cache):
+    ProfileStore(cache).put(DeviceProfile("/dev/ttyX", 1, float_format=1))
+    cfg = Config(port="/dev/ttyX", float_format=1, profile_cache=cache)
+    client = connect(monkeypatch, cfg, device(0))
+    assert client.cfg.float_format == 0
+    assert cfg.float_format == 1  # the caller's Config is left alone
+    assert client.read_pressure() == pytest.approx(123.5)
+    assert ProfileStore(cache).get("/dev/ttyX", 1).float_format == 0
+
+
+def test_mismatch_without_profile_keeps_config(monkeypatch, cache):
+    cfg = Config(port="/dev/ttyX", float_format=1, profile_cache=cache)
+    client = connect(monkeypatch, cfg, device(0))
+    assert client.cfg.float_format == 1
+    assert ProfileStore(cache).get("/dev/ttyX", 1) is None
+
+
+def test_garbled_answer_drops_profile(monkeypatch, cache):
+    ProfileStore(cache).put(DeviceProfile("/dev/ttyX", 1, float_format=1))
+    cfg = Config(port="/dev/ttyX", profile_cache=cache)
+    connect(monkeypatch, cfg, device(error=TransportError("CRC")))
+    assert ProfileStore(cache).get("/dev/ttyX", 1) is None
+
+
+def test_silent_device_keeps_profile_and_checks_again(monkeypatch, cache):
+    ProfileStore(cache).put(DeviceProfile("/dev/ttyX", 1, float_format=1))
+    cfg = Config(port="/dev/ttyX", profile_cache=cache)
+    connect(monkeypatch, cfg, device(error=TimeoutError("timeout")))
+    assert ProfileStore(cache).get("/dev/ttyX", 1).verified == 0.0
+    connect(monkeypatch, cfg, device(1))
+    assert ProfileStore(cache).get("/dev/ttyX", 1).verified > 0
+
+
+def test_check_runs_once_per_process(monkeypatch, cache):
+    cfg = Config(port="/dev/ttyX", profile_cache=cache)
+    connect(monkeypatch, cfg, device(1))
+    connect(monkeypatch, cfg, device(error=TransportError("CRC")))
+    assert ProfileStore(cache).get("/dev/ttyX", 1) is not None
+
+
+def test_fc23_support_is_persisted(monkeypatch, cache):
+    cfg = Config(port="/dev/ttyX", profile_cache=cache, verify_writes=True)
+    client = connect(monkeypatch, cfg, device(1))
+    client.write_u16(REG.MODE, 1)
+    assert ProfileStore(cache).get("/dev/ttyX", 1).fc23 is True
+    monkeypatch.setattr(client_mod, "_fc23_support", {})
+    monkeypatch.setattr(client_mod, "_profiles_checked", set())
+    assert connect(monkeypatch, cfg, device(1)).supports_fc23 is True
+
+
+def test_disabled_cache(monkeypatch, tmp_path):
+    client = connect(monkeypatch, Config(port="/dev/ttyX", profile_cache=""), device(1))
+    assert client.cfg.profiles() is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_scan_device_profile():
+    dev = Device("/dev/ttyX", SerialSettings(19200, "E"), 7)
+    profile = dev.profile()
+    assert (profile.port, profile.slave_id, profile.baudrate, profile.parity) == (
+        "/dev/ttyX",
+        7,
+        19200,
+        "E",
+    )
+    assert profile.float_format is None
+    assert profile.matches(dev.config(Config(float_format=3)))
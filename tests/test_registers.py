@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from vsensor import registers as REG
+from vsensor.client import VSensorClient
+from vsensor.codec import RegisterCodec
+from vsensor.config import Config
+from vsensor.errors import VSensorError
+from vsensor.registers import Access, DataType, Register
+from vsensor.transport import FakeTransport
+
+
+def test_table_matches_constants() -> None:
+    for reg in REG.REGISTERS:
+        assert getattr(REG, reg.name) == reg.address
+        assert REG.BY_ADDRESS[reg.address] is reg
+    assert REG.lookup("pressure_pa") is REG.BY_NAME["PRESSURE_PA"]
+    assert REG.BY_NAME["PRESSURE_PA"].width == 2
+    assert REG.BY_NAME["MODE"].width == 1
+
+
+def test_table_has_no_overlaps() -> None:
+    spans = sorted((r.address, r.address + r.width) for r in REG.REGISTERS)
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert end <= start
+
+
+def test_unknown_register() -> None:
+    with pytest.raises(KeyError):
+        REG.lookup("nope")
+
+
+def test_codec_integer_types_and_scaling() -> None:
+    codec = RegisterCodec()
+    s16 = Register("X", 1, DataType.S16, Access.RW)
+    assert codec.decode(s16, [0xFFFE]) == -2
+    assert codec.encode(s16, -2) == [0xFFFE]
+    scaled = Register("Y", 1, DataType.U16, Access.RW, scale=0.1)
+    assert codec.encode(scaled, 12.3) == [123]
+    assert codec.decode(scaled, [123]) == pytest.approx(12.3)
+    with pytest.raises(ValueError):
+        codec.encode(REG.BY_NAME["MODE"], 70000)
+
+
+def test_generic_read_write_roundtrip() -> None:
+    ft = FakeTransport()
+    client = VSensorClient(Config(), transport=ft)
+    client.write(auto_setpoint=55.5, mode=1, low_alarm=-3.0)
+    ft.write_register(REG.PID_OUTPUT_RAW - 1, 0xFFFF)
+
+    values = client.read("MODE", "AUTO_SETPOINT", "PID_OUTPUT_RAW", "LOW_ALARM")
+
+    assert list(values) == ["MODE", "AUTO_SETPOINT", "PID_OUTPUT_RAW", "LOW_ALARM"]
+    assert values["AUTO_SETPOINT"] == pytest.approx(55.5)
+    assert values["MODE"] == 1
+    assert values["PID_OUTPUT_RAW"] == -1
+    assert values["LOW_ALARM"] == pytest.approx(-3.0)
+
+
+def test_write_read_only_register_rejected() -> None:
+    client = VSensorClient(Config(), transport=FakeTransport())
+    with pytest.raises(VSensorError):
+        client.write(pressure_pa=1.0)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import TransportError
+from vsensor.registry import TransportRegistry
+from vsensor.transport import FakeTransport
+
+
+class CountingFactory:
+    def __init__(self) -> None:
+        self.opened: list[FakeTransport] = []
+        self.closed = 0
+
+    def __call__(self, cfg: Config) -> FakeTransport:
+        factory = self
+
+        class Port(FakeTransport):
+            def close(self) -> None:
+                factory.closed += 1
+
+        port = Port(cfg)
+        self.opened.append(port)
+        return port
+
+
+def test_same_line_is_opened_once() -> None:
+    factory = CountingFactory()
+    reg = TransportRegistry(factory)
+    cfg = Config(port="/dev/ttyX", slave_id=1)
+    a = VSensorClient(cfg, transport=reg.acquire(cfg))
+    b = VSensorClient(cfg, transport=reg.acquire(cfg))
+    assert len(factory.opened) == 1
+    assert reg.refcount(cfg) == 2
+
+    a.set_auto_setpoint(5.0)
+    assert b.read_auto_setpoint() == 5.0
+
+    a.close()
+    a.close()
+    assert reg.refcount(cfg) == 1
+    assert factory.closed == 0
+    b.close()
+    assert reg.refcount(cfg) == 0
+    assert factory.closed == 1
+
+
+def test_slaves_and_settings_are_keyed_separately() -> None:
+    factory = CountingFactory()
+    reg = TransportRegistry(factory)
+    s1 = reg.acquire(Config(port="/dev/ttyX", slave_id=1))
+    s2 = reg.acquire(Config(port="/dev/ttyX", slave_id=2))
+    other = reg.acquire(Config(port="/dev/ttyX", baudrate=19200))
+    assert len(factory.opened) == 2
+    s1.write_register(0, 1)
+    assert s2.read_holding_registers(0, 1) == [0]
+    other.close()
+    reg.close_all()
+
+
+def test_released_handle_raises() -> None:
+    reg = TransportRegistry(CountingFactory())
+    handle = reg.acquire(Config())
+    handle.close()
+    with pytest.raises(TransportError):
+        handle.read_holding_registers(0, 1)
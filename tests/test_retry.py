@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from pymodbus.exceptions import ModbusIOException
+
+import vsensor.transport as transport_mod
+from vsensor.config import Config
+from vsensor.errors import (
+    CircuitOpenError,
+    ModbusExceptionError,
+    TimeoutError,
+    TransportError,
+    VSensorError,
+)
+from vsensor.retry import BreakerState, CircuitBreaker, RetryPolicy
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def failing(times: int, exc: Exception | None = None):
+    calls = {"n": 0}
+
+    def func() -> str:
+        calls["n"] += 1
+        if calls["n"] <= times:
+            raise exc or TimeoutError("boom")
+        return "ok"
+
+    return func, calls
+
+
+def test_policy_retries_with_exponential_backoff() -> None:
+    clock = Clock()
+    policy = RetryPolicy(max_attempts=4, backoff=0.1, backoff_max=1.0, jitter=0.0)
+    func, calls = failing(3)
+    assert policy.run(func, sleep=clock.sleep, clock=clock) == "ok"
+    assert calls["n"] == 4
+    assert clock.now == pytest.approx(0.1 + 0.2 + 0.4)
+
+
+def test_policy_gives_up_after_max_attempts() -> None:
+    clock = Clock()
+    func, calls = failing(5)
+    with pytest.raises(TimeoutError):
+        RetryPolicy(max_attempts=2, jitter=0.0).run(func, sleep=clock.sleep, clock=clock)
+    assert calls["n"] == 2
+
+
+def test_policy_deadline() -> None:
+    clock = Clock()
+    policy = RetryPolicy(max_attempts=10, backoff=1.0, backoff_max=1.0, jitter=0.0, deadline=2.5)
+    func, calls = failing(10)
+    with pytest.raises(TimeoutError, match="deadline"):
+        policy.run(func, sleep=clock.sleep, clock=clock)
+    assert calls["n"] == 3
+
+
+def test_deadline_bounds_each_attempt() -> None:
+    clock = Clock()
+    policy = RetryPolicy(max_attempts=10, backoff=0.1, backoff_max=0.1, jitter=0.0, deadline=2.5)
+    budgets = []
+
+    def attempt(budget: float | None) -> str:
+        budgets.append(budget)
+        clock.now += min(2.0, budget or 2.0)  # a transport timing out
+        raise TimeoutError("timeout")
+
+    with pytest.raises(TimeoutError, match="deadline"):
+        policy.run_timed(attempt, sleep=clock.sleep, clock=clock)
+    assert budgets == pytest.approx([2.5, 0.4])
+    assert clock.now == pytest.approx(2.5)
+    assert RetryPolicy().run_timed(lambda budget: budget) is None
+
+
+def test_async_deadline_cancels_the_attempt() -> None:
+    import asyncio
+
+    async def hang() -> str:
+        await asyncio.sleep(5.0)
+        return "late"
+
+    policy = RetryPolicy(backoff=0.0, deadline=0.05)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError, match="deadline"):
+        asyncio.run(policy.run_async(hang))
+    assert time.monotonic() - started < 1.0
+
+
+def test_non_retryable_errors_propagate() -> None:
+    func, calls = failing(1, ValueError("bad"))
+    with pytest.raises(ValueError):
+        RetryPolicy().run(func)
+    assert calls["n"] == 1
+
+
+def test_permanent_exception_responses_are_not_retried() -> None:
+    func, calls = failing(1, ModbusExceptionError("illegal function", 1))
+    with pytest.raises(ModbusExceptionError):
+        RetryPolicy(backoff=0.0).run(func)
+    assert calls["n"] == 1
+    func, calls = failing(1, ModbusExceptionError("busy", 6))
+    assert RetryPolicy(backoff=0.0).run(func) == "ok"
+
+
+def test_breaker_counts_exception_responses_as_answers() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0)
+    func, _ = failing(3, ModbusExceptionError("illegal address", 2))
+    for _ in range(3):
+        with pytest.raises(ModbusExceptionError):
+            breaker.call(func)
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_jitter_stays_in_bounds() -> None:
+    policy = RetryPolicy(backoff=1.0, backoff_max=10.0, jitter=0.5)
+    for _ in range(100):
+        assert 0.5 <= policy.delay(1) <= 1.5
+
+
+def test_breaker_opens_and_fails_fast() -> None:
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5.0, clock=clock)
+    func, calls = failing(100)
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            breaker.call(func)
+    assert breaker.state is BreakerState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(func)
+    assert calls["n"] == 2
+
+    clock.now = 5.0
+    with pytest.raises(TimeoutError):
+        breaker.call(func)
+    assert breaker.state is BreakerState.OPEN
+
+
+def test_breaker_background_probe_closes_circuit() -> None:
+    probes, _ = failing(1)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01, probe=probes)
+    breaker.record_failure()
+    deadline = time.monotonic() + 2.0
+    while breaker.state is not BreakerState.CLOSED and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert breaker.state is BreakerState.CLOSED
+    breaker.close()
+
+
+class FakeSerialClient:
+    """Stand-in for pymodbus' ModbusSerialClient."""
+
+    failures = 0
+    calls = 0
+
+    def __init__(self, **kwargs) -> None:
+        pass
+
+    def connect(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def read_holding_registers(self, address: int, count: int, slave: int):
+        type(self).calls += 1
+        if type(self).calls <= type(self).failures:
+            raise ModbusIOException("no response")
+        return SimpleNamespace(registers=[7] * count, isError=lambda: False)
+
+
+@pytest.fixture
+def serial(monkeypatch):
+    FakeSerialClient.failures = 0
+    FakeSerialClient.calls = 0
+    monkeypatch.setattr(transport_mod, "ModbusSerialClient", FakeSerialClient)
+    return FakeSerialClient
+
+
+def test_rtu_transport_uses_policy(serial) -> None:
+    serial.failures = 2
+    cfg = Config(retries=3, retry_backoff=0.0)
+    t = transport_mod.RTUTransport(cfg)
+    assert t.read_holding_registers(0, 2) == [7, 7]
+    assert serial.calls == 3
+
+
+def test_rtu_transport_breaker_fails_fast(serial) -> None:
+    serial.failures = 100
+    cfg = Config(retries=1, breaker_threshold=2, breaker_reset=60.0)
+    t = transport_mod.RTUTransport(cfg)
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            t.read_holding_registers(0, 1)
+    with pytest.raises(CircuitOpenError):
+        t.read_holding_registers(0, 1)
+    assert serial.calls == 2
+    assert isinstance(CircuitOpenError("x"), VSensorError)
+    assert isinstance(CircuitOpenError("x"), TransportError)
+    t.close()
@@ -0,0 +1,130 @@
+import os
+import time
+
+import pytest
+
+from vsensor.bus import RS485Bus
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import ModbusExceptionError, TimeoutError
+from vsensor.models import Mode
+from vsensor.rtu_slave import RTUSlaveSimulator, VirtualSensor
+from vsensor.transport import RTUTransport
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs pseudo-terminals")
+
+
+@pytest.fixture
+def sim():
+    with RTUSlaveSimulator([VirtualSensor(1, seed=1), VirtualSensor(2, float_format=0)]) as s:
+        yield s
+
+
+@pytest.fixture
+def transport(sim):
+    cfg = Config(port=sim.port, timeout=0.2, retries=2, retry_backoff=0.0, breaker_threshold=0)
+    t = RTUTransport(cfg)
+    yield t
+    t.close()
+
+
+def client_for(transport, slave_id=1, float_format=1):
+    cfg = Config(slave_id=slave_id, float_format=float_format)
+    return VSensorClient(cfg, transport=transport.for_slave(slave_id))
+
+
+def test_read_and_write_over_serial(transport):
+    client = client_for(transport)
+    telemetry = client.read_telemetry()
+    assert telemetry.auto_setpoint == 100.0
+    assert telemetry.mode is Mode.AUTO
+    client.set_auto_setpoint(42.5)
+    client.write(MODE=int(Mode.MANUAL), HAND_SETPOINT_PERCENT=20.0)
+    assert client.refresh("AUTO_SETPOINT", "MODE", "HAND_SETPOINT_PERCENT") == {
+        "AUTO_SETPOINT": 42.5,
+        "MODE": int(Mode.MANUAL),
+        "HAND_SETPOINT_PERCENT": 20.0,
+    }
+
+
+def test_process_values_and_heartbeat_change(transport):
+    client = client_for(transport)
+    first = client.read("HEARTBEAT", "OUTPUT_PERCENT")
+    time.sleep(0.3)
+    second = client.read("HEARTBEAT", "OUTPUT_PERCENT")
+    assert second["HEARTBEAT"] > first["HEARTBEAT"]
+    assert second["OUTPUT_PERCENT"] > first["OUTPUT_PERCENT"]
+
+
+def test_frozen_heartbeat(sim, transport):
+    client = client_for(transport)
+    sim.sensor(1).faults.freeze_heartbeat = True
+    before = client.read("HEARTBEAT")
+    time.sleep(0.25)
+    assert client.read("HEARTBEAT") == before
+
+
+def test_float_format_per_device(transport):
+    assert client_for(transport, 2, float_format=0).read_auto_setpoint() == 100.0
+
+
+def test_dropped_frames_time_out_and_recover(sim, transport):
+    client = client_for(transport)
+    sim.sensor(1).faults.drop_rate = 1.0
+    with pytest.raises(TimeoutError):
+        client.read_pressure()
+    assert sim.stats.dropped == 2  # one per attempt
+    sim.sensor(1).faults.drop_rate = 0.0
+    assert client.read_auto_setpoint() == 100.0
+
+
+def test_crc_errors_are_retried(sim, transport):
+    client = client_for(transport)
+    sim.sensor(1).faults.crc_error_rate = 1.0
+    with pytest.raises(TimeoutError):
+        client.read_pressure()
+    sim.sensor(1).faults.crc_error_rate = 0.0
+    assert client.read_auto_setpoint() == 100.0
+
+
+def test_injected_exception_code(sim, transport):
+    client = client_for(transport)
+    sim.sensor(1).faults.exception_rate = 1.0
+    sim.sensor(1).faults.exception_code = 6
+    with pytest.raises(ModbusExceptionError) as info:
+        client.read_pressure()
+    assert info.value.code == 6
+
+
+def test_read_only_register_rejects_writes(transport):
+    client = client_for(transport)
+    with pytest.raises(ModbusExceptionError) as info:
+        client.write_float(151, 1.0)
+    assert info.value.code == 2
+
+
+def test_delay_beyond_timeout(sim, transport):
+    client = client_for(transport)
+    # Longer than both attempts: RTU has no transaction IDs, so a reply
+    # arriving during the retry would be taken as its answer.
+    sim.sensor(1).faults.delay = 0.5
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        client.read_pressure()
+    assert time.monotonic() - started < 1.0
+    sim.sensor(1).faults.delay = 0.0
+    time.sleep(0.3)  # let the late replies drain
+    assert client.read_auto_setpoint() == 100.0
+
+
+def test_bus_with_absent_device(sim):
+    cfg = Config(port=sim.port, timeout=0.1, breaker_threshold=0)
+    bus = RS485Bus(cfg, transport=RTUTransport(cfg), device_retries=1)
+    try:
+        for slave_id in (1, 2, 3):
+            bus.add(slave_id)
+        results = bus.poll_cycle()
+    finally:
+        bus.close()
+    assert sorted(results) == [1, 2]
+    assert not bus.status(3).online
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from vsensor import registers as REG
+from vsensor.codec import RegisterCodec
+from vsensor.config import Config
+from vsensor.errors import TimeoutError, TransportError
+from vsensor.rtu_slave import RTUSlaveSimulator, VirtualSensor
+from vsensor.scan import (
+    FLOAT_BLOCK,
+    Device,
+    SerialSettings,
+    candidate_settings,
+    infer_float_format,
+    scan,
+    scan_port,
+)
+from vsensor.transport import FakeTransport
+
+
+def float_block(fmt: int, **values: float) -> list[int]:
+    words = [0] * FLOAT_BLOCK[1]
+    codec = RegisterCodec(fmt)
+    for name, value in values.items():
+        offset = REG.lookup(name).address - FLOAT_BLOCK[0]
+        words[offset : offset + 2] = codec.encode(REG.lookup(name), value)
+    return words
+
+
+@pytest.mark.parametrize("fmt, inferred", [(0, 0), (1, 1), (2, 1), (3, 0)])
+def test_infer_float_format(fmt: int, inferred: int) -> None:
+    words = float_block(fmt, PRESSURE_PA=87.3, AUTO_SETPOINT=100.0, OUTPUT_PERCENT=42.5)
+    assert infer_float_format(words) == inferred
+    # Formats 2 and 3 put the same words on the wire as 1 and 0.
+    assert RegisterCodec(inferred).unpack_float(words[2:4]) == pytest.approx(87.3)
+
+
+def test_infer_float_format_needs_nonzero_values() -> None:
+    assert infer_float_format([0] * FLOAT_BLOCK[1]) is None
+
+
+class LineFactory:
+    """Fake adapters: only ``answers`` settings reach the devices ``ids``."""
+
+    def __init__(self, answers: SerialSettings, ids: set[int], fmt: int = 1) -> None:
+        self.answers = answers
+        self.ids = ids
+        self.fmt = fmt
+        self.opened: list[Config] = []
+
+    def __call__(self, cfg: Config) -> FakeTransport:
+        if cfg.port == "/dev/missing":
+            raise TransportError("Serial connection failed")
+        self.opened.append(cfg)
+        factory = self
+
+        class Line(FakeTransport):
+            def for_slave(self, slave_id, timeout=None, retries=None):
+                view = super().for_slave(slave_id)
+                if (
+                    SerialSettings(cfg.baudrate, cfg.parity, cfg.stopbits) != factory.answers
+                    or slave_id not in factory.ids
+                ):
+
+                    def silent(address, count):
+                        raise TimeoutError("no answer")
+
+                    view.read_holding_registers = silent  # type: ignore[method-assign]
+                else:
+                    words = float_block(factory.fmt, PRESSURE_PA=12.5, AUTO_SETPOINT=100.0)
+                    view.write_registers(FLOAT_BLOCK[0] - 1, words)
+                return view
+
+        return Line(cfg)
+
+
+def test_scan_finds_settings_and_devices() -> None:
+    target = SerialSettings(19200, "E", 1)
+    factory = LineFactory(target, {3, 7}, fmt=0)
+    devices = scan_port(
+        "/dev/ttyX", candidate_settings(), range(1, 11), transport_factory=factory
+    )
+    assert [(d.slave_id, d.settings, d.float_format) for d in devices] == [
+        (3, target, 0),
+        (7, target, 0),
+    ]
+    # Stopped at the first setting that answered.
+    assert SerialSettings(factory.opened[-1].baudrate, factory.opened[-1].parity) == target
+    assert factory.opened[0].timeout < 0.1 and factory.opened[0].retries == 1
+    cfg = devices[0].config()
+    assert (cfg.baudrate, cfg.parity, cfg.slave_id, cfg.float_format) == (19200, "E", 3, 0)
+    assert "VSENSOR_BAUD=19200" in devices[0].env()
+
+
+def test_scan_runs_ports_in_parallel() -> None:
+    factory = LineFactory(SerialSettings(), {1})
+    devices = scan(
+        ["/dev/a", "/dev/missing", "/dev/b"],
+        [SerialSettings()],
+        [1, 2],
+        transport_factory=factory,
+    )
+    assert sorted(d.port for d in devices) == ["/dev/a", "/dev/b"]
+
+
+def test_device_without_float_format_keeps_default() -> None:
+    base = Config(float_format=3)
+    assert Device("/dev/x", SerialSettings(), 5).config(base).float_format == 3
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs pseudo-terminals")
+def test_scan_over_serial() -> None:
+    sensors = [VirtualSensor(2, float_format=0), VirtualSensor(4, float_format=1)]
+    with RTUSlaveSimulator(sensors) as sim:
+        started = time.monotonic()
+        devices = scan([sim.port], [SerialSettings(115200)], range(1, 9), margin=0.05)
+        elapsed = time.monotonic() - started
+    assert [(d.slave_id, d.float_format) for d in devices] == [(2, 0), (4, 1)]
+    assert elapsed < 2.0
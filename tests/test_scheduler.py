@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from vsensor import metrics
+from vsensor.bus import RS485Bus
+from vsensor.config import Config
+from vsensor.errors import DeadlineExceededError, TimeoutError
+from vsensor.scheduler import BusScheduler, Priority, priority, request_class
+from vsensor.transport import FakeTransport
+
+
+def queue_up(sched: BusScheduler, requests, order: list) -> list[threading.Thread]:
+    """Start a thread per ``(name, level)`` and wait until all are queued."""
+    threads = []
+    for name, level in requests:
+
+        def run(name=name, level=level) -> None:
+            with sched.slot(level):
+                order.append(name)
+
+        t = threading.Thread(target=run)
+        t.start()
+        threads.append(t)
+        while sched.queued < len(threads):
+            time.sleep(0.001)
+    return threads
+
+
+def test_fifo_within_a_class() -> None:
+    sched = BusScheduler()
+    order: list[int] = []
+    sched.acquire()
+    threads = queue_up(sched, [(i, Priority.INTERACTIVE) for i in range(5)], order)
+    sched.release()
+    for t in threads:
+        t.join()
+    assert order == list(range(5))
+
+
+def test_control_writes_overtake_queued_polls() -> None:
+    sched = BusScheduler()
+    order: list[str] = []
+    sched.acquire(Priority.BACKGROUND)
+    requests = [
+        ("poll1", Priority.BACKGROUND),
+        ("poll2", Priority.BACKGROUND),
+        ("read", Priority.INTERACTIVE),
+        ("write", Priority.CONTROL),
+    ]
+    threads = queue_up(sched, requests, order)
+    sched.release()
+    for t in threads:
+        t.join()
+    assert order == ["write", "read", "poll1", "poll2"]
+
+
+def test_expired_requests_are_dropped_not_run_late() -> None:
+    sched = BusScheduler()
+    sched.acquire(Priority.CONTROL)
+    with pytest.raises(DeadlineExceededError):
+        sched.acquire(Priority.BACKGROUND, deadline=time.monotonic() + 0.05)
+    with pytest.raises(TimeoutError):
+        sched.acquire(Priority.INTERACTIVE, timeout=0.02)
+    assert sched.queued == 0
+    sched.release()
+    stats = sched.stats()
+    assert stats[Priority.BACKGROUND].dropped == 1
+    assert stats[Priority.INTERACTIVE].dropped == 1
+    assert stats[Priority.CONTROL].granted == 1
+
+
+def test_slots_allow_concurrent_requests() -> None:
+    sched = BusScheduler(slots=2)
+    sched.acquire()
+    sched.acquire()
+    with pytest.raises(TimeoutError):
+        sched.acquire(timeout=0.01)
+    sched.release()
+    sched.acquire(timeout=0.01)
+
+
+def test_request_class_defaults_and_context() -> None:
+    assert request_class(3) == (Priority.INTERACTIVE, None)
+    assert request_class(16) == (Priority.CONTROL, None)
+    with priority(Priority.BACKGROUND, deadline=10.0):
+        level, deadline = request_class(3)
+        assert level is Priority.BACKGROUND
+        with priority(Priority.INTERACTIVE, deadline=60.0):
+            # an enclosing deadline is never extended
+            assert request_class(3) == (Priority.INTERACTIVE, deadline)
+    assert request_class(3) == (Priority.INTERACTIVE, None)
+
+
+def test_queue_delay_metrics_per_class() -> None:
+    collector = metrics.enable()
+    try:
+        sched = BusScheduler()
+        with sched.slot(Priority.CONTROL):
+            pass
+        sched.acquire(Priority.CONTROL)
+        with pytest.raises(DeadlineExceededError):
+            sched.acquire(Priority.BACKGROUND, deadline=time.monotonic())
+        sched.release()
+        queues = {q["priority"]: q for q in collector.snapshot()["queues"]}
+        assert queues["control"]["delay"]["count"] == 2
+        assert queues["background"]["dropped"] == 1
+        text = collector.render_prometheus()
+        assert 'vsensor_queue_dropped_total{priority="background"} 1' in text
+    finally:
+        metrics.disable()
+
+
+class ScheduledFake(FakeTransport):
+    """Fake bus whose requests go through a scheduler, like the real ones."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.scheduler = BusScheduler()
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        with self.scheduler.slot(*request_class(3)):
+            return super().read_holding_registers(address, count)
+
+
+def test_bus_polls_run_as_background_with_deadline() -> None:
+    transport = ScheduledFake()
+    bus = RS485Bus(Config(), transport=transport)
+    bus.add(1)
+    transport.scheduler.acquire(Priority.CONTROL)  # an operator write in progress
+    try:
+        assert bus.poll_cycle(deadline=0.02) == {}
+    finally:
+        transport.scheduler.release()
+    assert "expired" in bus.status(1).last_error
+    assert bus.poll_cycle(deadline=1.0)[1] is not None
+    stats = transport.scheduler.stats()[Priority.BACKGROUND]
+    assert (stats.granted, stats.dropped) == (1, 1)
@@ -0,0 +1,56 @@
+import pytest
+
+from vsensor.bus import RS485Bus
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.simulation import SimulatedTransport, WireTiming
+
+
+def test_character_time_includes_framing_bits():
+    assert WireTiming(9600).bits_per_char == 10
+    assert WireTiming(9600, parity="E").bits_per_char == 11
+    assert WireTiming(9600, parity="N", stopbits=2).bits_per_char == 11
+    assert WireTiming(19200, bytesize=7, parity="O").char_time == pytest.approx(10 / 19200)
+
+
+def test_frame_gap_is_fixed_above_19200_baud():
+    assert WireTiming(9600).frame_gap == pytest.approx(3.5 * 10 / 9600)
+    assert WireTiming(115200).frame_gap == pytest.approx(0.00175)
+
+
+def test_transaction_time():
+    t = WireTiming(9600, turnaround=0.005)
+    # FC03 for one register: 8 byte request, 7 byte response.
+    expected = 15 * 10 / 9600 + 2 * 3.5 * 10 / 9600 + 0.005
+    assert t.transaction_time(8, 7) == pytest.approx(expected)
+
+
+def test_from_config():
+    cfg = Config(baudrate=19200, parity="E", stopbits=1, bytesize=8)
+    assert WireTiming.from_config(cfg, 0.002) == WireTiming(19200, 8, "E", 1, 0.002)
+
+
+def test_simulated_transport_accumulates_bus_time_without_sleeping():
+    sim = SimulatedTransport(timing=WireTiming(9600, turnaround=0.0), realtime=False)
+    client = VSensorClient(Config(), transport=sim)
+    client.read_telemetry()
+    assert sim.transactions == 1
+    assert sim.bus_time > 0.04
+    assert client.read_mode().name == "AUTO"
+
+
+def test_slaves_share_the_line():
+    sim = SimulatedTransport(timing=WireTiming(9600), realtime=False)
+    bus = RS485Bus(Config(), transport=sim)
+    for slave_id in (1, 2, 3):
+        bus.add(slave_id)
+    bus.poll_cycle()
+    assert sim.transactions == 3
+    assert sim.for_slave(2).bus_time == sim.bus_time
+
+
+def test_read_write_is_one_transaction():
+    sim = SimulatedTransport(timing=WireTiming(9600), realtime=False)
+    assert sim.read_write_registers(10, 2, 10, [7, 8]) == [7, 8]
+    assert sim.transactions == 1
+    assert sim.bus_time == pytest.approx(sim.timing.transaction_time(17, 9))
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.models import Mode, Snapshot, Telemetry
+from vsensor.subscription import Change, Subscription
+from vsensor.transport import FakeTransport
+
+
+def snap(t: float, pressure: float = 0.0, mode: Mode = Mode.AUTO, hb: int = 0) -> Snapshot:
+    return Snapshot(t, Telemetry(pressure, 0.0, 100.0, mode), hb)
+
+
+def collect(**kwargs) -> tuple[Subscription, list[Change]]:
+    events: list[Change] = []
+    kwargs.setdefault("channels", ("pressure_pa", "mode"))
+    return Subscription(callback=events.append, **kwargs), events
+
+
+def test_first_snapshot_is_always_delivered() -> None:
+    sub, events = collect()
+    sub(snap(0.0, 10.0))
+    assert len(events) == 1
+    assert events[0].values == {"pressure_pa": 10.0, "mode": Mode.AUTO}
+    assert events[0].changed == ("pressure_pa", "mode")
+    assert not events[0].keepalive
+
+
+def test_deadband_is_relative_to_last_delivered_value() -> None:
+    sub, events = collect(deadband={"pressure_pa": 5.0})
+    for t, p in enumerate([100.0, 103.0, 104.9, 106.0, 108.0, 111.5]):
+        sub(snap(float(t), p))
+    assert [e.values["pressure_pa"] for e in events] == [100.0, 106.0, 111.5]
+    assert events[1].changed == ("pressure_pa",)
+
+
+def test_mode_change_ignores_deadband() -> None:
+    sub, events = collect(deadband=50.0)
+    sub(snap(0.0))
+    sub(snap(1.0, mode=Mode.MANUAL))
+    assert events[-1].changed == ("mode",)
+
+
+def test_min_interval_holds_changes() -> None:
+    sub, events = collect(min_interval=2.0)
+    sub(snap(0.0, 1.0))
+    assert sub(snap(1.0, 2.0)) is None
+    sub(snap(1.5, 1.0))  # back to the delivered value: nothing pending
+    sub(snap(2.5, 1.0))
+    sub(snap(3.0, 3.0))
+    assert [(e.snapshot.timestamp, e.values["pressure_pa"]) for e in events] == [
+        (0.0, 1.0),
+        (3.0, 3.0),
+    ]
+
+
+def test_keepalive_after_max_interval() -> None:
+    sub, events = collect(channels="PRESSURE_PA", max_interval=5.0)
+    for t in range(12):
+        sub(snap(float(t), 1.0))
+    assert [e.snapshot.timestamp for e in events] == [0.0, 5.0, 10.0]
+    assert all(e.keepalive and e.changed == () for e in events[1:])
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        Subscription(["pressure"], print)
+    with pytest.raises(ValueError):
+        Subscription(["pressure_pa"], print, deadband={"mode": 1.0})
+    with pytest.raises(ValueError):
+        Subscription(["pressure_pa"], print, min_interval=2.0, max_interval=1.0)
+
+
+def test_client_subscriptions_share_one_poller() -> None:
+    client = VSensorClient(Config(poll_interval=0.01), transport=FakeTransport())
+    changed = threading.Event()
+    modes: list[Change] = []
+    hb: list[Change] = []
+
+    def on_mode(event: Change) -> None:
+        modes.append(event)
+        if event.values["mode"] is Mode.MANUAL:
+            changed.set()
+
+    try:
+        sub = client.subscribe("mode", on_mode)
+        client.subscribe(["heartbeat"], hb.append)
+        poller = client._poller
+        assert poller is not None and poller.running
+        client.set_mode(Mode.MANUAL)
+        assert changed.wait(2.0)
+        sub.cancel()
+        n = len(modes)
+        client.set_mode(Mode.AUTO)
+        poller.poll_once()
+    finally:
+        client.close()
+    assert [e.values["mode"] for e in modes] == [Mode.AUTO, Mode.MANUAL]
+    assert len(modes) == n
+    assert len(hb) >= 2
+    assert not poller.running
@@ -0,0 +1,316 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vsensor import framing
+from vsensor.bus import RS485Bus
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import ModbusExceptionError, TimeoutError, TransportError
+from vsensor.registry import port_key
+from vsensor.rtu_slave import VirtualSensor
+from vsensor.transport import (
+    RtuOverTcpTransport,
+    TcpTransport,
+    create_transport,
+)
+
+
+class Gateway:
+    """Minimal Modbus TCP (or RTU-over-TCP) server in front of virtual sensors.
+
+    Every request is answered on its own thread after ``delay`` seconds, so
+    responses to pipelined requests may overtake each other.
+    """
+
+    def __init__(self, units=(1, 2, 3, 4), delay=0.0, rtu=False):
+        self.sensors = {u: VirtualSensor(u) for u in units}
+        self.delay = delay
+        self.rtu = rtu
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.silent = set()
+        self.garble = None
+        self._lock = threading.Lock()
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.port = self._server.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _recv(self, conn, n):
+        data = b""
+        while len(data) < n:
+            chunk = conn.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError
+            data += chunk
+        return data
+
+    def _serve(self, conn):
+        send_lock = threading.Lock()
+        try:
+            while True:
+                if self.rtu:
+                    head = self._recv(conn, 7)
+                    frame = head + self._recv(conn, framing.request_length(head) - 7)
+                    unit, pdu = framing.decode_frame(frame)
+                    tid = 0
+                else:
+                    tid, _, length, unit = framing.MBAP_HEADER.unpack(self._recv(conn, 7))
+                    pdu = self._recv(conn, length - 1)
+                threading.Thread(
+                    target=self._answer, args=(conn, send_lock, tid, unit, pdu), daemon=True
+                ).start()
+        except (ConnectionError, OSError):
+            conn.close()
+
+    def _answer(self, conn, send_lock, tid, unit, pdu):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if unit in self.silent:
+            return
+        response = self.sensors[unit].handle(pdu)
+        if self.rtu:
+            out = framing.encode_frame(unit, response)
+        else:
+            out = framing.encode_mbap(tid, unit, response)
+        if self.garble is not None:
+            out = self.garble(out)
+        with send_lock:
+            conn.sendall(out)
+
+    def config(self, **kw):
+        kw.setdefault("transport", "rtu-over-tcp" if self.rtu else "tcp")
+        kw.setdefault("timeout", 1.0)
+        kw.setdefault("breaker_threshold", 0)
+        kw.setdefault("retry_backoff", 0.0)
+        return Config(host="127.0.0.1", tcp_port=self.port, **kw)
+
+    def close(self):
+        self._server.close()
+
+
+@pytest.fixture
+def gateway():
+    gw = Gateway()
+    yield gw
+    gw.close()
+
+
+def test_read_write_over_tcp(gateway):
+    transport = TcpTransport(gateway.config())
+    client = VSensorClient(Config(), transport=transport.for_slave(2))
+    try:
+        assert client.read_auto_setpoint() == 100.0
+        client.set_auto_setpoint(12.5)
+        client.write(LOW_ALARM=1.0, HIGH_ALARM=2.0)
+        assert client.refresh("AUTO_SETPOINT", "LOW_ALARM", "HIGH_ALARM") == {
+            "AUTO_SETPOINT": 12.5,
+            "LOW_ALARM": 1.0,
+            "HIGH_ALARM": 2.0,
+        }
+        assert gateway.sensors[2].get("AUTO_SETPOINT") == 12.5
+    finally:
+        transport.close()
+
+
+def test_exception_response(gateway):
+    transport = TcpTransport(gateway.config())
+    try:
+        with pytest.raises(ModbusExceptionError) as info:
+            transport.write_register(150, 1)  # PRESSURE_PA is read-only
+        assert info.value.code == framing.ILLEGAL_DATA_ADDRESS
+    finally:
+        transport.close()
+
+
+def test_requests_are_pipelined():
+    gw = Gateway(units=range(1, 9), delay=0.2)
+    transport = TcpTransport(gw.config(pipeline_depth=8))
+    views = [transport.for_slave(u) for u in range(1, 9)]
+    try:
+        started = time.monotonic()
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda v: v.read_holding_registers(152, 2), views))
+        elapsed = time.monotonic() - started
+    finally:
+        transport.close()
+        gw.close()
+    assert gw.max_in_flight == 8
+    assert elapsed < 0.2 * 4
+    assert len(results) == 8
+
+
+def test_pipeline_depth_limits_in_flight():
+    gw = Gateway(delay=0.05)
+    transport = TcpTransport(gw.config(pipeline_depth=2))
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda u: transport.read_holding_registers(0, 1, slave=u), [1, 2, 3, 4]))
+    finally:
+        transport.close()
+        gw.close()
+    assert gw.max_in_flight == 2
+
+
+def test_out_of_order_responses_reach_their_callers(gateway):
+    transport = TcpTransport(gateway.config(pipeline_depth=4))
+    for unit in (1, 2, 3, 4):
+        gateway.sensors[unit].set("AUTO_SETPOINT", float(unit))
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            values = list(
+                pool.map(
+                    lambda u: VSensorClient(
+                        Config(), transport=transport.for_slave(u)
+                    ).read_auto_setpoint(),
+                    [1, 2, 3, 4] * 5,
+                )
+            )
+    finally:
+        transport.close()
+    assert values == [1.0, 2.0, 3.0, 4.0] * 5
+
+
+def test_timeout_and_late_reply_is_ignored(gateway):
+    transport = TcpTransport(gateway.config(timeout=0.1, retries=1))
+    gateway.delay = 0.3
+    try:
+        with pytest.raises(TimeoutError):
+            transport.read_holding_registers(0, 1, slave=1)
+        gateway.delay = 0.0
+        time.sleep(0.3)
+        assert transport.read_holding_registers(152, 2, slave=1) == (
+            gateway.sensors[1].codec.pack_float(100.0)
+        )
+    finally:
+        transport.close()
+
+
+def test_deadline_cuts_the_attempt_timeout(gateway):
+    transport = TcpTransport(gateway.config(timeout=5.0, retries=3, deadline=0.2))
+    gateway.delay = 0.5
+    try:
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            transport.read_holding_registers(0, 1, slave=1)
+        assert time.monotonic() - started < 0.45
+    finally:
+        transport.close()
+
+
+def test_reconnects_after_connection_loss(gateway):
+    transport = TcpTransport(gateway.config())
+    try:
+        transport.read_holding_registers(0, 1, slave=1)
+        transport._sock.shutdown(socket.SHUT_RDWR)
+        time.sleep(0.05)
+        assert transport.read_holding_registers(155, 1, slave=1) == [0]
+    finally:
+        transport.close()
+
+
+@pytest.mark.parametrize(
+    "garble",
+    [
+        lambda out: out[:2] + b"\x00\x01" + out[4:],  # protocol ID 1
+        lambda out: out[:4] + b"\x00\x01" + out[6:],  # length 1
+        lambda out: out[:8] + bytes([out[8] + 2]) + out[9:],  # byte count
+    ],
+)
+def test_malformed_response_fails_fast(gateway, garble):
+    transport = TcpTransport(gateway.config(timeout=5.0, retries=1))
+    gateway.garble = garble
+    try:
+        started = time.monotonic()
+        with pytest.raises(TransportError) as info:
+            transport.read_holding_registers(152, 2, slave=1)
+        assert not isinstance(info.value, TimeoutError)
+        assert time.monotonic() - started < 1.0
+        gateway.garble = None
+        assert len(transport.read_holding_registers(152, 2, slave=1)) == 2
+    finally:
+        transport.close()
+
+
+def test_reader_failure_fails_pending_requests(gateway, monkeypatch):
+    read_response = TcpTransport._read_response
+    broken = threading.Event()
+
+    def reader(self, sock):
+        result = read_response(self, sock)
+        if broken.is_set():
+            raise RuntimeError("reader bug")
+        return result
+
+    monkeypatch.setattr(TcpTransport, "_read_response", reader)
+    transport = TcpTransport(gateway.config(timeout=5.0, retries=1))
+    try:
+        transport.read_holding_registers(0, 1, slave=1)
+        broken.set()
+        with pytest.raises(TransportError, match="reader bug"):
+            transport.read_holding_registers(0, 1, slave=1)
+        assert transport._sock is None
+    finally:
+        transport.close()
+
+
+def test_rtu_over_tcp():
+    gw = Gateway(rtu=True)
+    cfg = gw.config(timeout=0.2, retries=2)
+    transport = create_transport(cfg)
+    try:
+        assert isinstance(transport, RtuOverTcpTransport)
+        assert transport.pipeline_depth == 1
+        client = VSensorClient(Config(), transport=transport.for_slave(3))
+        client.set_auto_setpoint(7.0)
+        assert client.read_auto_setpoint() == 7.0
+        gw.silent.add(3)
+        with pytest.raises(TimeoutError):
+            client.read_pressure()
+        gw.silent.clear()
+        assert client.read_auto_setpoint() == 7.0
+    finally:
+        transport.close()
+        gw.close()
+
+
+def test_bus_polls_concurrently_over_tcp():
+    gw = Gateway(units=range(1, 7), delay=0.1)
+    cfg = gw.config(pipeline_depth=6)
+    bus = RS485Bus(cfg, transport=create_transport(cfg))
+    try:
+        for unit in range(1, 7):
+            bus.add(unit)
+        started = time.monotonic()
+        results = bus.poll_cycle()
+        elapsed = time.monotonic() - started
+    finally:
+        bus.close()
+        gw.close()
+    assert sorted(results) == list(range(1, 7))
+    assert elapsed < 0.1 * 3
+
+
+def test_config_selects_transport():
+    with pytest.raises(ValueError):
+        create_transport(Config(transport="carrier-pigeon"))
+    tcp = Config(transport="tcp", host="gw", tcp_port=5020)
+    assert port_key(tcp) == ("tcp", "gw", 5020)
+    assert port_key(Config(transport="rtu", port="/dev/ttyUSB1"))[0] == "/dev/ttyUSB1"
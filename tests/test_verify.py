@@ -0,0 +1,138 @@
+import os
+
+import pytest
+
+import vsensor.client as client_mod
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import ModbusExceptionError, WriteVerificationError
+from vsensor.rtu_slave import RTUSlaveSimulator, VirtualSensor
+from vsensor.transport import FakeTransport, RTUTransport
+
+
+@pytest.fixture(autouse=True)
+def forget_fc23(monkeypatch):
+    monkeypatch.setattr(client_mod, "_fc23_support", {})
+
+
+class RecordingTransport(FakeTransport):
+    def __init__(self, fc23=True, clamp=None):
+        super().__init__()
+        self.fc23 = fc23
+        self.clamp = clamp
+        self.calls = []
+
+    def _store(self, address, values):
+        for i, v in enumerate(values):
+            self._regs[address + i] = min(v, self.clamp) if self.clamp is not None else v
+
+    def read_holding_registers(self, address, count):
+        self.calls.append(3)
+        return super().read_holding_registers(address, count)
+
+    def write_register(self, address, value):
+        self.calls.append(6)
+        self._store(address, [value])
+
+    def write_registers(self, address, values):
+        self.calls.append(16)
+        self._store(address, list(values))
+
+    def read_write_registers(self, read_address, read_count, write_address, values):
+        self.calls.append(23)
+        if not self.fc23:
+            raise ModbusExceptionError("illegal function", 1)
+        self._store(write_address, list(values))
+        return [self._regs.get(read_address + i, 0) for i in range(read_count)]
+
+
+def test_writes_are_not_verified_by_default():
+    transport = RecordingTransport()
+    client = VSensorClient(Config(), transport=transport)
+    client.set_mode(1)
+    client.set_auto_setpoint(12.5)
+    assert transport.calls == [6, 16]
+    assert client.supports_fc23 is None
+
+
+def test_verified_writes_use_fc23():
+    transport = RecordingTransport()
+    client = VSensorClient(Config(), transport=transport, verify_writes=True)
+    client.set_auto_setpoint(12.5)
+    client.write(MODE=1, AUTO_SETPOINT=20.0)
+    assert transport.calls == [23, 23, 23]
+    assert client.supports_fc23 is True
+    assert client.read_auto_setpoint() == 20.0
+
+
+def test_fallback_is_remembered_per_device():
+    transport = RecordingTransport(fc23=False)
+    cfg = Config(verify_writes=True)
+    VSensorClient(cfg, transport=transport).set_mode(1)
+    assert transport.calls == [23, 6, 3]
+    client = VSensorClient(cfg, transport=transport)
+    assert client.supports_fc23 is False
+    client.set_auto_setpoint(1.0)
+    assert transport.calls[3:] == [16, 3]
+    # Another slave on the same line is probed separately.
+    other = VSensorClient(Config(slave_id=2, verify_writes=True), transport=transport)
+    assert other.supports_fc23 is None
+
+
+@pytest.mark.parametrize("fc23", [True, False])
+def test_mismatch_raises(fc23):
+    client = VSensorClient(
+        Config(), transport=RecordingTransport(fc23=fc23, clamp=1), verify_writes=True
+    )
+    client.set_mode(1)
+    with pytest.raises(WriteVerificationError) as info:
+        client.set_mode(2)
+    assert info.value.expected == [2]
+    assert info.value.actual == [1]
+
+
+def test_other_exception_codes_propagate():
+    class Rejecting(RecordingTransport):
+        def read_write_registers(self, *args):
+            raise ModbusExceptionError("illegal address", 2)
+
+    client = VSensorClient(Config(), transport=Rejecting(), verify_writes=True)
+    with pytest.raises(ModbusExceptionError):
+        client.set_mode(1)
+    assert client.supports_fc23 is None
+
+
+def test_transport_without_fc23_is_not_remembered():
+    class NoFc23(RecordingTransport):
+        def read_write_registers(self, *args):
+            self.calls.append(23)
+            raise NotImplementedError
+
+    transport = NoFc23()
+    client = VSensorClient(Config(), transport=transport, verify_writes=True)
+    client.set_mode(1)
+    client.set_mode(2)
+    assert transport.calls == [23, 6, 3, 23, 6, 3]
+    assert client.supports_fc23 is None
+    assert client_mod._fc23_support == {}
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs pseudo-terminals")
+def test_verified_writes_over_serial():
+    sensors = [VirtualSensor(1), VirtualSensor(2, functions=(3, 6, 16))]
+    with RTUSlaveSimulator(sensors) as sim:
+        cfg = Config(port=sim.port, timeout=0.2, retries=0, breaker_threshold=0)
+        transport = RTUTransport(cfg)
+        try:
+            for slave_id, fc23 in ((1, True), (2, False)):
+                client = VSensorClient(
+                    Config(port=sim.port, slave_id=slave_id),
+                    transport=transport.for_slave(slave_id),
+                    verify_writes=True,
+                )
+                client.set_auto_setpoint(42.5)
+                client.write(MODE=0, AUTO_SETPOINT=50.0)
+                assert client.supports_fc23 is fc23
+                assert client.refresh("AUTO_SETPOINT") == {"AUTO_SETPOINT": 50.0}
+        finally:
+            transport.close()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import threading
+
+from vsensor.__main__ import main
+from vsensor.client import VSensorClient
+from vsensor.config import Config
+from vsensor.errors import TimeoutError
+from vsensor.transport import FakeTransport
+from vsensor.watch import WatchStats, watch
+
+
+class FlakyTransport(FakeTransport):
+    def __init__(self, fail_every: int = 0) -> None:
+        super().__init__()
+        self.fail_every = fail_every
+        self.reads = 0
+
+    def read_holding_registers(self, address: int, count: int) -> list[int]:
+        self.reads += 1
+        if self.fail_every and self.reads % self.fail_every == 0:
+            raise TimeoutError("no answer")
+        return super().read_holding_registers(address, count)
+
+
+def client(fail_every: int = 0) -> VSensorClient:
+    c = VSensorClient(Config(), transport=FlakyTransport(fail_every))
+    c.set_auto_setpoint(42.0)
+    return c
+
+
+def test_ndjson_stream_and_summary() -> None:
+    out = io.StringIO()
+    stats = watch(client(fail_every=3), ["auto_setpoint", "HEARTBEAT"], out, rate=0, count=6)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["seq"] for r in rows] == [0, 1, 3, 4]
+    assert all(r["AUTO_SETPOINT"] == 42.0 and r["ts"] > 0 for r in rows)
+    assert [r["HEARTBEAT"] for r in rows] == [1, 2, 3, 4]
+    assert stats.samples == 4
+    assert stats.errors == {"TimeoutError": 2}
+    assert "4 samples" in stats.summary() and "TimeoutError: 2" in stats.summary()
+
+
+def test_csv_stream() -> None:
+    out = io.StringIO()
+    watch(client(), ["MODE", "AUTO_SETPOINT"], out, rate=0, fmt="csv", count=2)
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["ts", "seq", "MODE", "AUTO_SETPOINT"]
+    assert [r[1:] for r in rows[1:]] == [["0", "0", "42.0"], ["1", "0", "42.0"]]
+
+
+def test_fixed_rate_without_drift() -> None:
+    out = io.StringIO()
+    stats = watch(client(), ["MODE"], out, rate=50.0, duration=0.2)
+    assert 8 <= stats.samples <= 11
+
+
+class BlockedOutput(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.release.wait()
+        return super().write(s)
+
+
+def test_slow_consumer_drops_samples_instead_of_blocking() -> None:
+    out = BlockedOutput()
+    stop = threading.Event()
+    stats = WatchStats()
+
+    def run() -> None:
+        nonlocal stats
+        stats = watch(client(), ["MODE"], out, rate=0, count=50, buffer=5, stop=stop)
+
+    t = threading.Thread(target=run)
+    t.start()
+    t.join(0.5)
+    out.release.set()
+    t.join()
+    assert stats.samples == 50
+    assert stats.dropped >= 40
+    assert len(out.getvalue().splitlines()) == 50 - stats.dropped
+
+
+def test_cli_watch(monkeypatch, capsys) -> None:
+    monkeypatch.setenv("VSENSOR_FAKE", "1")
+    assert main(["watch", "--count", "3", "--rate", "0", "--format", "csv", "mode"]) == 0
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[0] == "ts,seq,MODE"
+    assert len(captured.out.splitlines()) == 4
+    assert "3 samples" in captured.err
+    assert main(["watch", "--count", "1", "no_such_register"]) == 2
@@ -1,13 +1,58 @@
-"""VSensor communication library."""
+"""VSensor communication library.
 
-from importlib import metadata as _metadata
+The public names are imported on first access, so ``import vsensor`` stays
+cheap for short-lived processes (cron collectors, CLI health checks);
+pymodbus is only loaded when a serial transport is opened.
+"""
 
-try:
-    __version__ = _metadata.version("vsensor")
-except _metadata.PackageNotFoundError:  # pragma: no cover - package not installed
-    __version__ = "0.0.0"
+from __future__ import annotations
 
-from .client import VSensorClient
-from .config import Config
-from .models import Telemetry, Mode
-__all__ = ["VSensorClient", "Config", "Telemetry", "Mode", "__version__"]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .async_client import AsyncVSensorClient
+    from .client import VSensorClient
+    from .config import Config
+    from .models import Mode, Telemetry
+
+_LAZY = {
+    "AsyncVSensorClient": ".async_client",
+    "VSensorClient": ".client",
+    "Config": ".config",
+    "Telemetry": ".models",
+    "Mode": ".models",
+}
+
+__all__ = [
+    "AsyncVSensorClient",
+    "VSensorClient",
+    "Config",
+    "Telemetry",
+    "Mode",
+    "__version__",
+]
+
+
+def _version() -> str:
+    from importlib import metadata
+
+    try:
+        return metadata.version("vsensor")
+    except metadata.PackageNotFoundError:  # pragma: no cover - package not installed
+        return "0.0.0"
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        value: Any = _version()
+    elif name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -4,18 +4,24 @@ from __future__ import annotations
 
 import argparse
 import logging
+import sys
+import time
 from typing import List
 
 from .client import VSensorClient
 from .config import Config
 from .errors import VSensorError
+from .gateway import Gateway
 from .models import Mode
+from .transport import create_transport
+from .scan import BAUDRATES, PARITIES, PROBE_MARGIN, candidate_settings, scan
+from .watch import DEFAULT_CHANNELS, FORMATS, watch
 
 
 def main(argv: List[str] | None = None) -> int:
     """Run the vsensor command line interface."""
     logging.basicConfig(level=logging.INFO)
-    env_cfg = Config.from_env()
+    env_cfg = Config.from_env(profile=False)
 
     parser = argparse.ArgumentParser(description="Interact with a VSensor device")
     parser.add_argument(
@@ -26,8 +32,7 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument(
         "--baud",
         type=int,
-        default=env_cfg.baudrate,
-        help="baud rate [env VSENSOR_BAUD]",
+        help=f"baud rate [env VSENSOR_BAUD or device profile, {env_cfg.baudrate}]",
     )
     parser.add_argument(
         "--slave",
@@ -39,8 +44,8 @@ def main(argv: List[str] | None = None) -> int:
         "--float-format",
         type=int,
         choices=range(4),
-        default=env_cfg.float_format,
-        help="float register format 0-3 [env VSENSOR_FLOAT_FORMAT]",
+        help="float register format 0-3 "
+        f"[env VSENSOR_FLOAT_FORMAT or device profile, {env_cfg.float_format}]",
     )
 
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -56,17 +61,71 @@ def main(argv: List[str] | None = None) -> int:
     setp.add_argument("what", choices=["mode", "setpoint"], help="value to set")
     setp.add_argument("value", help="value")
 
+    gw = sub.add_parser("gateway", help="serve the serial line to Modbus TCP clients")
+    gw.add_argument("--bind", default="127.0.0.1", help="listen address")
+    gw.add_argument("--listen-port", type=int, default=5020, help="Modbus TCP port")
+    gw.add_argument("--ttl", type=float, default=0.25, help="read cache TTL in seconds")
+
+    wt = sub.add_parser("watch", help="stream values over one open connection")
+    wt.add_argument(
+        "channels",
+        nargs="*",
+        default=list(DEFAULT_CHANNELS),
+        help="register names (default: telemetry and HEARTBEAT)",
+    )
+    wt.add_argument(
+        "--rate", type=float, default=1.0, help="samples per second, 0 = as fast as possible"
+    )
+    wt.add_argument("--format", choices=FORMATS, default="ndjson", help="output format")
+    wt.add_argument("--count", type=int, help="stop after this many polls")
+    wt.add_argument("--duration", type=float, help="stop after this many seconds")
+    wt.add_argument(
+        "--buffer", type=int, default=1000, help="lines buffered before samples are dropped"
+    )
+    wt.add_argument("--flush-every", type=int, default=1, help="flush stdout every N lines")
+
+    sc = sub.add_parser("scan", help="find devices and serial settings")
+    sc.add_argument(
+        "--ports", nargs="+", help="serial ports to scan in parallel (default: --port)"
+    )
+    sc.add_argument("--bauds", nargs="+", type=int, default=list(BAUDRATES), help="baud rates")
+    sc.add_argument("--parities", nargs="+", default=list(PARITIES), help="parities N/E/O")
+    sc.add_argument("--stopbits", nargs="+", type=int, default=[1], help="stop bits")
+    sc.add_argument("--ids", default="1-247", help="slave IDs, e.g. 1-247 or 1,2,10-20")
+    sc.add_argument(
+        "--margin",
+        type=float,
+        default=PROBE_MARGIN,
+        help="probe timeout on top of the wire time in seconds",
+    )
+    sc.add_argument(
+        "--all", action="store_true", help="try every setting, not only up to the first hit"
+    )
+    sc.add_argument(
+        "--no-save", action="store_true", help="do not store the devices found as profiles"
+    )
+
     args = parser.parse_args(argv)
 
-    cfg = Config.from_env()
+    cfg = env_cfg
     cfg.port = args.port
-    cfg.baudrate = args.baud
     cfg.slave_id = args.slave
-    cfg.float_format = args.float_format
+    explicit = {"baudrate": args.baud, "float_format": args.float_format}
+    for name, value in explicit.items():
+        if value is not None:
+            setattr(cfg, name, value)
+    cfg.apply_profile(keep=[name for name, value in explicit.items() if value is not None])
+
+    if args.cmd == "gateway":
+        return _gateway(cfg, args)
+    if args.cmd == "scan":
+        return _scan(cfg, args)
 
     client = VSensorClient(cfg)
     try:
         client.connect()
+        if args.cmd == "watch":
+            return _watch(client, args)
         if args.cmd == "read":
             if args.what == "pressure":
                 print(client.read_pressure())
@@ -91,5 +150,78 @@ def main(argv: List[str] | None = None) -> int:
     return 0
 
 
+def _watch(client: VSensorClient, args: argparse.Namespace) -> int:
+    try:
+        stats = watch(
+            client,
+            args.channels,
+            sys.stdout,
+            rate=args.rate,
+            fmt=args.format,
+            count=args.count,
+            duration=args.duration,
+            buffer=args.buffer,
+            flush_every=args.flush_every,
+        )
+    except KeyError as exc:
+        logging.error("unknown register %s", exc)
+        return 2
+    print(stats.summary(), file=sys.stderr)
+    return 0 if stats.samples or not stats.error_count else 1
+
+
+def _parse_ids(text: str) -> List[int]:
+    ids: List[int] = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        ids.extend(range(int(first), int(last or first) + 1))
+    return ids
+
+
+def _scan(cfg: Config, args: argparse.Namespace) -> int:
+    started = time.monotonic()
+    devices = scan(
+        args.ports or [cfg.port],
+        candidate_settings(args.bauds, [p.upper() for p in args.parities], args.stopbits),
+        _parse_ids(args.ids),
+        margin=args.margin,
+        stop_on_first=not args.all,
+        base=cfg,
+    )
+    for device in devices:
+        ff = "?" if device.float_format is None else device.float_format
+        print(f"{device.port}  {device.settings}  slave {device.slave_id}  float_format {ff}")
+        print(f"  {device.env()}")
+    logging.info("%d device(s) in %.1f s", len(devices), time.monotonic() - started)
+    store = None if args.no_save else cfg.profiles()
+    if store is not None and devices:
+        try:
+            for device in devices:
+                store.put(device.profile(cfg))
+        except OSError as exc:
+            logging.warning("profiles not saved: %s", exc)
+        else:
+            logging.info("profiles saved to %s", store.path)
+    return 0 if devices else 1
+
+
+def _gateway(cfg: Config, args: argparse.Namespace) -> int:
+    try:
+        gateway = Gateway(create_transport(cfg), ttl=args.ttl, default_unit=cfg.slave_id)
+    except VSensorError as exc:
+        logging.error("%s", exc)
+        return 1
+    gateway.serve(args.bind, args.listen_port)
+    try:
+        while True:
+            time.sleep(60.0)
+            logging.info("%s", gateway.stats)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gateway.close()
+    return 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
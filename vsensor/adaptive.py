@@ -0,0 +1,256 @@
+"""Adaptive poll rates driven by signal dynamics and HEARTBEAT.
+
+:class:`AdaptiveRate` picks the poll interval of one device from its recent
+samples: fast moving pressure or output shortens it, flat values stretch it.
+A HEARTBEAT that stops counting marks the device as stalled; stalled devices
+are only probed with a one-register HEARTBEAT read until it moves again.
+:class:`AdaptiveScheduler` polls the devices of an
+:class:`~vsensor.bus.RS485Bus` that way and shares a poll budget among them
+by priority.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Mapping, Optional
+
+from .errors import VSensorError
+from .models import Snapshot
+from .subscription import channel_value
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .bus import RS485Bus
+    from .client import VSensorClient
+
+logger = logging.getLogger(__name__)
+
+# Change per channel that one poll interval should resolve.
+DEFAULT_STEPS: Mapping[str, float] = {"pressure_pa": 1.0, "output_percent": 0.5}
+
+
+class AdaptiveRate:
+    """Poll interval of one device, adapted after every sample.
+
+    The interval aims at each channel in ``steps`` moving by about its step
+    between two samples.  Faster changes shorten it at once (down to
+    ``min_interval``); when values are flat it grows by ``backoff`` per
+    sample up to ``max_interval``.  A HEARTBEAT unchanged for ``stall_after``
+    seconds sets :attr:`stalled`.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 0.1,
+        max_interval: float = 5.0,
+        steps: Optional[Mapping[str, float]] = None,
+        backoff: float = 1.5,
+        stall_after: float = 3.0,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("need 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.steps = dict(DEFAULT_STEPS if steps is None else steps)
+        self.backoff = backoff
+        self.stall_after = stall_after
+        self.interval = min_interval
+        self.stalled = False
+        self._last: Optional[Snapshot] = None
+        self._heartbeat: Optional[int] = None
+        self._heartbeat_at = 0.0
+
+    def update(self, snap: Snapshot) -> float:
+        """Take a new sample and return the interval until the next one."""
+        self.observe_heartbeat(snap.heartbeat, snap.timestamp)
+        last, self._last = self._last, snap
+        if last is None or self.stalled:
+            return self.interval
+        dt = snap.timestamp - last.timestamp
+        if dt <= 0:
+            return self.interval
+        target = self.interval * self.backoff
+        for channel, step in self.steps.items():
+            rate = abs(channel_value(snap, channel) - channel_value(last, channel)) / dt
+            if rate > 0:
+                target = min(target, step / rate)
+        self.interval = min(max(target, self.min_interval), self.max_interval)
+        return self.interval
+
+    def observe_heartbeat(self, value: int, timestamp: float) -> bool:
+        """Record a HEARTBEAT reading; return whether the device is stalled."""
+        if value != self._heartbeat:
+            if self.stalled:
+                logger.info("heartbeat moving again")
+            self._heartbeat = value
+            self._heartbeat_at = timestamp
+            self.stalled = False
+        elif not self.stalled and timestamp - self._heartbeat_at >= self.stall_after:
+            stuck = timestamp - self._heartbeat_at
+            logger.warning("heartbeat stuck at %s for %.1f s", value, stuck)
+            self.stalled = True
+            self.interval = self.max_interval
+        return self.stalled
+
+
+def probe_heartbeat(client: "VSensorClient", rate: AdaptiveRate) -> bool:
+    """Read only HEARTBEAT of a stalled device; return whether it is still stalled."""
+    heartbeat = int(client.read("HEARTBEAT")["HEARTBEAT"])
+    return rate.observe_heartbeat(heartbeat, time.time())
+
+
+@dataclass
+class _Device:
+    rate: AdaptiveRate
+    priority: int
+    due: float = 0.0
+    seq: int = 0
+
+
+Listener = Callable[[int, Snapshot], None]
+
+
+class AdaptiveScheduler:
+    """Poll the devices of ``bus`` at adaptive rates within a shared budget.
+
+    ``budget`` caps the polls per second of all devices together (``None``
+    for no cap).  When the devices want more, every device keeps at least one
+    poll per ``max_interval`` and the rest is handed out by descending
+    ``priority``.  Devices that fail are retried after ``max_interval``.
+    """
+
+    def __init__(
+        self,
+        bus: "RS485Bus",
+        budget: Optional[float] = None,
+        *,
+        min_interval: float = 0.1,
+        max_interval: float = 5.0,
+        steps: Optional[Mapping[str, float]] = None,
+        stall_after: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.bus = bus
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.steps = steps
+        self.stall_after = stall_after
+        self._clock = clock
+        self._devices: Dict[int, _Device] = {}
+        self._listeners: list[Listener] = []
+        self._latest: Dict[int, Snapshot] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, slave_id: int, priority: int = 0) -> AdaptiveRate:
+        """Schedule ``slave_id`` (added to the bus if needed) and return its rate."""
+        if slave_id not in self.bus.slave_ids:
+            self.bus.add(slave_id)
+        rate = AdaptiveRate(
+            self.min_interval, self.max_interval, self.steps, stall_after=self.stall_after
+        )
+        self._devices[slave_id] = _Device(rate, priority, self._clock())
+        return rate
+
+    def set_priority(self, slave_id: int, priority: int) -> None:
+        self._devices[slave_id].priority = priority
+
+    def rate(self, slave_id: int) -> AdaptiveRate:
+        return self._devices[slave_id].rate
+
+    def latest(self, slave_id: int) -> Optional[Snapshot]:
+        """Return the last snapshot of ``slave_id`` without touching the bus."""
+        return self._latest.get(slave_id)
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call ``listener(slave_id, snapshot)`` with every new snapshot."""
+        self._listeners.append(listener)
+
+    def intervals(self) -> Dict[int, float]:
+        """Return the poll interval of every device after applying the budget."""
+        wanted = {sid: dev.rate.interval for sid, dev in self._devices.items()}
+        demand = sum(1.0 / i for i in wanted.values())
+        if self.budget is None or demand <= self.budget or not wanted:
+            return wanted
+        floor = min(1.0 / self.max_interval, self.budget / len(wanted))
+        spare = self.budget - floor * len(wanted)
+        out: Dict[int, float] = {}
+        order = sorted(wanted, key=lambda sid: (-self._devices[sid].priority, sid))
+        for sid in order:
+            extra = min(max(1.0 / wanted[sid] - floor, 0.0), spare)
+            spare -= extra
+            out[sid] = 1.0 / (floor + extra)
+        return out
+
+    def poll_due(self) -> Dict[int, Snapshot]:
+        """Poll every device whose time has come, highest priority first."""
+        now = self._clock()
+        due = [sid for sid, dev in self._devices.items() if dev.due <= now]
+        due.sort(key=lambda sid: (-self._devices[sid].priority, self._devices[sid].due))
+        results: Dict[int, Snapshot] = {}
+        for sid in due:
+            snap = self._poll(sid)
+            if snap is not None:
+                results[sid] = snap
+        intervals = self.intervals()
+        for sid in due:
+            dev = self._devices[sid]
+            failed = self.bus.status(sid).consecutive_failures > 0
+            dev.due = now + (self.max_interval if failed else intervals[sid])
+        return results
+
+    def _poll(self, slave_id: int) -> Optional[Snapshot]:
+        dev = self._devices[slave_id]
+        try:
+            deadline = dev.rate.interval
+            if dev.rate.stalled:
+                self.bus.poll_one(slave_id, lambda c: probe_heartbeat(c, dev.rate), deadline)
+                if dev.rate.stalled:
+                    return None
+            dev.seq += 1
+            snap: Snapshot = self.bus.poll_one(
+                slave_id, lambda c: c.read_snapshot(dev.seq), deadline
+            )
+        except (VSensorError, ValueError):
+            return None
+        dev.rate.update(snap)
+        self._latest[slave_id] = snap
+        for listener in list(self._listeners):
+            try:
+                listener(slave_id, snap)
+            except Exception:  # pragma: no cover - listener bugs must not stop polling
+                logger.exception("snapshot listener failed")
+        return snap
+
+    def next_due(self) -> Optional[float]:
+        """Return the clock time of the next due poll."""
+        return min((dev.due for dev in self._devices.values()), default=None)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll_due()
+            due = self.next_due()
+            wait = self.max_interval if due is None else due - self._clock()
+            self._stop.wait(max(0.0, wait))
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start polling on a background thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vsensor-adaptive", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the poll thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,167 @@
+"""Asyncio client for VSensor devices."""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Iterable, Optional
+
+from . import registers as REG  # register constants are 1-based
+from .batch import AsyncBatch
+from .async_transport import AsyncFakeTransport, AsyncRTUTransport, AsyncTransport
+from .client import TELEMETRY_REGISTERS, VSensorClient
+from .codec import RegisterCodec, Value
+from .config import Config
+from .errors import VSensorError
+from .models import Mode, Telemetry
+from .planner import plan_reads, plan_writes
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncVSensorClient:
+    """Asyncio variant of :class:`~vsensor.client.VSensorClient`.
+
+    All methods take an optional ``timeout`` in seconds which bounds every
+    Modbus transaction issued by the call.  Cancelling a call is safe; the
+    transport discards the abandoned transaction before the next request.
+    """
+
+    def __init__(
+        self, cfg: Optional[Config] = None, transport: Optional[AsyncTransport] = None
+    ) -> None:
+        self.cfg = cfg or Config.from_env()
+        self.transport = transport
+        self.codec = RegisterCodec(self.cfg.float_format)
+
+    async def connect(self) -> None:
+        """Initialise and open the transport lazily."""
+        if self.transport is not None:
+            return
+        if os.getenv("VSENSOR_SIM") or os.getenv("VSENSOR_FAKE"):
+            transport: AsyncTransport = AsyncFakeTransport(self.cfg)
+        else:
+            transport = AsyncRTUTransport(self.cfg)
+        await transport.connect()
+        self.transport = transport
+
+    async def __aenter__(self) -> "AsyncVSensorClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @staticmethod
+    def _r(addr_1_based: int) -> int:
+        """Convert 1-based register address to 0-based."""
+        return addr_1_based - 1
+
+    # ---- Low level ----
+    def _ensure_transport(self) -> AsyncTransport:
+        if self.transport is None:
+            raise VSensorError("not connected")
+        return self.transport
+
+    async def read_u16(self, addr_1_based: int, *, timeout: Optional[float] = None) -> int:
+        regs = await self._ensure_transport().read_holding_registers(
+            self._r(addr_1_based), 1, timeout=timeout
+        )
+        return int(regs[0])
+
+    async def write_u16(
+        self, addr_1_based: int, value: int, *, timeout: Optional[float] = None
+    ) -> None:
+        await self._ensure_transport().write_register(
+            self._r(addr_1_based), int(value), timeout=timeout
+        )
+
+    async def read_float(self, addr_1_based: int, *, timeout: Optional[float] = None) -> float:
+        regs = await self._ensure_transport().read_holding_registers(
+            self._r(addr_1_based), 2, timeout=timeout
+        )
+        if len(regs) < 2:
+            raise VSensorError("invalid float response")
+        return self.codec.unpack_float(regs)
+
+    async def write_float(
+        self, addr_1_based: int, value: float, *, timeout: Optional[float] = None
+    ) -> None:
+        await self._ensure_transport().write_registers(
+            self._r(addr_1_based), self.codec.pack_float(value), timeout=timeout
+        )
+
+    async def read_spans(
+        self, spans: Iterable[tuple[int, int]], *, timeout: Optional[float] = None
+    ) -> dict[int, list[int]]:
+        """Read ``(address, width)`` spans with as few block requests as possible."""
+        spans = list(spans)
+        transport = self._ensure_transport()
+        values: dict[int, list[int]] = {}
+        for block in plan_reads(spans, max_gap=self.cfg.max_read_gap):
+            regs = await transport.read_holding_registers(
+                self._r(block.address), block.count, timeout=timeout
+            )
+            if len(regs) < block.count:
+                raise VSensorError("short block response")
+            for address, width in spans:
+                if block.contains(address, width):
+                    values[address] = block.slice(regs, address, width)
+        return values
+
+    # ---- Register table ----
+    async def read(self, *names: str, timeout: Optional[float] = None) -> dict[str, Value]:
+        """Read registers by name, see :meth:`VSensorClient.read`."""
+        regs = [REG.lookup(name) for name in names]
+        raw = await self.read_spans(((r.address, r.width) for r in regs), timeout=timeout)
+        return {r.name: self.codec.decode(r, raw[r.address]) for r in regs}
+
+    async def write(self, *, timeout: Optional[float] = None, **values: Value) -> None:
+        """Write registers by name, see :meth:`VSensorClient.write`."""
+        regs = [(REG.lookup(name), value) for name, value in values.items()]
+        for reg, _ in regs:
+            if not reg.writable:
+                raise VSensorError(f"register {reg.name} is read-only")
+        transport = self._ensure_transport()
+        encoded = [(reg.address, self.codec.encode(reg, value)) for reg, value in regs]
+        for block in plan_writes(encoded):
+            if block.count == 1:
+                await transport.write_register(
+                    self._r(block.address), block.values[0], timeout=timeout
+                )
+            else:
+                await transport.write_registers(
+                    self._r(block.address), list(block.values), timeout=timeout
+                )
+
+    def batch(self, *, timeout: Optional[float] = None) -> AsyncBatch:
+        """Collect reads and writes and run them merged, see :class:`AsyncBatch`."""
+        return AsyncBatch(self, timeout=timeout)
+
+    # ---- High level ----
+    async def read_pressure(self, *, timeout: Optional[float] = None) -> float:
+        return await self.read_float(REG.PRESSURE_PA, timeout=timeout)
+
+    async def read_output(self, *, timeout: Optional[float] = None) -> float:
+        return await self.read_float(REG.OUTPUT_PERCENT, timeout=timeout)
+
+    async def read_auto_setpoint(self, *, timeout: Optional[float] = None) -> float:
+        return await self.read_float(REG.AUTO_SETPOINT, timeout=timeout)
+
+    async def set_auto_setpoint(self, value: float, *, timeout: Optional[float] = None) -> None:
+        await self.write_float(REG.AUTO_SETPOINT, value, timeout=timeout)
+
+    async def read_mode(self, *, timeout: Optional[float] = None) -> Mode:
+        return Mode(await self.read_u16(REG.MODE, timeout=timeout))
+
+    async def set_mode(self, value: Mode, *, timeout: Optional[float] = None) -> None:
+        await self.write_u16(REG.MODE, int(value), timeout=timeout)
+
+    async def read_telemetry(self, *, timeout: Optional[float] = None) -> Telemetry:
+        values = await self.read(*TELEMETRY_REGISTERS, timeout=timeout)
+        return VSensorClient.decode_telemetry(values)
+
+    async def close(self) -> None:
+        """Close the underlying transport."""
+        if self.transport is not None:
+            await self.transport.close()
@@ -0,0 +1,207 @@
+"""Asyncio transport implementations for Modbus communication."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Iterable, List, Optional
+
+from . import metrics as _metrics
+from .compat import client_kwargs, pymodbus, rtu_framer, unit_kwarg
+from .config import Config
+from .errors import ModbusExceptionError, TimeoutError, TransportError
+from .transport import FakeTransport, _outcome
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTransport:
+    """Abstract base class for asyncio transport implementations.
+
+    Every operation accepts an optional ``timeout`` in seconds that bounds the
+    transaction including waiting for the bus and retries.
+    """
+
+    async def connect(self) -> None:
+        """Open transport resources."""
+
+    async def read_holding_registers(
+        self, address: int, count: int, *, timeout: Optional[float] = None
+    ) -> List[int]:
+        raise NotImplementedError
+
+    async def write_register(
+        self, address: int, value: int, *, timeout: Optional[float] = None
+    ) -> None:
+        raise NotImplementedError
+
+    async def write_registers(
+        self, address: int, values: Iterable[int], *, timeout: Optional[float] = None
+    ) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:  # pragma: no cover - default
+        """Close transport resources."""
+
+
+class AsyncRTUTransport(AsyncTransport):
+    """Serial RTU transport based on the pymodbus asyncio client."""
+
+    def __init__(self, cfg: Config) -> None:
+        client_cls = pymodbus("AsyncModbusSerialClient")
+        self._client = client_cls(
+            **client_kwargs(
+                client_cls,
+                port=cfg.port,
+                baudrate=cfg.baudrate,
+                parity=cfg.parity,
+                stopbits=cfg.stopbits,
+                bytesize=cfg.bytesize,
+                timeout=cfg.timeout,
+                retries=0,
+                framer=rtu_framer(),
+            )
+        )
+        self._unit = unit_kwarg(self._client)
+        self._port = cfg.port
+        self._slave_id = cfg.slave_id
+        self._timeout = cfg.timeout
+        self._lock = asyncio.Lock()
+        self._policy = cfg.retry_policy()
+        # Set when a transaction was abandoned; its late reply must not be
+        # mistaken for the answer to the next request.
+        self._stale = False
+
+    async def connect(self) -> None:
+        if not await self._client.connect():
+            raise TransportError(f"Serial connection failed on {self._port}")
+
+    async def _reset(self) -> None:
+        self._client.close()
+        self._stale = False
+        await self.connect()
+
+    async def _attempt(self, func: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
+        async with self._lock:
+            if self._stale or not self._client.connected:
+                await self._reset()
+            try:
+                self._stale = True
+                result = await asyncio.wait_for(
+                    func(**kwargs, **{self._unit: self._slave_id}), self._timeout
+                )
+                self._stale = False
+            except (asyncio.TimeoutError, pymodbus("ModbusIOException")) as exc:
+                raise TimeoutError("modbus timeout") from exc
+            except pymodbus("ModbusException") as exc:
+                self._stale = False
+                raise TransportError(str(exc)) from exc
+        if result is None:
+            raise TimeoutError("modbus timeout")
+        if result.isError():
+            raise ModbusExceptionError(str(result), getattr(result, "exception_code", None))
+        return result
+
+    async def _locked_call(
+        self, func: Callable[..., Any], fc: int, timeout: Optional[float], **kwargs: Any
+    ) -> Any:
+        attempts = 0
+
+        async def attempt() -> Any:
+            nonlocal attempts
+            attempts += 1
+            return await self._attempt(func, kwargs)
+
+        metrics = _metrics.active()
+        started = time.perf_counter() if metrics.enabled else 0.0
+        outcome = _metrics.OK
+        try:
+            return await asyncio.wait_for(self._policy.run_async(attempt), timeout)
+        except asyncio.TimeoutError as exc:
+            outcome = _metrics.TIMEOUT
+            raise TimeoutError("modbus timeout") from exc
+        except Exception as exc:
+            outcome = _outcome(exc)
+            raise
+        finally:
+            if metrics.enabled:
+                count = kwargs.get("count") or len(kwargs.get("values") or ()) or 1
+                metrics.record_transaction(
+                    fc,
+                    self._slave_id,
+                    kwargs["address"] + 1,
+                    count,
+                    time.perf_counter() - started,
+                    attempts,
+                    outcome,
+                )
+
+    async def read_holding_registers(
+        self, address: int, count: int, *, timeout: Optional[float] = None
+    ) -> List[int]:
+        rr = await self._locked_call(
+            self._client.read_holding_registers, 3, timeout, address=address, count=count
+        )
+        return list(rr.registers)
+
+    async def write_register(
+        self, address: int, value: int, *, timeout: Optional[float] = None
+    ) -> None:
+        await self._locked_call(
+            self._client.write_register, 6, timeout, address=address, value=value
+        )
+
+    async def write_registers(
+        self, address: int, values: Iterable[int], *, timeout: Optional[float] = None
+    ) -> None:
+        await self._locked_call(
+            self._client.write_registers, 16, timeout, address=address, values=list(values)
+        )
+
+    async def close(self) -> None:
+        async with self._lock:
+            self._client.close()
+
+
+class AsyncFakeTransport(AsyncTransport):
+    """Asyncio counterpart of :class:`~vsensor.transport.FakeTransport`.
+
+    ``delay`` simulates the bus round trip of every request.
+    """
+
+    def __init__(self, cfg: Config | None = None, delay: float = 0.0) -> None:
+        self._sync = FakeTransport(cfg)
+        self._delay = delay
+        self._lock = asyncio.Lock()
+
+    async def _roundtrip(self, timeout: Optional[float]) -> None:
+        async def wait() -> None:
+            async with self._lock:
+                await asyncio.sleep(self._delay)
+
+        try:
+            await asyncio.wait_for(wait(), timeout)
+        except asyncio.TimeoutError as exc:
+            raise TimeoutError("modbus timeout") from exc
+
+    async def read_holding_registers(
+        self, address: int, count: int, *, timeout: Optional[float] = None
+    ) -> List[int]:
+        await self._roundtrip(timeout)
+        return self._sync.read_holding_registers(address, count)
+
+    async def write_register(
+        self, address: int, value: int, *, timeout: Optional[float] = None
+    ) -> None:
+        await self._roundtrip(timeout)
+        self._sync.write_register(address, value)
+
+    async def write_registers(
+        self, address: int, values: Iterable[int], *, timeout: Optional[float] = None
+    ) -> None:
+        await self._roundtrip(timeout)
+        self._sync.write_registers(address, values)
+
+    async def close(self) -> None:  # pragma: no cover - nothing to do
+        pass
@@ -0,0 +1,101 @@
+"""Batched register access merging adjacent requests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from . import registers as REG
+from .codec import Value
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .async_client import AsyncVSensorClient
+    from .client import VSensorClient
+
+
+class _Queue:
+    """Requests collected by a batch."""
+
+    def __init__(self) -> None:
+        self._writes: Dict[str, Value] = {}
+        self._reads: List[str] = []
+        self.results: Dict[str, Value] = {}
+        self.done = False
+
+    def write(self, **values: Value) -> "_Queue":
+        """Queue writes by register name; later values for a name win."""
+        for name, value in values.items():
+            self._writes[REG.lookup(name).name] = value
+        return self
+
+    def read(self, *names: str) -> "_Queue":
+        """Queue reads by register name."""
+        for name in names:
+            reg = REG.lookup(name)
+            if reg.name not in self._reads:
+                self._reads.append(reg.name)
+        return self
+
+    def _start(self) -> None:
+        if self.done:
+            raise RuntimeError("batch already executed")
+        self.done = True
+
+
+class Batch(_Queue):
+    """Collect reads and writes and execute them together.
+
+    Use it through :meth:`VSensorClient.batch`::
+
+        with client.batch() as b:
+            b.write(AUTO_SETPOINT=250.0, LOW_ALARM=10.0, HIGH_ALARM=400.0)
+            b.read("PRESSURE_PA", "MODE")
+        b.results  # {"PRESSURE_PA": ..., "MODE": ...}
+
+    On exit all writes are sent first, sorted by address with adjacent
+    registers merged into one FC16 request, then the reads are fetched with
+    as few block reads as possible.  Nothing is sent if the block raises.
+    """
+
+    def __init__(self, client: "VSensorClient") -> None:
+        super().__init__()
+        self.client = client
+
+    def execute(self) -> Dict[str, Value]:
+        """Send the queued requests and return the decoded read results."""
+        self._start()
+        if self._writes:
+            self.client.write(**self._writes)
+        if self._reads:
+            self.results = self.client.read(*self._reads)
+        return self.results
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *exc: Any) -> None:
+        if exc_type is None:
+            self.execute()
+
+
+class AsyncBatch(_Queue):
+    """Asyncio variant of :class:`Batch`, used with ``async with``."""
+
+    def __init__(self, client: "AsyncVSensorClient", timeout: Optional[float] = None) -> None:
+        super().__init__()
+        self.client = client
+        self.timeout = timeout
+
+    async def execute(self) -> Dict[str, Value]:
+        self._start()
+        if self._writes:
+            await self.client.write(timeout=self.timeout, **self._writes)
+        if self._reads:
+            self.results = await self.client.read(*self._reads, timeout=self.timeout)
+        return self.results
+
+    async def __aenter__(self) -> "AsyncBatch":
+        return self
+
+    async def __aexit__(self, exc_type: Optional[type], *exc: Any) -> None:
+        if exc_type is None:
+            await self.execute()
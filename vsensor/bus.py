@@ -0,0 +1,290 @@
+"""Poll many VSensor slaves over one shared RS-485 line."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .client import VSensorClient
+from .config import Config
+from .errors import VSensorError
+from .registry import acquire
+from .scheduler import Priority, priority
+from .transport import FakeTransport, Transport
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeviceStatus:
+    """Poll bookkeeping for a single slave on the bus."""
+
+    slave_id: int
+    polls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    transactions: int = 0
+    registers: int = 0
+    skip_cycles: int = 0
+    last_error: str = ""
+    last_ok: Optional[float] = None
+
+    @property
+    def online(self) -> bool:
+        return self.consecutive_failures == 0
+
+
+@dataclass(frozen=True)
+class BusStats:
+    """Aggregated throughput figures of a bus."""
+
+    cycles: int
+    busy_time: float
+    transactions: int
+    registers: int
+
+    @property
+    def transactions_per_second(self) -> float:
+        return self.transactions / self.busy_time if self.busy_time else 0.0
+
+    @property
+    def registers_per_second(self) -> float:
+        """Devices × registers read per second of polling."""
+        return self.registers / self.busy_time if self.busy_time else 0.0
+
+
+class _DeviceTransport(Transport):
+    """Transport view that records traffic in a :class:`DeviceStatus`."""
+
+    def __init__(self, inner: Transport, status: DeviceStatus) -> None:
+        self._inner = inner
+        self._status = status
+
+    def read_holding_registers(self, address: int, count: int) -> List[int]:
+        regs = self._inner.read_holding_registers(address, count)
+        self._status.transactions += 1
+        self._status.registers += count
+        return regs
+
+    def write_register(self, address: int, value: int) -> None:
+        self._inner.write_register(address, value)
+        self._status.transactions += 1
+        self._status.registers += 1
+
+    def write_registers(self, address: int, values: Iterable[int]) -> None:
+        values = list(values)
+        self._inner.write_registers(address, values)
+        self._status.transactions += 1
+        self._status.registers += len(values)
+
+    def read_write_registers(
+        self, read_address: int, read_count: int, write_address: int, values: Iterable[int]
+    ) -> List[int]:
+        values = list(values)
+        regs = self._inner.read_write_registers(read_address, read_count, write_address, values)
+        self._status.transactions += 1
+        self._status.registers += read_count + len(values)
+        return regs
+
+    def close(self) -> None:
+        """The bus owns the port; device views never close it."""
+
+
+class RS485Bus:
+    """Own one serial port and poll several slave IDs round-robin.
+
+    ``device_timeout`` and ``device_retries`` apply to every request made
+    through the per-slave clients, so an absent device costs a single short
+    timeout per cycle.  Devices that keep failing are skipped for an
+    exponentially growing number of cycles (up to ``max_backoff``) before
+    they are probed again.
+    """
+
+    def __init__(
+        self,
+        cfg: Optional[Config] = None,
+        transport: Optional[Transport] = None,
+        *,
+        device_timeout: Optional[float] = None,
+        device_retries: int = 1,
+        max_backoff: int = 32,
+    ) -> None:
+        self.cfg = cfg or Config.from_env()
+        self.transport = transport
+        self.device_timeout = device_timeout
+        self.device_retries = device_retries
+        self.max_backoff = max_backoff
+        self._clients: Dict[int, VSensorClient] = {}
+        self._status: Dict[int, DeviceStatus] = {}
+        self._cycles = 0
+        self._busy_time = 0.0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def connect(self) -> None:
+        """Open the serial port once for all slaves."""
+        if self.transport is not None:
+            return
+        if os.getenv("VSENSOR_SIM") or os.getenv("VSENSOR_FAKE"):
+            self.transport = FakeTransport(self.cfg)
+        else:
+            self.transport = acquire(self.cfg)
+
+    def add(
+        self,
+        slave_id: int,
+        *,
+        float_format: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> VSensorClient:
+        """Register ``slave_id`` on the bus and return its client view."""
+        if self.transport is None:
+            raise VSensorError("not connected")
+        with self._lock:
+            if slave_id in self._clients:
+                return self._clients[slave_id]
+            status = DeviceStatus(slave_id)
+            view = self.transport.for_slave(
+                slave_id,
+                timeout=timeout if timeout is not None else self.device_timeout,
+                retries=self.device_retries,
+            )
+            cfg = replace(
+                self.cfg,
+                slave_id=slave_id,
+                float_format=self.cfg.float_format if float_format is None else float_format,
+            )
+            client = VSensorClient(cfg, transport=_DeviceTransport(view, status))
+            self._clients[slave_id] = client
+            self._status[slave_id] = status
+            return client
+
+    def client(self, slave_id: int) -> VSensorClient:
+        """Return the client view of an added slave."""
+        return self._clients[slave_id]
+
+    @property
+    def slave_ids(self) -> List[int]:
+        return list(self._clients)
+
+    def status(self, slave_id: int) -> DeviceStatus:
+        return self._status[slave_id]
+
+    def poll_cycle(
+        self,
+        func: Optional[Callable[[VSensorClient], Any]] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict[int, Any]:
+        """Run ``func`` (default: ``read_telemetry``) once for every due slave.
+
+        Returns the results of the slaves that answered.  Failures are
+        recorded in :meth:`status` and never abort the cycle.  On transports
+        that pipeline requests (``pipeline_depth > 1``, e.g. Modbus TCP) the
+        slaves are polled concurrently.  Polls run as background requests;
+        those still queued ``deadline`` seconds after the cycle started are
+        dropped.
+        """
+        func = func or (lambda c: c.read_telemetry())
+        results: Dict[int, Any] = {}
+        start = time.monotonic()
+        if deadline is not None:
+            deadline = start + deadline
+        due: List[int] = []
+        for slave_id in list(self._clients):
+            status = self._status[slave_id]
+            if status.skip_cycles > 0:
+                status.skip_cycles -= 1
+            else:
+                due.append(slave_id)
+        depth = self.transport.pipeline_depth if self.transport is not None else 1
+        if depth > 1 and len(due) > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(depth, thread_name_prefix="vsensor-bus")
+            list(
+                self._executor.map(lambda s: self._poll_one(s, func, results, deadline), due)
+            )
+        else:
+            for slave_id in due:
+                self._poll_one(slave_id, func, results, deadline)
+        self._cycles += 1
+        self._busy_time += time.monotonic() - start
+        return results
+
+    def _poll_one(
+        self,
+        slave_id: int,
+        func: Callable[[VSensorClient], Any],
+        results: Dict[int, Any],
+        deadline: Optional[float],
+    ) -> None:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        try:
+            results[slave_id] = self.poll_one(slave_id, func, remaining)
+        except VSensorError:
+            pass
+
+    def poll_one(
+        self,
+        slave_id: int,
+        func: Optional[Callable[[VSensorClient], Any]] = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """Run ``func`` for one slave now and record the outcome in :meth:`status`.
+
+        The poll runs as a background request with an optional ``deadline``
+        in seconds, see :func:`vsensor.scheduler.priority`.  Errors are
+        recorded and re-raised.
+        """
+        func = func or (lambda c: c.read_telemetry())
+        status = self._status[slave_id]
+        status.polls += 1
+        try:
+            with priority(Priority.BACKGROUND, deadline):
+                result = func(self._clients[slave_id])
+        except VSensorError as exc:
+            status.failures += 1
+            status.consecutive_failures += 1
+            status.last_error = str(exc)
+            status.skip_cycles = min(2 ** (status.consecutive_failures - 1) - 1, self.max_backoff)
+            logger.debug("slave %s failed (%s): %s", slave_id, status.consecutive_failures, exc)
+            raise
+        status.consecutive_failures = 0
+        status.last_error = ""
+        status.last_ok = time.time()
+        return result
+
+    def poll_forever(
+        self,
+        on_results: Callable[[Dict[int, Any]], None],
+        interval: float = 1.0,
+        func: Optional[Callable[[VSensorClient], Any]] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """Poll the bus every ``interval`` seconds until ``stop`` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            on_results(self.poll_cycle(func, deadline=interval))
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def stats(self) -> BusStats:
+        """Return throughput figures accumulated since the bus was created."""
+        return BusStats(
+            cycles=self._cycles,
+            busy_time=self._busy_time,
+            transactions=sum(s.transactions for s in self._status.values()),
+            registers=sum(s.registers for s in self._status.values()),
+        )
+
+    def close(self) -> None:
+        """Close the shared serial port."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.transport is not None:
+            self.transport.close()
@@ -0,0 +1,109 @@
+"""Read-through cache for register values with per-register TTLs."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from . import registers as REG
+from .registers import Volatility
+
+# Seconds a value stays valid per volatility class.  Live process values are
+# not cached by default.
+DEFAULT_TTLS: Dict[Volatility, float] = {
+    Volatility.LIVE: 0.0,
+    Volatility.CONFIG: 10.0,
+    Volatility.STATIC: float("inf"),
+}
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Hit/miss counters of a :class:`RegisterCache`."""
+
+    hits: int
+    misses: int
+    entries: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class RegisterCache:
+    """Cache raw register words keyed by their 1-based start address.
+
+    The TTL of an address is taken from ``ttl_overrides`` (by register name)
+    or from ``ttls`` for the volatility class of the register.  Addresses
+    missing from :data:`vsensor.registers.REGISTERS` are never cached.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[Volatility, float]] = None,
+        ttl_overrides: Optional[Mapping[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        merged = {**DEFAULT_TTLS, **(ttls or {})}
+        overrides = {name.upper(): ttl for name, ttl in (ttl_overrides or {}).items()}
+        self._ttls: Dict[int, float] = {
+            r.address: overrides.get(r.name, merged[r.volatility]) for r in REG.REGISTERS
+        }
+        self._clock = clock
+        self._entries: Dict[int, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def ttl(self, address: int) -> float:
+        """Return the TTL in seconds for the register at ``address``."""
+        return self._ttls.get(address, 0.0)
+
+    def cacheable(self, address: int) -> bool:
+        return self.ttl(address) > 0
+
+    def get(self, address: int, width: int) -> Optional[List[int]]:
+        """Return cached words or ``None`` if absent, expired or not cacheable."""
+        if not self.cacheable(address):
+            return None
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is not None and entry[1] > self._clock() and len(entry[0]) >= width:
+                self._hits += 1
+                return list(entry[0][:width])
+            self._misses += 1
+            return None
+
+    def put(self, address: int, words: Iterable[int]) -> None:
+        """Store words read from or written to the device at ``address``."""
+        words = list(words)
+        with self._lock:
+            self._drop_overlapping(address, len(words))
+            ttl = self.ttl(address)
+            if ttl > 0:
+                self._entries[address] = (words, self._clock() + ttl)
+
+    def _drop_overlapping(self, address: int, width: int) -> None:
+        end = address + width
+        for start in [a for a, (w, _) in self._entries.items() if a < end and address < a + len(w)]:
+            del self._entries[start]
+
+    def invalidate(self, addresses: Optional[Iterable[int]] = None) -> None:
+        """Forget cached values at ``addresses`` or everything if omitted."""
+        with self._lock:
+            if addresses is None:
+                self._entries.clear()
+                return
+            for address in addresses:
+                self._drop_overlapping(address, 1)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, len(self._entries))
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = self._misses = 0
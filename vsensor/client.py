@@ -2,35 +2,122 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
-import struct
-from typing import Literal, Optional
+import time
+from dataclasses import replace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
 
+from . import metrics as _metrics
 from . import registers as REG  # register constants are 1-based
-from .config import Config
-from .errors import VSensorError
-from .models import Mode, Telemetry
-from .transport import FakeTransport, RTUTransport, Transport
+from .cache import RegisterCache
+from .codec import FLOAT_FORMATS, RegisterCodec, Value  # noqa: F401 - re-exported
+from .config import Config, DeviceProfile, ProfileStore
+from .errors import (
+    CircuitOpenError,
+    ModbusExceptionError,
+    TimeoutError,
+    TransportError,
+    VSensorError,
+    WriteVerificationError,
+)
+from .framing import ILLEGAL_FUNCTION
+from .models import Mode, Snapshot, Telemetry
+from .batch import Batch
+from .planner import ReadBlock, plan_reads, plan_writes
+from .registry import PortKey, acquire, device_key
+from .transport import FakeTransport, Transport
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .poller import Poller
+    from .subscription import Callback, Deadband, Subscription
 
 logger = logging.getLogger(__name__)
 
-FLOAT_FORMATS: dict[int, tuple[Literal["big", "little"], Literal["big", "little"]]] = {
-    0: ("big", "big"),
-    1: ("little", "big"),
-    2: ("big", "little"),
-    3: ("little", "little"),
-}
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _instrumented(op: str) -> Callable[[F], F]:
+    """Record the latency of a client operation while metrics are enabled."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(self: "VSensorClient", *args: Any, **kwargs: Any) -> Any:
+            metrics = _metrics.active()
+            if not metrics.enabled:
+                return func(self, *args, **kwargs)
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = func(self, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                metrics.record_operation(
+                    op, self.cfg.slave_id, time.perf_counter() - started, ok
+                )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+# FC23 support per device (see :func:`vsensor.registry.device_key`), learned
+# by the first verified write and shared by all clients in the process.
+_fc23_support: dict[PortKey, bool] = {}
+
+# Devices whose stored profile was checked on first contact in this process.
+_profiles_checked: set[PortKey] = set()
+
+
+# Registers decoded by :meth:`VSensorClient.decode_telemetry`.
+TELEMETRY_REGISTERS: tuple[str, ...] = (
+    "PRESSURE_PA",
+    "AUTO_SETPOINT",
+    "MODE",
+    "OUTPUT_PERCENT",
+)
 
 
 class VSensorClient:
-    """Client providing typed access to a VSensor via Modbus."""
+    """Client providing typed access to a VSensor via Modbus.
+
+    With a :class:`~vsensor.cache.RegisterCache` reads are served from the
+    cache while a register's TTL has not expired, and writes made through
+    this client update the cached value.
+
+    With ``verify_writes`` (default ``cfg.verify_writes``) every write is
+    read back and checked, atomically with FC23 where the device supports
+    it, and :class:`~vsensor.errors.WriteVerificationError` is raised if the
+    device holds a different value.
+    """
 
-    def __init__(self, cfg: Optional[Config] = None, transport: Optional[Transport] = None) -> None:
+    def __init__(
+        self,
+        cfg: Optional[Config] = None,
+        transport: Optional[Transport] = None,
+        cache: Optional[RegisterCache] = None,
+        verify_writes: Optional[bool] = None,
+    ) -> None:
         self.cfg = cfg or Config.from_env()
         self.transport = transport
-        ff = FLOAT_FORMATS.get(self.cfg.float_format, FLOAT_FORMATS[1])
-        self.byteorder, self.wordorder = ff
+        self.cache = cache
+        self.verify_writes = self.cfg.verify_writes if verify_writes is None else verify_writes
+        self._poller: Optional["Poller"] = None
+        self._profiles: Optional[ProfileStore] = None  # set for ports opened by connect()
+        self.codec = RegisterCodec(self.cfg.float_format)
+        self.byteorder, self.wordorder = self.codec.byteorder, self.codec.wordorder
 
     def connect(self) -> None:
         """Initialise the transport lazily."""
@@ -39,7 +126,72 @@ class VSensorClient:
         if os.getenv("VSENSOR_SIM") or os.getenv("VSENSOR_FAKE"):
             self.transport = FakeTransport(self.cfg)
         else:
-            self.transport = RTUTransport(self.cfg)
+            self.transport = acquire(self.cfg)
+            self._profiles = self.cfg.profiles()
+            self._check_profile()
+
+    def _check_profile(self) -> None:
+        """Check the stored profile of the device with one block read.
+
+        Runs on first contact per process.  A device that answers confirms
+        the serial settings and, through the float block, the float format;
+        a garbled answer or floats in another format drop the profile.  A
+        confirmed configuration is stored as the new profile.
+        """
+        from .scan import FLOAT_BLOCK, canonical_format, infer_float_format
+
+        store = self._profiles
+        key = device_key(self.cfg)
+        if store is None or key in _profiles_checked or self.transport is None:
+            return
+        _profiles_checked.add(key)
+        port, slave_id = self.cfg.profile_port(), self.cfg.slave_id
+        try:
+            profile = store.get(port, slave_id)
+            if profile is not None and not profile.matches(self.cfg):
+                profile = None  # configured differently on purpose: check that instead
+            if profile is not None and profile.fc23 is not None:
+                _fc23_support.setdefault(key, profile.fc23)
+            address, count = FLOAT_BLOCK
+            try:
+                words = self.transport.read_holding_registers(self._r(address), count)
+            except ModbusExceptionError:
+                words = []  # the device answered: the line settings are right
+            except (TimeoutError, CircuitOpenError) as exc:
+                _profiles_checked.discard(key)  # device may be off: check next time
+                logger.info("slave %s: profile not checked: %s", slave_id, exc)
+                return
+            except TransportError as exc:
+                if profile is not None:
+                    store.forget(port, slave_id)
+                    logger.warning("slave %s: %s; dropped stored profile", slave_id, exc)
+                return
+            fmt = infer_float_format(words) if words else None
+            if fmt is not None and fmt != canonical_format(self.cfg.float_format):
+                logger.warning(
+                    "slave %s: floats decode as format %s, not %s",
+                    slave_id,
+                    fmt,
+                    self.cfg.float_format,
+                )
+                if profile is None:
+                    return
+                store.forget(port, slave_id)
+                # The caller's Config may be shared: correct a copy.
+                self.cfg = replace(self.cfg, float_format=fmt)
+                self.codec = RegisterCodec(fmt)
+                self.byteorder, self.wordorder = self.codec.byteorder, self.codec.wordorder
+            if fmt is None:  # float format not confirmed: keep what was known
+                fmt = profile.float_format if profile is not None else None
+            else:
+                fmt = self.cfg.float_format
+            store.put(
+                DeviceProfile.from_config(
+                    self.cfg, float_format=fmt, fc23=_fc23_support.get(key), verified=time.time()
+                )
+            )
+        except OSError as exc:
+            logger.warning("profile cache %s: %s", self.cfg.profile_cache, exc)
 
     @staticmethod
     def _r(addr_1_based: int) -> int:
@@ -52,23 +204,199 @@ class VSensorClient:
             raise VSensorError("not connected")
         return self.transport
 
+    def _cached(self, addr_1_based: int, width: int) -> Optional[list[int]]:
+        return self.cache.get(addr_1_based, width) if self.cache is not None else None
+
+    def _remember(self, addr_1_based: int, words: list[int]) -> None:
+        if self.cache is not None:
+            self.cache.put(addr_1_based, words)
+
+    @_instrumented("read_u16")
     def read_u16(self, addr_1_based: int) -> int:
-        regs = self._ensure_transport().read_holding_registers(self._r(addr_1_based), 1)
+        regs = self._cached(addr_1_based, 1)
+        if regs is None:
+            regs = self._ensure_transport().read_holding_registers(self._r(addr_1_based), 1)
+            self._remember(addr_1_based, regs[:1])
         return int(regs[0])
 
+    def _write_words(self, addr_1_based: int, words: list[int]) -> None:
+        """Write ``words`` with FC06 (single word) or FC16, verified if enabled."""
+        if self.verify_writes:
+            self._verified_write(addr_1_based, words)
+            return
+        transport = self._ensure_transport()
+        if len(words) == 1:
+            transport.write_register(self._r(addr_1_based), words[0])
+        else:
+            transport.write_registers(self._r(addr_1_based), words)
+
+    @property
+    def supports_fc23(self) -> Optional[bool]:
+        """Whether the device accepts FC23, ``None`` until a verified write tried it."""
+        return _fc23_support.get(device_key(self.cfg))
+
+    def _verified_write(self, addr_1_based: int, words: list[int]) -> None:
+        transport = self._ensure_transport()
+        address = self._r(addr_1_based)
+        key = device_key(self.cfg)
+        if _fc23_support.get(key, True):
+            try:
+                actual = transport.read_write_registers(address, len(words), address, words)
+            except NotImplementedError:
+                pass  # only this transport lacks FC23; the device was not asked
+            except ModbusExceptionError as exc:
+                if exc.code != ILLEGAL_FUNCTION:
+                    raise
+                logger.info("slave %s rejects FC23, verifying by read-back", self.cfg.slave_id)
+                self._learn_fc23(key, False)
+            else:
+                self._learn_fc23(key, True)
+                self._check_written(addr_1_based, words, actual)
+                return
+        if len(words) == 1:
+            transport.write_register(address, words[0])
+        else:
+            transport.write_registers(address, words)
+        self._check_written(
+            addr_1_based, words, transport.read_holding_registers(address, len(words))
+        )
+
+    def _learn_fc23(self, key: PortKey, supported: bool) -> None:
+        if _fc23_support.get(key) is supported:
+            return
+        _fc23_support[key] = supported
+        if self._profiles is None:
+            return
+        try:
+            self._profiles.update(self.cfg.profile_port(), self.cfg.slave_id, fc23=supported)
+        except OSError as exc:
+            logger.warning("profile cache %s: %s", self.cfg.profile_cache, exc)
+
+    @staticmethod
+    def _check_written(addr_1_based: int, expected: list[int], actual: list[int]) -> None:
+        if list(actual[: len(expected)]) != [w & 0xFFFF for w in expected]:
+            raise WriteVerificationError(
+                f"register {addr_1_based} reads back {list(actual)}, wrote {expected}",
+                expected,
+                list(actual),
+            )
+
+    @_instrumented("write_u16")
     def write_u16(self, addr_1_based: int, value: int) -> None:
-        self._ensure_transport().write_register(self._r(addr_1_based), int(value))
+        self._write_words(addr_1_based, [int(value)])
+        self._remember(addr_1_based, [int(value)])
 
+    @_instrumented("read_float")
     def read_float(self, addr_1_based: int) -> float:
-        for _ in range(3):
-            regs = self._ensure_transport().read_holding_registers(self._r(addr_1_based), 2)
-            if len(regs) >= 2:
-                return self._unpack_float(regs)
-        raise VSensorError("invalid float response")
+        cached = self._cached(addr_1_based, 2)
+        if cached is not None:
+            return self._unpack_float(cached)
+        # Retries happen in the transport according to its RetryPolicy.
+        regs = self._ensure_transport().read_holding_registers(self._r(addr_1_based), 2)
+        if len(regs) < 2:
+            raise VSensorError("invalid float response")
+        self._remember(addr_1_based, regs[:2])
+        return self._unpack_float(regs)
 
+    @_instrumented("write_float")
     def write_float(self, addr_1_based: int, value: float) -> None:
         regs = self._pack_float(value)
-        self._ensure_transport().write_registers(self._r(addr_1_based), regs)
+        self._write_words(addr_1_based, regs)
+        self._remember(addr_1_based, regs)
+
+    def _read_blocks(
+        self, spans: Iterable[tuple[int, int]]
+    ) -> Iterator[tuple[ReadBlock, list[int]]]:
+        transport = self._ensure_transport()
+        for block in plan_reads(spans, max_gap=self.cfg.max_read_gap):
+            regs = transport.read_holding_registers(self._r(block.address), block.count)
+            if len(regs) < block.count:
+                raise VSensorError("short block response")
+            yield block, regs
+
+    @_instrumented("read_spans")
+    def read_spans(self, spans: Iterable[tuple[int, int]]) -> dict[int, list[int]]:
+        """Read ``(address, width)`` spans with as few block requests as possible.
+
+        Returns the raw words of every span keyed by its 1-based address.
+        """
+        values: dict[int, list[int]] = {}
+        pending: list[tuple[int, int]] = []
+        for address, width in spans:
+            cached = self._cached(address, width)
+            if cached is None:
+                pending.append((address, width))
+            else:
+                values[address] = cached
+        for block, regs in self._read_blocks(pending):
+            for address, width in pending:
+                if block.contains(address, width):
+                    values[address] = block.slice(regs, address, width)
+                    self._remember(address, values[address])
+        return values
+
+    # ---- Register table ----
+    @_instrumented("read")
+    def read(self, *names: str) -> dict[str, Value]:
+        """Read registers by name from :data:`vsensor.registers.REGISTERS`.
+
+        All registers are fetched with as few block reads as possible and
+        returned as decoded values in the order they were requested.
+        """
+        regs = [REG.lookup(name) for name in names]
+        decoded: dict[str, Value] = {}
+        pending: list[REG.Register] = []
+        for r in regs:
+            cached = self._cached(r.address, r.width)
+            if cached is None:
+                pending.append(r)
+            else:
+                decoded[r.name] = self.codec.decode(r, cached)
+        for block, words in self._read_blocks((r.address, r.width) for r in pending):
+            members = [r for r in pending if block.contains(r.address, r.width)]
+            decoded.update(self.codec.decode_block(block.address, words, members))
+            for r in members:
+                self._remember(r.address, block.slice(words, r.address, r.width))
+        return {r.name: decoded[r.name] for r in regs}
+
+    def refresh(self, *names: str) -> dict[str, Value]:
+        """Re-read registers from the device, bypassing and updating the cache."""
+        self.invalidate(*names)
+        return self.read(*names)
+
+    def invalidate(self, *names: str) -> None:
+        """Drop cached values of ``names`` or of all registers if omitted."""
+        if self.cache is None:
+            return
+        if names:
+            self.cache.invalidate(REG.lookup(name).address for name in names)
+        else:
+            self.cache.invalidate()
+
+    @_instrumented("write")
+    def write(self, **values: Value) -> None:
+        """Write registers by name, e.g. ``client.write(auto_setpoint=50.0)``.
+
+        Adjacent registers are written with a single FC16 request.
+        """
+        encoded = self._encode_writes(values)
+        self._ensure_transport()
+        for block in plan_writes((reg.address, words) for reg, words in encoded):
+            self._write_words(block.address, list(block.values))
+            for reg, words in encoded:
+                if block.contains(reg.address, reg.width):
+                    self._remember(reg.address, words)
+
+    def _encode_writes(self, values: Mapping[str, Value]) -> list[tuple[REG.Register, list[int]]]:
+        regs = [(REG.lookup(name), value) for name, value in values.items()]
+        for reg, _ in regs:
+            if not reg.writable:
+                raise VSensorError(f"register {reg.name} is read-only")
+        return [(reg, self.codec.encode(reg, value)) for reg, value in regs]
+
+    def batch(self) -> Batch:
+        """Collect reads and writes and run them merged, see :class:`Batch`."""
+        return Batch(self)
 
     # ---- High level ----
     def read_pressure(self) -> float:
@@ -89,29 +417,58 @@ class VSensorClient:
     def set_mode(self, value: Mode) -> None:
         self.write_u16(REG.MODE, int(value))
 
+    @_instrumented("read_telemetry")
     def read_telemetry(self) -> Telemetry:
+        return self.decode_telemetry(self.read(*TELEMETRY_REGISTERS))
+
+    def read_snapshot(self, seq: int = 0) -> Snapshot:
+        """Read telemetry and HEARTBEAT in one go and return a :class:`Snapshot`."""
+        values = self.read(*TELEMETRY_REGISTERS, "HEARTBEAT")
+        return Snapshot(time.time(), self.decode_telemetry(values), int(values["HEARTBEAT"]), seq)
+
+    @staticmethod
+    def decode_telemetry(values: Mapping[str, Value]) -> Telemetry:
+        """Build :class:`Telemetry` from values returned by :meth:`read`."""
         return Telemetry(
-            pressure_pa=self.read_pressure(),
-            output_percent=self.read_output(),
-            auto_setpoint=self.read_auto_setpoint(),
-            mode=self.read_mode(),
+            pressure_pa=float(values["PRESSURE_PA"]),
+            output_percent=float(values["OUTPUT_PERCENT"]),
+            auto_setpoint=float(values["AUTO_SETPOINT"]),
+            mode=Mode(int(values["MODE"])),
         )
 
+    def subscribe(
+        self,
+        channels: Union[str, Iterable[str]],
+        callback: "Callback",
+        deadband: "Deadband" = 0.0,
+        min_interval: float = 0.0,
+        max_interval: Optional[float] = None,
+    ) -> "Subscription":
+        """Call ``callback`` when telemetry ``channels`` change.
+
+        All subscriptions of a client share one :class:`~vsensor.poller.Poller`
+        polling every ``cfg.poll_interval`` seconds; it is started on the
+        first subscription and stopped by :meth:`close`.  See
+        :class:`~vsensor.subscription.Subscription` for the parameters.
+        """
+        from .poller import Poller  # poller imports this module
+
+        if self._poller is None:
+            self._poller = Poller(self)
+        sub = self._poller.subscribe(channels, callback, deadband, min_interval, max_interval)
+        self._poller.start()
+        return sub
+
     def close(self) -> None:
-        """Close the underlying transport."""
+        """Stop subscriptions and close the underlying transport."""
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
         if self.transport is not None:
             self.transport.close()
 
     def _unpack_float(self, regs: list[int]) -> float:
-        words = regs if self.wordorder == "big" else list(reversed(regs))
-        raw = b"".join(int(w).to_bytes(2, self.byteorder) for w in words)
-        fmt = ">" if self.byteorder == "big" else "<"
-        return float(struct.unpack(fmt + "f", raw)[0])
+        return self.codec.unpack_float(regs)
 
     def _pack_float(self, value: float) -> list[int]:
-        fmt = ">" if self.byteorder == "big" else "<"
-        raw = struct.pack(fmt + "f", float(value))
-        words = [int.from_bytes(raw[i : i + 2], self.byteorder) for i in (0, 2)]
-        if self.wordorder == "little":
-            words.reverse()
-        return words
+        return self.codec.pack_float(value)
@@ -0,0 +1,142 @@
+"""Conversion between register words and typed values."""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Iterable, Literal, Sequence, Union
+
+from .registers import DataType, Register
+
+Value = Union[float, int]
+
+FLOAT_FORMATS: dict[int, tuple[Literal["big", "little"], Literal["big", "little"]]] = {
+    0: ("big", "big"),
+    1: ("little", "big"),
+    2: ("big", "little"),
+    3: ("little", "little"),
+}
+
+# Arrays with at least this many floats are decoded with NumPy if available.
+NUMPY_THRESHOLD = 64
+
+_np: Any = None
+
+
+def _numpy() -> Any:
+    """Import NumPy on first use; return ``None`` if it is not installed."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - optional dependency
+            _np = False
+        else:
+            _np = numpy
+    return _np or None
+
+
+class _FloatCodec:
+    """Precompiled :class:`struct.Struct` objects for one float format.
+
+    A float occupies two words which are serialised in ``byteorder`` and
+    reinterpreted as an IEEE 754 single in the same byte order; the word
+    order only decides which register comes first.
+    """
+
+    def __init__(self, byteorder: str, wordorder: str) -> None:
+        prefix = ">" if byteorder == "big" else "<"
+        self.prefix = prefix
+        self.swap_words = wordorder == "little"
+        self.words = struct.Struct(prefix + "HH")
+        self.value = struct.Struct(prefix + "f")
+
+
+_FLOAT_CODECS: dict[int, _FloatCodec] = {
+    fmt: _FloatCodec(*orders) for fmt, orders in FLOAT_FORMATS.items()
+}
+
+
+class RegisterCodec:
+    """Encode and decode register values for one float format."""
+
+    def __init__(self, float_format: int = 1) -> None:
+        if float_format not in FLOAT_FORMATS:
+            float_format = 1
+        self.byteorder, self.wordorder = FLOAT_FORMATS[float_format]
+        codec = _FLOAT_CODECS[float_format]
+        self._prefix = codec.prefix
+        self._swap = codec.swap_words
+        self._words = codec.words
+        self._value = codec.value
+
+    def unpack_float(self, regs: Sequence[int]) -> float:
+        first, second = (regs[1], regs[0]) if self._swap else (regs[0], regs[1])
+        return self._value.unpack(self._words.pack(first, second))[0]  # type: ignore[no-any-return]
+
+    def pack_float(self, value: float) -> list[int]:
+        first, second = self._words.unpack(self._value.pack(float(value)))
+        return [second, first] if self._swap else [first, second]
+
+    def unpack_floats(self, regs: Sequence[int], use_numpy: bool | None = None) -> Any:
+        """Decode consecutive floats from a register array in one call.
+
+        ``regs`` must hold an even number of words.  Large arrays are decoded
+        with NumPy when it is installed (or when ``use_numpy`` is true) and
+        returned as an ``ndarray``; otherwise a list of floats is returned.
+        """
+        n = len(regs)
+        if n % 2:
+            raise ValueError("float arrays need an even number of registers")
+        if use_numpy is None:
+            use_numpy = n // 2 >= NUMPY_THRESHOLD and _numpy() is not None
+        if use_numpy:
+            return self._unpack_floats_numpy(regs)
+        words = list(regs)
+        if self._swap:
+            words[0::2], words[1::2] = words[1::2], words[0::2]
+        raw = struct.pack(f"{self._prefix}{n}H", *words)
+        return list(struct.unpack(f"{self._prefix}{n // 2}f", raw))
+
+    def _unpack_floats_numpy(self, regs: Sequence[int]) -> Any:
+        np = _numpy()
+        if np is None:
+            raise ImportError("numpy is required for vectorised decoding")
+        words = np.asarray(regs, dtype=np.uint16).reshape(-1, 2)
+        if self._swap:
+            words = words[:, ::-1]
+        raw = words.astype(self._prefix + "u2").tobytes()
+        return np.frombuffer(raw, dtype=self._prefix + "f4").astype(np.float64)
+
+    def decode(self, reg: Register, words: list[int]) -> Value:
+        """Decode the words of ``reg`` into a Python value."""
+        if reg.type is DataType.FLOAT32:
+            value: Value = self.unpack_float(words)
+        elif reg.type is DataType.S16:
+            raw = int(words[0]) & 0xFFFF
+            value = raw - 0x10000 if raw & 0x8000 else raw
+        else:
+            value = int(words[0]) & 0xFFFF
+        return value * reg.scale if reg.scale != 1.0 else value
+
+    def encode(self, reg: Register, value: Value) -> list[int]:
+        """Encode ``value`` into the words written to ``reg``."""
+        if reg.type is DataType.FLOAT32:
+            return self.pack_float(float(value) / reg.scale)
+        raw = round(float(value) / reg.scale) if reg.scale != 1.0 else int(value)
+        lo, hi = (-0x8000, 0x7FFF) if reg.type is DataType.S16 else (0, 0xFFFF)
+        if not lo <= raw <= hi:
+            raise ValueError(f"{reg.name}: {value} out of range for {reg.type.value}")
+        return [raw & 0xFFFF]
+
+    def decode_block(
+        self, address: int, regs: list[int], registers: Iterable[Register]
+    ) -> dict[str, Value]:
+        """Decode every register of ``registers`` from one contiguous buffer.
+
+        ``address`` is the 1-based address of ``regs[0]``.
+        """
+        out: dict[str, Value] = {}
+        for reg in registers:
+            offset = reg.address - address
+            out[reg.name] = self.decode(reg, regs[offset : offset + reg.width])
+        return out
@@ -0,0 +1,64 @@
+"""Compatibility helpers for the supported pymodbus releases.
+
+pymodbus 3.7 replaced framer classes by ``FramerType``, 3.10 renamed the
+``slave`` request argument to ``device_id`` and several releases dropped
+client options.  The transports go through these helpers instead of
+hard-coding one API generation.
+
+pymodbus is imported on first use only, so that code paths which never open
+a serial port (``--help``, ``FakeTransport``, Modbus TCP) do not pay for it.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import inspect
+from typing import Any, Callable, Dict
+
+# pymodbus names used by the transports, by module.
+PYMODBUS_NAMES: Dict[str, str] = {
+    "ModbusSerialClient": "pymodbus.client",
+    "AsyncModbusSerialClient": "pymodbus.client",
+    "ModbusException": "pymodbus.exceptions",
+    "ModbusIOException": "pymodbus.exceptions",
+}
+
+
+def pymodbus(name: str) -> Any:
+    """Import and return one of :data:`PYMODBUS_NAMES`."""
+    return getattr(importlib.import_module(PYMODBUS_NAMES[name]), name)
+
+
+@functools.lru_cache(maxsize=None)
+def rtu_framer() -> Any:
+    """Return the RTU framer argument of the serial clients."""
+    try:
+        from pymodbus import FramerType
+
+        return FramerType.RTU
+    except ImportError:  # pragma: no cover - pymodbus < 3.7
+        from pymodbus.framer.rtu import FramerRTU
+
+        return FramerRTU
+
+
+def _parameters(func: Callable[..., Any]) -> Dict[str, inspect.Parameter]:
+    try:
+        return dict(inspect.signature(func).parameters)
+    except (TypeError, ValueError):  # pragma: no cover - builtins
+        return {}
+
+
+def client_kwargs(cls: Callable[..., Any], **kwargs: Any) -> Dict[str, Any]:
+    """Drop the keyword arguments the client class ``cls`` does not accept."""
+    params = _parameters(cls)
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return kwargs
+    return {k: v for k, v in kwargs.items() if k in params}
+
+
+def unit_kwarg(client: Any) -> str:
+    """Return the name of the slave address argument of ``client``'s requests."""
+    params = _parameters(client.read_holding_registers)
+    return "device_id" if "device_id" in params else "slave"
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+import json
+import logging
 import os
-from dataclasses import dataclass
+import threading
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .planner import DEFAULT_MAX_GAP
+from .retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
 
 
 def _get_env_int(name: str, default: int) -> int:
@@ -13,6 +22,13 @@ def _get_env_int(name: str, default: int) -> int:
         return default
 
 
+def _get_env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def _get_env_float(name: str, default: float) -> float:
     try:
         return float(os.getenv(name, default))
@@ -20,22 +36,243 @@ def _get_env_float(name: str, default: float) -> float:
         return default
 
 
+def _profile_cache() -> str:
+    path = os.getenv("VSENSOR_PROFILE_CACHE")
+    if path is not None:
+        return path
+    if os.name == "nt":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "vsensor", "profiles.json")
+
+
+def _env(getter: Callable[[str, Any], Any], name: str, default: Any) -> Any:
+    """Field whose default is read from the environment when a Config is made."""
+    return field(default_factory=lambda: getter(name, default))
+
+
 @dataclass
 class Config:
-    """Runtime configuration for the VSensor client."""
+    """Runtime configuration for the VSensor client.
+
+    Unset fields default to the ``VSENSOR_*`` environment variables as they
+    are when the instance is created.
+    """
 
-    port: str = os.getenv(
-        "VSENSOR_PORT", "COM6" if os.name == "nt" else "/dev/ttyUSB0"
+    port: str = _env(
+        os.getenv, "VSENSOR_PORT", "COM6" if os.name == "nt" else "/dev/ttyUSB0"
     )
-    baudrate: int = _get_env_int("VSENSOR_BAUD", 9600)
-    parity: str = os.getenv("VSENSOR_PARITY", "N")
-    stopbits: int = _get_env_int("VSENSOR_STOPBITS", 1)
-    bytesize: int = _get_env_int("VSENSOR_BYTESIZE", 8)
-    timeout: float = _get_env_float("VSENSOR_TIMEOUT", 1.5)
-    slave_id: int = _get_env_int("VSENSOR_SLAVE_ID", 1)
-    float_format: int = _get_env_int("VSENSOR_FLOAT_FORMAT", 1)
+    baudrate: int = _env(_get_env_int, "VSENSOR_BAUD", 9600)
+    parity: str = _env(os.getenv, "VSENSOR_PARITY", "N")
+    stopbits: int = _env(_get_env_int, "VSENSOR_STOPBITS", 1)
+    bytesize: int = _env(_get_env_int, "VSENSOR_BYTESIZE", 8)
+    timeout: float = _env(_get_env_float, "VSENSOR_TIMEOUT", 1.5)
+    slave_id: int = _env(_get_env_int, "VSENSOR_SLAVE_ID", 1)
+    float_format: int = _env(_get_env_int, "VSENSOR_FLOAT_FORMAT", 1)
+    max_read_gap: int = _env(_get_env_int, "VSENSOR_MAX_READ_GAP", DEFAULT_MAX_GAP)
+    poll_interval: float = _env(_get_env_float, "VSENSOR_POLL_INTERVAL", 1.0)
+    retries: int = _env(_get_env_int, "VSENSOR_RETRIES", 3)
+    retry_backoff: float = _env(_get_env_float, "VSENSOR_RETRY_BACKOFF", 0.05)
+    retry_backoff_max: float = _env(_get_env_float, "VSENSOR_RETRY_BACKOFF_MAX", 1.0)
+    deadline: float = _env(_get_env_float, "VSENSOR_DEADLINE", 0.0)  # 0 = unbounded
+    # 0 = off
+    breaker_threshold: int = _env(_get_env_int, "VSENSOR_BREAKER_THRESHOLD", 5)
+    breaker_reset: float = _env(_get_env_float, "VSENSOR_BREAKER_RESET", 10.0)
+    # rtu, tcp, rtu-over-tcp or daemon
+    transport: str = _env(os.getenv, "VSENSOR_TRANSPORT", "rtu")
+    host: str = _env(os.getenv, "VSENSOR_HOST", "localhost")
+    tcp_port: int = _env(_get_env_int, "VSENSOR_TCP_PORT", 502)
+    pipeline_depth: int = _env(_get_env_int, "VSENSOR_PIPELINE_DEPTH", 4)
+    verify_writes: bool = _env(_get_env_bool, "VSENSOR_VERIFY_WRITES", False)
+    profile_cache: str = field(default_factory=_profile_cache)  # "" = off
+    # vsensord socket; None = derived from the port, "" = never use a daemon
+    daemon_socket: Optional[str] = _env(os.getenv, "VSENSOR_DAEMON_SOCKET", None)
+
+    @classmethod
+    def from_env(cls, profile: bool = True) -> "Config":
+        """Create configuration from environment variables.
+
+        Settings not given in the environment come from the stored profile
+        of the device, if there is one.  Pass ``profile=False`` to change
+        the port or slave ID before calling :meth:`apply_profile`.
+        """
+        cfg = cls()
+        if profile:
+            cfg.apply_profile()
+        return cfg
+
+    def profiles(self) -> Optional["ProfileStore"]:
+        """Return the profile store, ``None`` if the cache is switched off."""
+        return ProfileStore(self.profile_cache) if self.profile_cache else None
+
+    def daemon_path(self) -> Optional[str]:
+        """Return the socket of the ``vsensord`` serving :attr:`port`.
+
+        Without ``VSENSOR_DAEMON_SOCKET`` the socket lives in the private
+        ``$XDG_RUNTIME_DIR``; there is no default outside of it.
+        """
+        if self.daemon_socket is not None:
+            return self.daemon_socket or None
+        base = os.getenv("XDG_RUNTIME_DIR")
+        if not base:
+            return None
+        return os.path.join(base, f"vsensord-{os.path.basename(self.port)}.sock")
+
+    def profile_port(self) -> str:
+        """Return the port part of the profile key."""
+        if self.transport.lower() not in ("rtu", "daemon"):
+            return f"{self.transport.lower()}://{self.host}:{self.tcp_port}"
+        return self.port
+
+    def apply_profile(self, keep: Iterable[str] = ()) -> Optional["DeviceProfile"]:
+        """Take the settings of the stored profile, except the fields in ``keep``.
+
+        Fields set in the environment (:data:`PROFILE_FIELDS`) are kept too.
+        """
+        store = self.profiles()
+        profile = store.get(self.profile_port(), self.slave_id) if store else None
+        if profile is not None:
+            env = [f for f, var in PROFILE_FIELDS.items() if var in os.environ]
+            profile.apply(self, [*keep, *env])
+        return profile
+
+    def retry_policy(self) -> RetryPolicy:
+        """Build the :class:`~vsensor.retry.RetryPolicy` described by this config."""
+        return RetryPolicy(
+            max_attempts=max(1, self.retries),
+            backoff=self.retry_backoff,
+            backoff_max=self.retry_backoff_max,
+            deadline=self.deadline or None,
+        )
+
+
+# Config fields a profile supplies, and the variables that override them.
+PROFILE_FIELDS: Dict[str, str] = {
+    "baudrate": "VSENSOR_BAUD",
+    "parity": "VSENSOR_PARITY",
+    "stopbits": "VSENSOR_STOPBITS",
+    "bytesize": "VSENSOR_BYTESIZE",
+    "float_format": "VSENSOR_FLOAT_FORMAT",
+}
+
+
+@dataclass
+class DeviceProfile:
+    """Settings a device was last seen working with."""
+
+    port: str
+    slave_id: int
+    baudrate: int = 9600
+    parity: str = "N"
+    stopbits: int = 1
+    bytesize: int = 8
+    float_format: Optional[int] = None
+    fc23: Optional[bool] = None  # None until a verified write tried it
+    verified: float = 0.0  # time.time() of the last successful check
 
     @classmethod
-    def from_env(cls) -> "Config":
-        """Create configuration from environment variables."""
-        return cls()
+    def from_config(cls, cfg: Config, **changes: object) -> "DeviceProfile":
+        profile = cls(
+            cfg.profile_port(),
+            cfg.slave_id,
+            cfg.baudrate,
+            cfg.parity,
+            cfg.stopbits,
+            cfg.bytesize,
+            cfg.float_format,
+        )
+        for name, value in changes.items():
+            setattr(profile, name, value)
+        return profile
+
+    def matches(self, cfg: Config) -> bool:
+        """Whether ``cfg`` talks to the device with the settings of this profile."""
+        return all(
+            getattr(self, name) is None or getattr(self, name) == getattr(cfg, name)
+            for name in PROFILE_FIELDS
+        )
+
+    def apply(self, cfg: Config, keep: Iterable[str] = ()) -> None:
+        skip = set(keep)
+        for name in PROFILE_FIELDS:
+            value = getattr(self, name)
+            if name not in skip and value is not None:
+                setattr(cfg, name, value)
+
+
+class ProfileStore:
+    """Device profiles in a JSON file, keyed by port and slave ID.
+
+    The file is rewritten atomically on every change; a missing or corrupt
+    file reads as empty.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @staticmethod
+    def _key(port: str, slave_id: int) -> str:
+        return f"{port}#{slave_id}"
+
+    def load(self) -> Dict[str, DeviceProfile]:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("ignoring profile cache %s: %s", self.path, exc)
+            return {}
+        known = {f.name for f in fields(DeviceProfile)}
+        profiles: Dict[str, DeviceProfile] = {}
+        for key, entry in raw.items() if isinstance(raw, dict) else ():
+            try:
+                values = {k: v for k, v in entry.items() if k in known}
+                profiles[key] = DeviceProfile(**values)
+            except (AttributeError, TypeError):
+                logger.debug("skipping malformed profile %s", key)
+        return profiles
+
+    def _save(self, profiles: Dict[str, DeviceProfile]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({k: asdict(p) for k, p in sorted(profiles.items())}, fh, indent=1)
+        os.replace(tmp, self.path)
+
+    def get(self, port: str, slave_id: int) -> Optional[DeviceProfile]:
+        return self.load().get(self._key(port, slave_id))
+
+    def put(self, profile: DeviceProfile) -> None:
+        with self._lock:
+            profiles = self.load()
+            profiles[self._key(profile.port, profile.slave_id)] = profile
+            self._save(profiles)
+
+    def update(
+        self, port: str, slave_id: int, **changes: object
+    ) -> Optional[DeviceProfile]:
+        """Change fields of a stored profile; return it, ``None`` if there is none."""
+        with self._lock:
+            profiles = self.load()
+            profile = profiles.get(self._key(port, slave_id))
+            if profile is None:
+                return None
+            for name, value in changes.items():
+                setattr(profile, name, value)
+            self._save(profiles)
+            return profile
+
+    def forget(self, port: str, slave_id: int) -> bool:
+        """Drop the profile of a device; return whether there was one."""
+        with self._lock:
+            profiles = self.load()
+            if profiles.pop(self._key(port, slave_id), None) is None:
+                return False
+            self._save(profiles)
+            return True
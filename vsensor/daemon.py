@@ -0,0 +1,789 @@
+"""``vsensord``: a local daemon owning one serial line.
+
+Only one process can drive an RS-485 adapter.  The daemon opens the port
+once and serves read, write and subscribe requests of any number of local
+processes (dashboard, exporters, CLI calls) over a Unix domain socket.
+Clients need no changes: :func:`~vsensor.transport.create_transport`
+returns a :class:`DaemonTransport` whenever a daemon listens on the socket
+of the configured port (:meth:`~vsensor.config.Config.daemon_path`).
+
+Every message is a fixed big-endian header followed by ``length`` payload
+bytes.  Requests carry the priority class and deadline of the caller (see
+:mod:`vsensor.scheduler`), so the daemon's bus scheduler orders requests of
+all clients together::
+
+    request   >HBBBBHIH  tid, op, slave, priority, retries (0 = default),
+                         timeout ms (0 = default), deadline ms (0 = none), length
+    response  >HBBH      tid, op, status, length
+
+    op           request payload                       response payload
+    READ         >HH address, count                    words
+    WRITE_SINGLE >HH address, value                    -
+    WRITE        >H address, words                     -
+    READ_WRITE   >HHH read address, count, write       words
+                 address, words
+    SUBSCRIBE    >HHI address, count, interval ms      -, then NOTIFY frames
+    UNSUBSCRIBE  >H tid of the SUBSCRIBE               -
+
+Words are ``>H`` each.  NOTIFY frames carry the tid of their SUBSCRIBE and
+are sent when the words change or a read fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import Config
+from .errors import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    ModbusExceptionError,
+    TimeoutError,
+    TransportError,
+    VSensorError,
+)
+from .scheduler import Priority, priority, request_class
+from .transport import SlaveTransport, Transport
+
+logger = logging.getLogger(__name__)
+
+REQUEST = struct.Struct(">HBBBBHIH")
+RESPONSE = struct.Struct(">HBBH")
+
+# Operations; the bus operations use their Modbus function codes.
+READ = 3
+WRITE_SINGLE = 6
+WRITE = 16
+READ_WRITE = 23
+SUBSCRIBE = 0x40
+NOTIFY = 0x41
+UNSUBSCRIBE = 0x42
+
+# Response status.
+OK = 0
+EXCEPTION = 1  # payload: exception code
+TIMEOUT = 2
+DEADLINE = 3
+CIRCUIT_OPEN = 4
+FAILED = 5  # payload: message
+UNSUPPORTED = 6
+BAD_REQUEST = 7
+
+# Added to the transaction time when waiting for the daemon, for requests
+# queued behind other clients.
+QUEUE_ALLOWANCE = 10.0  # seconds
+
+
+def _words(data: bytes) -> List[int]:
+    return list(struct.unpack(f">{len(data) // 2}H", data))
+
+
+def _pack_words(words: Iterable[int]) -> bytes:
+    words = [w & 0xFFFF for w in words]
+    return struct.pack(f">{len(words)}H", *words)
+
+
+def _status(exc: BaseException) -> Tuple[int, bytes]:
+    """Encode an exception raised by the bus as response status and payload."""
+    if isinstance(exc, ModbusExceptionError):
+        return EXCEPTION, bytes([exc.code or 0])
+    if isinstance(exc, CircuitOpenError):
+        return CIRCUIT_OPEN, str(exc).encode()
+    if isinstance(exc, TimeoutError):
+        return TIMEOUT, b""
+    if isinstance(exc, DeadlineExceededError):
+        return DEADLINE, str(exc).encode()
+    if isinstance(exc, NotImplementedError):
+        return UNSUPPORTED, b""
+    if isinstance(exc, (ValueError, struct.error)):
+        return BAD_REQUEST, str(exc).encode()
+    return FAILED, str(exc).encode()
+
+
+def _error(status: int, payload: bytes) -> BaseException:
+    """Inverse of :func:`_status`."""
+    text = payload.decode(errors="replace")
+    if status == EXCEPTION:
+        code = payload[0] if payload else None
+        return ModbusExceptionError(f"exception response code {code}", code)
+    if status == TIMEOUT:
+        return TimeoutError("modbus timeout")
+    if status == DEADLINE:
+        return DeadlineExceededError(text or "request expired")
+    if status == CIRCUIT_OPEN:
+        return CircuitOpenError(text or "circuit open")
+    if status == UNSUPPORTED:
+        return NotImplementedError("not supported by the daemon's transport")
+    if status == BAD_REQUEST:
+        return ValueError(text)
+    return TransportError(text or "daemon request failed")
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    data = b""
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed by peer")
+        data += chunk
+    return data
+
+
+# ---- Daemon ----------------------------------------------------------------
+
+
+@dataclass
+class DaemonStats:
+    """Counters of a running :class:`Daemon`."""
+
+    clients: int = 0
+    requests: int = 0
+    errors: int = 0
+    notifications: int = 0
+
+
+class _Connection:
+    """One client connection; responses and notifications share its socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.lock = threading.Lock()
+        self.open = True
+
+    def send(self, tid: int, op: int, status: int, payload: bytes = b"") -> None:
+        with self.lock:
+            if not self.open:
+                return
+            try:
+                self.sock.sendall(RESPONSE.pack(tid, op, status, len(payload)) + payload)
+            except OSError:
+                self.open = False
+
+
+@dataclass
+class _Subscription:
+    conn: _Connection
+    tid: int
+    view: Transport
+    slave: int
+    address: int
+    count: int
+    interval: float
+    due: float = 0.0
+    last: Optional[List[int]] = None
+    failed: bool = False
+
+
+class Daemon:
+    """Serve the devices behind ``transport`` on the Unix socket ``path``.
+
+    ``transport`` is owned by the daemon.  Each request runs on one of
+    ``workers`` threads under the priority and deadline the client sent, so
+    the bus scheduler of ``transport`` arbitrates between clients.
+    Subscriptions are polled as :attr:`~Priority.BACKGROUND` by one thread;
+    subscriptions to the same registers share their bus reads.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        path: str,
+        workers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.transport = transport
+        self.path = path
+        self.stats = DaemonStats()
+        self._stats_lock = threading.Lock()
+        self._clock = clock
+        self._pool = ThreadPoolExecutor(max(1, workers), thread_name_prefix="vsensord-worker")
+        self._views: Dict[Tuple[int, Optional[float], Optional[int]], Transport] = {}
+        self._views_lock = threading.Lock()
+        self._subs: Dict[Tuple[_Connection, int], _Subscription] = {}
+        self._subs_cond = threading.Condition()
+        self._stop = threading.Event()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._poller: Optional[threading.Thread] = None
+
+    def _view(self, slave: int, timeout: Optional[float], retries: Optional[int]) -> Transport:
+        key = (slave, timeout, retries)
+        with self._views_lock:
+            view = self._views.get(key)
+            if view is None:
+                view = self._views[key] = self.transport.for_slave(
+                    slave, timeout=timeout, retries=retries
+                )
+        return view
+
+    def _count(self, name: str, n: int = 1) -> None:
+        """Add ``n`` to a :class:`DaemonStats` counter under the stats lock."""
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + n)
+
+    # Requests -------------------------------------------------------------
+
+    def _handle(self, conn: _Connection, header: Tuple[int, ...], body: bytes) -> None:
+        tid, op, slave, level, retries, timeout_ms, deadline_ms, _ = header
+        received = time.monotonic()
+        self._count("requests")
+        view = self._view(slave, timeout_ms / 1000 or None, retries or None)
+        if op == SUBSCRIBE:
+            self._subscribe(conn, tid, view, slave, body)
+            return
+        if op == UNSUBSCRIBE:
+            self._unsubscribe(conn, struct.unpack(">H", body[:2])[0] if len(body) >= 2 else 0)
+            conn.send(tid, op, OK)
+            return
+        try:
+            level = Priority(level)
+        except ValueError:
+            level = Priority.INTERACTIVE
+
+        def job() -> None:
+            deadline = None
+            if deadline_ms:
+                deadline = max(0.0, received + deadline_ms / 1000 - time.monotonic())
+            try:
+                with priority(level, deadline):
+                    payload = self._execute(view, op, body)
+            except Exception as exc:
+                self._count("errors")
+                logger.debug("request %s of slave %s failed: %s", op, slave, exc)
+                conn.send(tid, op, *_status(exc))
+            else:
+                conn.send(tid, op, OK, payload)
+
+        self._pool.submit(job)
+
+    @staticmethod
+    def _execute(view: Transport, op: int, body: bytes) -> bytes:
+        if op == READ:
+            address, count = struct.unpack(">HH", body)
+            return _pack_words(view.read_holding_registers(address, count))
+        if op == WRITE_SINGLE:
+            address, value = struct.unpack(">HH", body)
+            view.write_register(address, value)
+            return b""
+        if op == WRITE:
+            (address,) = struct.unpack(">H", body[:2])
+            view.write_registers(address, _words(body[2:]))
+            return b""
+        if op == READ_WRITE:
+            read_address, read_count, write_address = struct.unpack(">HHH", body[:6])
+            words = view.read_write_registers(
+                read_address, read_count, write_address, _words(body[6:])
+            )
+            return _pack_words(words)
+        raise ValueError(f"unknown operation {op}")
+
+    # Subscriptions --------------------------------------------------------
+
+    def _subscribe(
+        self, conn: _Connection, tid: int, view: Transport, slave: int, body: bytes
+    ) -> None:
+        try:
+            address, count, interval_ms = struct.unpack(">HHI", body)
+        except struct.error as exc:
+            conn.send(tid, SUBSCRIBE, *_status(exc))
+            return
+        sub = _Subscription(
+            conn, tid, view, slave, address, count, max(interval_ms, 10) / 1000, self._clock()
+        )
+        conn.send(tid, SUBSCRIBE, OK)
+        with self._subs_cond:
+            self._subs[(conn, tid)] = sub
+            self._subs_cond.notify_all()
+
+    def _unsubscribe(self, conn: _Connection, tid: Optional[int] = None) -> None:
+        """Drop one subscription of ``conn``, or all of them if ``tid`` is None."""
+        with self._subs_cond:
+            for key in [k for k in self._subs if k[0] is conn and tid in (None, k[1])]:
+                del self._subs[key]
+
+    def poll_subscriptions(self) -> None:
+        """Read every due subscription once and notify the changed ones."""
+        now = self._clock()
+        with self._subs_cond:
+            due = [s for s in self._subs.values() if s.due <= now]
+        groups: Dict[Tuple[int, int, int], List[_Subscription]] = {}
+        for sub in due:
+            groups.setdefault((sub.slave, sub.address, sub.count), []).append(sub)
+        for subs in groups.values():
+            first = subs[0]
+            try:
+                with priority(Priority.BACKGROUND, min(s.interval for s in subs)):
+                    words: Optional[List[int]] = first.view.read_holding_registers(
+                        first.address, first.count
+                    )
+                error: Optional[Tuple[int, bytes]] = None
+            except Exception as exc:
+                words, error = None, _status(exc)
+            for sub in subs:
+                if not sub.conn.open:
+                    self._unsubscribe(sub.conn)
+                    continue
+                if error is not None:
+                    if not sub.failed:
+                        sub.failed = True
+                        sub.conn.send(sub.tid, NOTIFY, *error)
+                        self._count("notifications")
+                elif words != sub.last or sub.failed:
+                    sub.last, sub.failed = words, False
+                    sub.conn.send(sub.tid, NOTIFY, OK, _pack_words(words or []))
+                    self._count("notifications")
+                sub.due += sub.interval
+                if sub.due < now:  # fell behind: skip the missed slots
+                    sub.due = now + sub.interval
+
+    def _poll_loop(self) -> None:
+        while not self._stop.is_set():
+            self.poll_subscriptions()
+            with self._subs_cond:
+                due = min((s.due for s in self._subs.values()), default=None)
+                wait = 1.0 if due is None else due - self._clock()
+                if wait > 0:
+                    self._subs_cond.wait(wait)
+
+    # Serving --------------------------------------------------------------
+
+    def serve(self) -> socketserver.ThreadingUnixStreamServer:
+        """Bind the socket and serve from background threads."""
+        daemon = self
+        if os.path.exists(self.path):
+            if _listening(self.path):
+                raise TransportError(f"a daemon is already listening on {self.path}")
+            os.unlink(self.path)  # stale socket of a daemon that died
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                conn = _Connection(self.request)
+                daemon._count("clients")
+                try:
+                    while True:
+                        header = REQUEST.unpack(_recv_exact(conn.sock, REQUEST.size))
+                        body = _recv_exact(conn.sock, header[-1])
+                        daemon._handle(conn, header, body)
+                except (OSError, struct.error):
+                    pass
+                finally:
+                    conn.open = False
+                    daemon._unsubscribe(conn)
+                    daemon._count("clients", -1)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        server.daemon_threads = True
+        os.chmod(self.path, 0o600)  # clients only trust a private socket
+        threading.Thread(target=server.serve_forever, name="vsensord", daemon=True).start()
+        self._poller = threading.Thread(target=self._poll_loop, name="vsensord-subs", daemon=True)
+        self._poller.start()
+        logger.info("vsensord listening on %s", self.path)
+        self._server = server
+        return server
+
+    def close(self) -> None:
+        """Stop serving, remove the socket and close the bus transport."""
+        self._stop.set()
+        with self._subs_cond:
+            self._subs.clear()
+            self._subs_cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+        self._pool.shutdown(wait=True)
+        self.transport.close()
+
+
+def _listening(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+# ---- Client ----------------------------------------------------------------
+
+
+class DaemonSubscription:
+    """A subscription held by :meth:`DaemonTransport.subscribe`."""
+
+    def __init__(
+        self,
+        transport: "DaemonTransport",
+        tid: int,
+        callback: Callable[[List[int]], None],
+        on_error: Optional[Callable[[BaseException], None]],
+    ) -> None:
+        self._transport = transport
+        self.tid = tid
+        self.callback = callback
+        self.on_error = on_error
+        self.active = True
+
+    def _deliver(self, status: int, payload: bytes) -> None:
+        try:
+            if status == OK:
+                self.callback(_words(payload))
+            elif self.on_error is not None:
+                self.on_error(_error(status, payload))
+        except Exception:  # pragma: no cover - callback bugs must not stop the reader
+            logger.exception("subscription callback failed")
+
+    def cancel(self) -> None:
+        if self.active:
+            self.active = False
+            self._transport._cancel(self)
+
+
+class DaemonTransport(Transport):
+    """Transport forwarding requests to a running ``vsensord``.
+
+    Several threads may share one transport; requests are tagged with
+    transaction IDs and answered in any order.  Retries, circuit breaking
+    and bus scheduling happen in the daemon, which receives the priority
+    and deadline of each request.  The connection is re-established on the
+    next request after it was lost; subscriptions end with it.
+    """
+
+    def __init__(self, cfg: Config, path: Optional[str] = None) -> None:
+        path = path or cfg.daemon_path()
+        if not path or not hasattr(socket, "AF_UNIX"):
+            raise TransportError("no vsensord socket configured")
+        self.path = path
+        self._slave_id = cfg.slave_id
+        self._timeout = cfg.timeout
+        self._retries = max(1, cfg.retries)
+        self._send_lock = threading.Lock()
+        self._conn_lock = threading.Lock()
+        self._pending: Dict[int, "Future[Tuple[int, bytes]]"] = {}
+        self._subs: Dict[int, DaemonSubscription] = {}
+        self._next_tid = 0
+        self._sock: Optional[socket.socket] = None
+        self._connect()
+
+    def _connect(self) -> socket.socket:
+        with self._conn_lock:
+            if self._sock is not None:
+                return self._sock
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError as exc:
+                sock.close()
+                raise TransportError(f"vsensord not reachable on {self.path}: {exc}") from exc
+            self._sock = sock
+            threading.Thread(
+                target=self._read_loop, args=(sock,), name="vsensor-daemon-reader", daemon=True
+            ).start()
+            return sock
+
+    def _disconnect(self, sock: socket.socket, reason: str, notify: bool = True) -> None:
+        """Drop ``sock``, fail waiting requests and end the subscriptions."""
+        with self._conn_lock:
+            if self._sock is sock:
+                self._sock = None
+        try:
+            sock.shutdown(socket.SHUT_RDWR)  # wakes the reader, tells the daemon
+        except OSError:
+            pass
+        try:
+            sock.close()
+        except OSError:  # pragma: no cover - already closed
+            pass
+        with self._send_lock:
+            pending, self._pending = self._pending, {}
+            subs, self._subs = self._subs, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(TransportError(reason))
+        for sub in subs.values():
+            sub.active = False
+            if notify and sub.on_error is not None:
+                sub.on_error(TransportError(reason))
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        try:
+            while True:
+                tid, op, status, length = RESPONSE.unpack(_recv_exact(sock, RESPONSE.size))
+                payload = _recv_exact(sock, length)
+                if op == NOTIFY:
+                    sub = self._subs.get(tid)
+                    if sub is not None and sub.active:
+                        sub._deliver(status, payload)
+                    continue
+                with self._send_lock:
+                    future = self._pending.pop(tid, None)
+                if future is not None and not future.done():
+                    future.set_result((status, payload))
+        except (OSError, struct.error) as exc:
+            self._disconnect(sock, f"vsensord connection lost: {exc}")
+
+    def _allocate_tid(self) -> int:
+        """Return a free tid; call with the send lock held.
+
+        The counter wraps, so tids still held by a pending request or a
+        live subscription are skipped.
+        """
+        for _ in range(0xFFFF):
+            self._next_tid = self._next_tid % 0xFFFF + 1
+            if self._next_tid not in self._pending and self._next_tid not in self._subs:
+                return self._next_tid
+        raise TransportError("no free vsensord transaction ID")
+
+    def _send(
+        self,
+        op: int,
+        slave: int,
+        payload: bytes,
+        timeout: Optional[float],
+        retries: Optional[int],
+        register: Optional[Callable[[int], None]] = None,
+    ) -> Tuple[int, "Future[Tuple[int, bytes]]"]:
+        level, deadline = request_class(op)
+        deadline_ms = 0
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceededError(f"{level.name.lower()} request expired")
+            deadline_ms = max(1, int(remaining * 1000))
+        timeout_ms = min(int((timeout or 0) * 1000), 0xFFFF)
+        sock = self._connect()
+        future: Future[Tuple[int, bytes]] = Future()
+        with self._send_lock:
+            tid = self._allocate_tid()
+            header = REQUEST.pack(
+                tid,
+                op,
+                slave,
+                int(level),
+                min(retries or 0, 255),
+                timeout_ms,
+                deadline_ms,
+                len(payload),
+            )
+            self._pending[tid] = future
+            if register is not None:
+                register(tid)
+            try:
+                sock.sendall(header + payload)
+            except OSError as exc:
+                del self._pending[tid]
+                raise TransportError(f"send to vsensord failed: {exc}") from exc
+        return tid, future
+
+    def _request(
+        self,
+        op: int,
+        payload: bytes,
+        slave: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        register: Optional[Callable[[int], None]] = None,
+    ) -> bytes:
+        slave = self._slave_id if slave is None else slave
+        tid, future = self._send(op, slave, payload, timeout, retries, register)
+        attempts = retries or self._retries
+        try:
+            status, body = future.result((timeout or self._timeout) * attempts + QUEUE_ALLOWANCE)
+        except FutureTimeout as exc:
+            with self._send_lock:
+                self._pending.pop(tid, None)
+            raise TimeoutError("vsensord did not answer") from exc
+        if status != OK:
+            raise _error(status, body)
+        return body
+
+    def read_holding_registers(self, address: int, count: int, **opts: Any) -> List[int]:
+        return _words(self._request(READ, struct.pack(">HH", address, count), **opts))
+
+    def write_register(self, address: int, value: int, **opts: Any) -> None:
+        self._request(WRITE_SINGLE, struct.pack(">HH", address, value & 0xFFFF), **opts)
+
+    def write_registers(self, address: int, values: Iterable[int], **opts: Any) -> None:
+        self._request(WRITE, struct.pack(">H", address) + _pack_words(values), **opts)
+
+    def read_write_registers(
+        self,
+        read_address: int,
+        read_count: int,
+        write_address: int,
+        values: Iterable[int],
+        **opts: Any,
+    ) -> List[int]:
+        payload = struct.pack(">HHH", read_address, read_count, write_address)
+        return _words(self._request(READ_WRITE, payload + _pack_words(values), **opts))
+
+    def subscribe(
+        self,
+        address: int,
+        count: int,
+        callback: Callable[[List[int]], None],
+        interval: float = 1.0,
+        *,
+        slave: Optional[int] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> DaemonSubscription:
+        """Have the daemon poll ``count`` words at 0-based ``address``.
+
+        ``callback`` gets the words whenever they change, on the reader
+        thread, so it should return quickly; ``on_error`` gets failed reads
+        and the loss of the connection.
+        """
+        holder: List[DaemonSubscription] = []
+
+        def register(tid: int) -> None:
+            # Registered before the request is sent: the first NOTIFY may
+            # overtake the acknowledgement.
+            holder.append(DaemonSubscription(self, tid, callback, on_error))
+            self._subs[tid] = holder[0]
+
+        payload = struct.pack(">HHI", address, count, max(1, int(interval * 1000)))
+        try:
+            self._request(SUBSCRIBE, payload, slave=slave, register=register)
+        except BaseException:
+            if holder:
+                self._subs.pop(holder[0].tid, None)
+            raise
+        return holder[0]
+
+    def _cancel(self, sub: DaemonSubscription) -> None:
+        with self._send_lock:
+            self._subs.pop(sub.tid, None)
+        try:
+            self._request(UNSUBSCRIBE, struct.pack(">H", sub.tid))
+        except VSensorError as exc:
+            logger.debug("unsubscribe failed: %s", exc)
+
+    def for_slave(
+        self, slave_id: int, timeout: Optional[float] = None, retries: Optional[int] = None
+    ) -> Transport:
+        return SlaveTransport(self, slave_id, timeout=timeout, retries=retries)
+
+    def close(self) -> None:
+        sock = self._sock
+        if sock is not None:
+            self._disconnect(sock, "transport closed", notify=False)
+
+
+def _trusted(path: str) -> bool:
+    """Return whether ``path`` is a socket only this user can write to.
+
+    Anyone able to create the socket could otherwise answer in place of the
+    device, so a socket of another user or one open to group or others is
+    not used automatically.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(st.st_mode)
+        and st.st_uid == os.getuid()
+        and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def connect_daemon(cfg: Config) -> Optional[DaemonTransport]:
+    """Return a transport to the daemon serving ``cfg.port``, ``None`` if none runs."""
+    path = cfg.daemon_path()
+    if not path or not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    if not _trusted(path):
+        logger.warning("ignoring %s: not a private socket of this user", path)
+        return None
+    try:
+        transport = DaemonTransport(cfg, path)
+    except TransportError as exc:
+        logger.debug("%s", exc)
+        return None
+    logger.debug("using vsensord on %s", path)
+    return transport
+
+
+# ---- Command line ------------------------------------------------------------
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run ``vsensord`` in the foreground until SIGTERM or Ctrl-C."""
+    logging.basicConfig(level=logging.INFO)
+    env_cfg = Config.from_env(profile=False)
+    parser = argparse.ArgumentParser(description="Serve a VSensor serial line to local clients")
+    parser.add_argument("--port", default=env_cfg.port, help="serial port [env VSENSOR_PORT]")
+    parser.add_argument("--baud", type=int, help=f"baud rate [{env_cfg.baudrate}]")
+    parser.add_argument("--parity", type=str.upper, help=f"parity N/E/O [{env_cfg.parity}]")
+    parser.add_argument(
+        "--socket", help="socket path [env VSENSOR_DAEMON_SOCKET, derived from the port]"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="request worker threads")
+    args = parser.parse_args(argv)
+
+    cfg = env_cfg
+    cfg.port = args.port
+    explicit = {"baudrate": args.baud, "parity": args.parity}
+    for name, value in explicit.items():
+        if value is not None:
+            setattr(cfg, name, value)
+    cfg.apply_profile(keep=[name for name, value in explicit.items() if value is not None])
+    if args.socket:
+        cfg.daemon_socket = args.socket
+    path = cfg.daemon_path()
+    if not path:
+        logging.error(
+            "no socket path; set --socket, VSENSOR_DAEMON_SOCKET or XDG_RUNTIME_DIR"
+        )
+        return 2
+
+    from .transport import FakeTransport, RTUTransport
+
+    try:
+        if os.getenv("VSENSOR_SIM") or os.getenv("VSENSOR_FAKE"):
+            transport: Transport = FakeTransport(cfg)
+        else:
+            transport = RTUTransport(cfg)
+        daemon = Daemon(transport, path, workers=args.workers)
+        daemon.serve()
+    except VSensorError as exc:
+        logging.error("%s", exc)
+        return 1
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(60.0):
+            logging.info("%s", daemon.stats)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
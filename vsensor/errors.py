@@ -1,5 +1,7 @@
 """Custom exceptions for the vsensor package."""
 
+from __future__ import annotations
+
 
 class VSensorError(Exception):
     """Base class for all VSensor related errors."""
@@ -11,3 +13,28 @@ class TransportError(VSensorError):
 
 class TimeoutError(TransportError):
     """Raised when a transport operation times out."""
+
+
+class ModbusExceptionError(TransportError):
+    """The device answered with a Modbus exception response."""
+
+    def __init__(self, message: str, code: int | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class CircuitOpenError(TransportError):
+    """Raised without bus access while a device's circuit breaker is open."""
+
+
+class DeadlineExceededError(VSensorError):
+    """A queued bus request was dropped because its deadline passed."""
+
+
+class WriteVerificationError(VSensorError):
+    """The registers read back after a write differ from the values written."""
+
+    def __init__(self, message: str, expected: list[int], actual: list[int]) -> None:
+        super().__init__(message)
+        self.expected = expected
+        self.actual = actual
@@ -0,0 +1,177 @@
+"""Modbus RTU and MBAP frame encoding, CRC and frame length detection.
+
+Only the function codes used by the V-Sensor are understood: 3 (read
+holding registers), 6 (write single register), 16 (write multiple
+registers) and 23 (read/write multiple registers).
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import List, Optional, Sequence, Tuple
+
+READ_HOLDING_REGISTERS = 3
+WRITE_REGISTER = 6
+WRITE_REGISTERS = 16
+READ_WRITE_REGISTERS = 23
+
+# Exception codes.
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+ILLEGAL_DATA_VALUE = 3
+SLAVE_DEVICE_FAILURE = 4
+GATEWAY_PATH_UNAVAILABLE = 0x0A
+GATEWAY_TARGET_FAILED = 0x0B
+
+
+def _crc_table() -> Tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data: bytes) -> int:
+    """Return the Modbus CRC-16 of ``data``."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ _CRC_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def encode_frame(slave: int, pdu: bytes) -> bytes:
+    """Wrap ``pdu`` into an RTU frame with address and CRC (little endian)."""
+    body = bytes((slave,)) + pdu
+    return body + struct.pack("<H", crc16(body))
+
+
+def check_frame(frame: bytes) -> bool:
+    """Return whether the trailing CRC of ``frame`` is valid."""
+    return len(frame) >= 4 and crc16(frame[:-2]) == struct.unpack("<H", frame[-2:])[0]
+
+
+def decode_frame(frame: bytes) -> Tuple[int, bytes]:
+    """Return ``(slave, pdu)`` of a frame; raise ``ValueError`` on a bad CRC."""
+    if not check_frame(frame):
+        raise ValueError("CRC mismatch")
+    return frame[0], frame[1:-2]
+
+
+def request_length(buffer: bytes) -> Optional[int]:
+    """Return the length of the request frame at the start of ``buffer``.
+
+    Returns ``None`` while more bytes are needed to decide and ``0`` for an
+    unknown function code.
+    """
+    if len(buffer) < 2:
+        return None
+    fc = buffer[1]
+    if fc in (READ_HOLDING_REGISTERS, WRITE_REGISTER):
+        return 8
+    if fc == WRITE_REGISTERS:
+        return 9 + buffer[6] if len(buffer) > 6 else None
+    if fc == READ_WRITE_REGISTERS:
+        return 13 + buffer[10] if len(buffer) > 10 else None
+    return 0
+
+
+def exception_pdu(function_code: int, code: int) -> bytes:
+    """Return the PDU of an exception response."""
+    return bytes((function_code | 0x80, code))
+
+
+def response_length(buffer: bytes) -> Optional[int]:
+    """Return the length of the RTU response frame at the start of ``buffer``.
+
+    Returns ``None`` while more bytes are needed to decide.
+    """
+    if len(buffer) < 2:
+        return None
+    fc = buffer[1]
+    if fc & 0x80:
+        return 5
+    if fc in (READ_HOLDING_REGISTERS, READ_WRITE_REGISTERS):
+        return 5 + buffer[2] if len(buffer) > 2 else None
+    return 8
+
+
+# Request PDUs -------------------------------------------------------------
+
+def read_registers_pdu(address: int, count: int) -> bytes:
+    return struct.pack(">BHH", READ_HOLDING_REGISTERS, address, count)
+
+
+def write_register_pdu(address: int, value: int) -> bytes:
+    return struct.pack(">BHH", WRITE_REGISTER, address, value & 0xFFFF)
+
+
+def write_registers_pdu(address: int, values: Sequence[int]) -> bytes:
+    n = len(values)
+    return struct.pack(f">BHHB{n}H", WRITE_REGISTERS, address, n, 2 * n, *values)
+
+
+def read_write_registers_pdu(
+    read_address: int, read_count: int, write_address: int, values: Sequence[int]
+) -> bytes:
+    n = len(values)
+    return struct.pack(
+        f">BHHHHB{n}H",
+        READ_WRITE_REGISTERS,
+        read_address,
+        read_count,
+        write_address,
+        n,
+        2 * n,
+        *values,
+    )
+
+
+def request_fields(pdu: bytes) -> Tuple[int, int]:
+    """Return the two 16-bit fields of an FC03/FC06 request PDU."""
+    if len(pdu) != 5:
+        raise ValueError("malformed request")
+    return struct.unpack(">HH", pdu[1:5])
+
+
+def write_registers_fields(pdu: bytes) -> Tuple[int, List[int]]:
+    """Return ``(address, values)`` of an FC16 request PDU."""
+    if len(pdu) < 6:
+        raise ValueError("malformed request")
+    address, count, nbytes = struct.unpack(">HHB", pdu[1:6])
+    if nbytes != 2 * count or len(pdu) != 6 + nbytes or not 1 <= count <= 123:
+        raise ValueError("malformed request")
+    return address, list(struct.unpack(f">{count}H", pdu[6:]))
+
+
+def read_response_pdu(function_code: int, words: Sequence[int]) -> bytes:
+    """Return the response PDU carrying ``words`` for FC03/FC23."""
+    n = len(words)
+    return struct.pack(f">BB{n}H", function_code, 2 * n, *words)
+
+
+def register_values(pdu: bytes) -> List[int]:
+    """Return the register words of an FC03/FC23 response PDU.
+
+    Raise ``ValueError`` if the byte count does not match the PDU length.
+    """
+    if len(pdu) < 2 or pdu[1] % 2 or len(pdu) != 2 + pdu[1]:
+        raise ValueError("malformed response")
+    n = pdu[1] // 2
+    return list(struct.unpack(f">{n}H", pdu[2:]))
+
+
+# Modbus TCP (MBAP) --------------------------------------------------------
+
+MBAP_HEADER = struct.Struct(">HHHB")  # transaction, protocol, length, unit
+MAX_MBAP_LENGTH = 254  # unit ID and a PDU of at most 253 bytes
+
+
+def encode_mbap(transaction: int, unit: int, pdu: bytes) -> bytes:
+    """Prefix ``pdu`` with an MBAP header."""
+    return MBAP_HEADER.pack(transaction, 0, len(pdu) + 1, unit) + pdu
@@ -0,0 +1,299 @@
+"""Caching Modbus TCP gateway in front of one serial line.
+
+Any number of Modbus TCP clients can connect; the gateway is the only
+master on the RS-485 line.  Identical concurrent reads are coalesced into
+one bus transaction, results are served from a short-TTL cache and writes
+overtake queued reads, so bus traffic stays flat however many clients poll.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import framing
+from .errors import ModbusExceptionError, TimeoutError, TransportError, VSensorError
+from .transport import Transport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 0.25  # seconds
+
+# Bus job priorities, lower runs first.
+WRITE = 0
+READ = 1
+
+
+@dataclass
+class GatewayStats:
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    bus_reads: int = 0
+    bus_writes: int = 0
+    errors: int = 0
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _WordCache:
+    """Register words per unit with an expiry time each."""
+
+    def __init__(self, ttl: float, clock: Callable[[], float]) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._words: Dict[Tuple[int, int], Tuple[int, float]] = {}
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, unit: int, address: int, count: int) -> Optional[List[int]]:
+        now = self._clock()
+        out = []
+        with self._lock:
+            for a in range(address, address + count):
+                entry = self._words.get((unit, a))
+                if entry is None or entry[1] <= now:
+                    return None
+                out.append(entry[0])
+        return out
+
+    def version(self, unit: int) -> int:
+        with self._lock:
+            return self._versions.get(unit, 0)
+
+    def put(self, unit: int, address: int, words: List[int], version: Optional[int] = None) -> None:
+        """Store ``words``; skipped if a write to ``unit`` happened since ``version``."""
+        if self.ttl <= 0:
+            return
+        expires = self._clock() + self.ttl
+        with self._lock:
+            if version is not None and self._versions.get(unit, 0) != version:
+                return
+            for i, w in enumerate(words):
+                self._words[(unit, address + i)] = (w, expires)
+
+    def written(self, unit: int, address: int, words: List[int]) -> None:
+        """Record a successful write and outdate reads still in flight."""
+        with self._lock:
+            self._versions[unit] = self._versions.get(unit, 0) + 1
+        self.put(unit, address, words)
+
+
+class Gateway:
+    """Serve the devices behind ``transport`` to Modbus TCP clients.
+
+    ``transport`` is owned by the gateway; a single worker thread performs
+    all bus transactions in priority order (writes before reads).  Unit ID
+    0 and 255 address ``default_unit``.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        ttl: float = DEFAULT_TTL,
+        default_unit: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.transport = transport
+        self.default_unit = default_unit
+        self.stats = GatewayStats()
+        self._stats_lock = threading.Lock()
+        self._cache = _WordCache(ttl, clock)
+        self._views: Dict[int, Transport] = {}
+        self._inflight: Dict[Tuple[int, int, int], Future[List[int]]] = {}
+        self._lock = threading.Lock()
+        self._jobs: "queue.PriorityQueue[Tuple[int, int, Any]]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._work, name="vsensor-gateway-bus", daemon=True)
+        self._worker.start()
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+
+    def _count(self, name: str) -> None:
+        """Increment a :class:`GatewayStats` counter from any thread."""
+        with self._stats_lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    # Bus access ---------------------------------------------------------
+
+    def _view(self, unit: int) -> Transport:
+        view = self._views.get(unit)
+        if view is None:
+            view = self._views[unit] = self.transport.for_slave(unit)
+        return view
+
+    def _submit(self, priority: int, func: Callable[[], Any]) -> "Future[Any]":
+        future: Future[Any] = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise TransportError("gateway closed")
+            self._jobs.put((priority, next(self._seq), (func, future)))
+        return future
+
+    def _work(self) -> None:
+        while True:
+            _, _, job = self._jobs.get()
+            if job is None:
+                return
+            func, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+    def read(self, unit: int, address: int, count: int) -> List[int]:
+        """Return ``count`` words at 0-based ``address`` of ``unit``."""
+        words = self._cache.get(unit, address, count)
+        if words is not None:
+            self._count("cache_hits")
+            return words
+        key = (unit, address, count)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._count("coalesced")
+            else:
+                future = self._submit(READ, lambda: self._bus_read(unit, address, count))
+                self._inflight[key] = future
+                future.add_done_callback(lambda f: self._done(key, f))
+        return future.result()
+
+    def _done(self, key: Tuple[int, int, int], future: "Future[List[int]]") -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _bus_read(self, unit: int, address: int, count: int) -> List[int]:
+        # A job queued behind an identical one may be answered from the cache.
+        words = self._cache.get(unit, address, count)
+        if words is not None:
+            return words
+        version = self._cache.version(unit)
+        self._count("bus_reads")
+        words = self._view(unit).read_holding_registers(address, count)
+        self._cache.put(unit, address, words, version)
+        return words
+
+    def write(self, unit: int, address: int, values: List[int], single: bool = False) -> None:
+        """Forward a write ahead of all queued reads (FC06 if ``single``)."""
+
+        def job() -> None:
+            self._count("bus_writes")
+            view = self._view(unit)
+            if single:
+                view.write_register(address, values[0])
+            else:
+                view.write_registers(address, values)
+            self._cache.written(unit, address, values)
+
+        self._submit(WRITE, job).result()
+
+    # Modbus TCP ---------------------------------------------------------
+
+    def handle(self, unit: int, pdu: bytes) -> bytes:
+        """Answer one request PDU."""
+        self._count("requests")
+        unit = self.default_unit if unit in (0, 255) else unit
+        fc = pdu[0] if pdu else 0
+        try:
+            if fc == framing.READ_HOLDING_REGISTERS:
+                address, count = framing.request_fields(pdu)
+                if not 1 <= count <= 125:
+                    return framing.exception_pdu(fc, framing.ILLEGAL_DATA_VALUE)
+                words = self.read(unit, address, count)
+                return framing.read_response_pdu(fc, words)
+            if fc == framing.WRITE_REGISTER:
+                address, value = framing.request_fields(pdu)
+                self.write(unit, address, [value], single=True)
+                return pdu[:5]
+            if fc == framing.WRITE_REGISTERS:
+                address, values = framing.write_registers_fields(pdu)
+                self.write(unit, address, values)
+                return pdu[:5]
+            return framing.exception_pdu(fc, framing.ILLEGAL_FUNCTION)
+        except ModbusExceptionError as exc:
+            self._count("errors")
+            return framing.exception_pdu(fc, exc.code or framing.SLAVE_DEVICE_FAILURE)
+        except TimeoutError:
+            self._count("errors")
+            return framing.exception_pdu(fc, framing.GATEWAY_TARGET_FAILED)
+        except ValueError:
+            return framing.exception_pdu(fc, framing.ILLEGAL_DATA_VALUE)
+        except TransportError as exc:
+            self._count("errors")
+            logger.debug("request failed: %s", exc)
+            return framing.exception_pdu(fc, framing.GATEWAY_PATH_UNAVAILABLE)
+        except VSensorError as exc:  # e.g. deadline exceeded
+            self._count("errors")
+            logger.debug("request failed: %s", exc)
+            return framing.exception_pdu(fc, framing.GATEWAY_TARGET_FAILED)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 5020) -> socketserver.ThreadingTCPServer:
+        """Start serving Modbus TCP from a background thread."""
+        gateway = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                sock = self.request
+                while True:
+                    header = _recv_exact(sock, framing.MBAP_HEADER.size)
+                    if header is None:
+                        return
+                    tid, protocol, length, unit = framing.MBAP_HEADER.unpack(header)
+                    pdu = _recv_exact(sock, length - 1)
+                    if pdu is None or protocol != 0:
+                        return
+                    sock.sendall(framing.encode_mbap(tid, unit, gateway.handle(unit, pdu)))
+
+        server = _Server((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="vsensor-gateway", daemon=True).start()
+        logger.info("gateway listening on %s:%s", *server.server_address[:2])
+        self._server = server
+        return server
+
+    def close(self) -> None:
+        """Stop serving and close the bus transport.
+
+        The job on the bus completes; queued jobs fail with
+        :class:`~vsensor.errors.TransportError`.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._submit_lock:
+            if not self._closed:
+                self._closed = True
+                self._jobs.put((-1, -1, None))
+        self._worker.join()
+        while not self._jobs.empty():
+            _, _, job = self._jobs.get_nowait()
+            if job is not None and job[1].set_running_or_notify_cancel():
+                job[1].set_exception(TransportError("gateway closed"))
+        self.transport.close()
+
+
+def _recv_exact(sock: Any, n: int) -> Optional[bytes]:
+    data = b""
+    while len(data) < n:
+        try:
+            chunk = sock.recv(n - len(data))
+        except OSError:
+            return None
+        if not chunk:
+            return None
+        data += chunk
+    return data
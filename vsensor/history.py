@@ -0,0 +1,149 @@
+"""Fixed-capacity telemetry history backed by NumPy column arrays.
+
+Requires the optional ``numpy`` dependency (``pip install vsensor[numpy]``).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_NUMPY = False
+
+from .models import Snapshot
+
+CHANNELS: Tuple[str, ...] = ("pressure_pa", "output_percent", "auto_setpoint", "mode")
+
+Columns = Dict[str, Any]
+
+
+class TelemetryHistory:
+    """Preallocated ring buffer with one column per telemetry channel.
+
+    Samples must be appended in non-decreasing timestamp order, which is what
+    :class:`~vsensor.poller.Poller` produces; register the buffer with
+    ``poller.add_listener(history.append)``.  Appending writes into the
+    preallocated arrays and never allocates per sample.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if not HAVE_NUMPY:
+            raise ImportError("TelemetryHistory requires numpy (pip install vsensor[numpy])")
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._cols: Columns = {
+            "timestamp": np.zeros(capacity, dtype=np.float64),
+            "pressure_pa": np.zeros(capacity, dtype=np.float64),
+            "output_percent": np.zeros(capacity, dtype=np.float64),
+            "auto_setpoint": np.zeros(capacity, dtype=np.float64),
+            "mode": np.zeros(capacity, dtype=np.int16),
+        }
+        self._head = 0  # next write position
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, snap: Snapshot) -> None:
+        """Store one snapshot, overwriting the oldest sample when full."""
+        t = snap.telemetry
+        self.append_values(
+            snap.timestamp, t.pressure_pa, t.output_percent, t.auto_setpoint, int(t.mode)
+        )
+
+    def append_values(
+        self,
+        timestamp: float,
+        pressure_pa: float,
+        output_percent: float,
+        auto_setpoint: float,
+        mode: int,
+    ) -> None:
+        cols = self._cols
+        with self._lock:
+            i = self._head
+            cols["timestamp"][i] = timestamp
+            cols["pressure_pa"][i] = pressure_pa
+            cols["output_percent"][i] = output_percent
+            cols["auto_setpoint"][i] = auto_setpoint
+            cols["mode"][i] = mode
+            self._head = (i + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """Index ranges of the stored samples in chronological order."""
+        if self._count < self.capacity:
+            return [(0, self._count)]
+        return [(self._head, self.capacity), (0, self._head)]
+
+    def _select(
+        self, start: Optional[float], end: Optional[float], channels: Tuple[str, ...]
+    ) -> Columns:
+        ts = self._cols["timestamp"]
+        parts: Dict[str, List[Any]] = {name: [] for name in ("timestamp",) + channels}
+        with self._lock:
+            for lo, hi in self._segments():
+                seg = ts[lo:hi]
+                a = lo + (int(np.searchsorted(seg, start, "left")) if start is not None else 0)
+                b = lo + (int(np.searchsorted(seg, end, "right")) if end is not None else hi - lo)
+                if a < b:
+                    for name, chunks in parts.items():
+                        chunks.append(self._cols[name][a:b])
+            return {
+                name: np.concatenate(chunks) if chunks else self._cols[name][:0].copy()
+                for name, chunks in parts.items()
+            }
+
+    def range(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        channels: Tuple[str, ...] = CHANNELS,
+    ) -> Columns:
+        """Return copies of all samples with ``start <= timestamp <= end``."""
+        return self._select(start, end, tuple(channels))
+
+    def downsample(
+        self,
+        buckets: int,
+        channel: str = "pressure_pa",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Columns:
+        """Aggregate ``channel`` into ``buckets`` equal time buckets.
+
+        Returns arrays ``timestamp`` (bucket start), ``min``, ``max``,
+        ``mean`` and ``count``; empty buckets are omitted.
+        """
+        if buckets < 1:
+            raise ValueError("buckets must be positive")
+        if channel not in CHANNELS:
+            raise KeyError(f"unknown channel {channel!r}")
+        sel = self._select(start, end, (channel,))
+        ts = sel["timestamp"]
+        values = sel[channel].astype(np.float64, copy=False)
+        if len(ts) == 0:
+            empty = np.zeros(0)
+            return {"timestamp": empty, "min": empty, "max": empty, "mean": empty, "count": empty}
+        t0 = ts[0] if start is None else start
+        t1 = ts[-1] if end is None else end
+        edges = np.linspace(t0, t1, buckets + 1)[:-1]
+        idx = np.searchsorted(ts, edges, "left")
+        counts = np.diff(np.append(idx, len(ts)))
+        filled = counts > 0
+        starts = idx[filled]
+        return {
+            "timestamp": edges[filled],
+            "min": np.minimum.reduceat(values, starts),
+            "max": np.maximum.reduceat(values, starts),
+            "mean": np.add.reduceat(values, starts) / counts[filled],
+            "count": counts[filled],
+        }
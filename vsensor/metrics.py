@@ -0,0 +1,341 @@
+"""Transaction metrics with a snapshot API and Prometheus text exposition.
+
+Metrics are disabled by default; the active collector is then a
+:class:`NullMetrics` whose ``enabled`` flag lets callers skip all timing
+work.  Call :func:`enable` to start collecting.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+# Outcomes of a bus transaction.
+OK = "ok"
+TIMEOUT = "timeout"
+EXCEPTION = "exception"  # Modbus exception response from the device
+ERROR = "error"
+CIRCUIT_OPEN = "circuit_open"
+DROPPED = "dropped"  # deadline passed while queued for the bus
+
+FC_NAMES = {
+    3: "read_holding_registers",
+    6: "write_register",
+    16: "write_registers",
+    23: "read_write_registers",
+}
+
+
+def rtu_frame_sizes(function_code: int, count: int, outcome: str = OK) -> Tuple[int, int]:
+    """Return ``(request, response)`` RTU frame sizes in bytes.
+
+    Each frame carries slave ID, function code and CRC (4 bytes) around the
+    PDU payload.  Exception responses are 5 bytes; lost replies count 0.
+    """
+    if function_code == 3:
+        request, response = 8, 5 + 2 * count
+    elif function_code == 16:
+        request, response = 9 + 2 * count, 8
+    elif function_code == 23:
+        request, response = 13 + 2 * count, 5 + 2 * count
+    else:
+        request, response = 8, 8
+    if outcome == EXCEPTION:
+        response = 5
+    elif outcome in (TIMEOUT, CIRCUIT_OPEN, DROPPED):
+        response = 0
+    if outcome in (CIRCUIT_OPEN, DROPPED):
+        request = 0
+    return request, response
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed bucket bounds in seconds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out: List[Tuple[str, int]] = []
+        total = 0
+        for bound, n in zip(self.bounds, self.counts):
+            total += n
+            out.append((repr(bound), total))
+        out.append(("+Inf", self.count))
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"buckets": dict(self.cumulative()), "sum": self.sum, "count": self.count}
+
+
+class _TransactionStats:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.outcomes: Dict[str, int] = {}
+        self.attempts = 0
+        self.bytes_tx = 0
+        self.bytes_rx = 0
+        self.latency = Histogram(buckets)
+
+
+class _OperationStats:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.ok = 0
+        self.failed = 0
+        self.latency = Histogram(buckets)
+
+
+class _QueueStats:
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.dropped = 0
+        self.delay = Histogram(buckets)
+
+
+TxKey = Tuple[int, int, int]  # function code, slave, 1-based address
+OpKey = Tuple[str, int]  # client operation, slave
+
+
+class Metrics:
+    """Thread-safe collector of per-transaction and per-operation metrics."""
+
+    enabled = True
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self._tx: Dict[TxKey, _TransactionStats] = {}
+        self._ops: Dict[OpKey, _OperationStats] = {}
+        self._queues: Dict[str, _QueueStats] = {}
+        self._lock = threading.Lock()
+
+    def record_transaction(
+        self,
+        function_code: int,
+        slave: int,
+        address: int,
+        count: int,
+        latency: float,
+        attempts: int = 1,
+        outcome: str = OK,
+    ) -> None:
+        """Record one logical bus transaction (including its retries).
+
+        ``address`` is the 1-based start register.
+        """
+        request, response = rtu_frame_sizes(function_code, count, outcome)
+        with self._lock:
+            stats = self._tx.get((function_code, slave, address))
+            if stats is None:
+                stats = self._tx[(function_code, slave, address)] = _TransactionStats(
+                    self._buckets
+                )
+            stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + 1
+            stats.attempts += attempts
+            stats.bytes_tx += request * attempts
+            stats.bytes_rx += response
+            stats.latency.observe(latency)
+
+    def record_operation(self, op: str, slave: int, latency: float, ok: bool = True) -> None:
+        """Record one client-level operation such as ``read`` or ``write_float``."""
+        with self._lock:
+            stats = self._ops.get((op, slave))
+            if stats is None:
+                stats = self._ops[(op, slave)] = _OperationStats(self._buckets)
+            if ok:
+                stats.ok += 1
+            else:
+                stats.failed += 1
+            stats.latency.observe(latency)
+
+    def record_queue_delay(self, priority: str, delay: float, dropped: bool = False) -> None:
+        """Record the time a request of class ``priority`` waited for the bus."""
+        with self._lock:
+            stats = self._queues.get(priority)
+            if stats is None:
+                stats = self._queues[priority] = _QueueStats(self._buckets)
+            if dropped:
+                stats.dropped += 1
+            else:
+                stats.delay.observe(delay)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tx.clear()
+            self._ops.clear()
+            self._queues.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as plain data."""
+        with self._lock:
+            transactions = [
+                {
+                    "function_code": fc,
+                    "slave": slave,
+                    "address": address,
+                    "outcomes": dict(s.outcomes),
+                    "attempts": s.attempts,
+                    "retries": s.attempts - sum(s.outcomes.values()),
+                    "bytes_tx": s.bytes_tx,
+                    "bytes_rx": s.bytes_rx,
+                    "latency": s.latency.to_dict(),
+                }
+                for (fc, slave, address), s in sorted(self._tx.items())
+            ]
+            operations = [
+                {
+                    "op": op,
+                    "slave": slave,
+                    "ok": s.ok,
+                    "failed": s.failed,
+                    "latency": s.latency.to_dict(),
+                }
+                for (op, slave), s in sorted(self._ops.items())
+            ]
+            queues = [
+                {"priority": priority, "dropped": s.dropped, "delay": s.delay.to_dict()}
+                for priority, s in sorted(self._queues.items())
+            ]
+        return {"transactions": transactions, "operations": operations, "queues": queues}
+
+    def render_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines: List[str] = []
+
+        def header(name: str, kind: str, text: str) -> None:
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(**kw: Any) -> str:
+            return ",".join(f'{k}="{v}"' for k, v in kw.items())
+
+        def histogram(name: str, lbl: str, data: Dict[str, Any]) -> None:
+            for le, n in data["buckets"].items():
+                lines.append(f'{name}_bucket{{{lbl},le="{le}"}} {n}')
+            lines.append(f"{name}_sum{{{lbl}}} {data['sum']}")
+            lines.append(f"{name}_count{{{lbl}}} {data['count']}")
+
+        tx = snap["transactions"]
+        header("vsensor_transactions_total", "counter", "Modbus transactions by outcome.")
+        for t in tx:
+            base = labels(fc=t["function_code"], slave=t["slave"], address=t["address"])
+            for outcome, n in sorted(t["outcomes"].items()):
+                lines.append(f'vsensor_transactions_total{{{base},outcome="{outcome}"}} {n}')
+        header("vsensor_transaction_attempts_total", "counter", "Attempts including retries.")
+        for t in tx:
+            base = labels(fc=t["function_code"], slave=t["slave"], address=t["address"])
+            lines.append(f"vsensor_transaction_attempts_total{{{base}}} {t['attempts']}")
+        header("vsensor_bytes_total", "counter", "RTU bytes on the wire.")
+        for t in tx:
+            base = labels(fc=t["function_code"], slave=t["slave"], address=t["address"])
+            lines.append(f'vsensor_bytes_total{{{base},direction="tx"}} {t["bytes_tx"]}')
+            lines.append(f'vsensor_bytes_total{{{base},direction="rx"}} {t["bytes_rx"]}')
+        header(
+            "vsensor_transaction_latency_seconds", "histogram", "Transaction latency."
+        )
+        for t in tx:
+            base = labels(fc=t["function_code"], slave=t["slave"], address=t["address"])
+            histogram("vsensor_transaction_latency_seconds", base, t["latency"])
+
+        ops = snap["operations"]
+        header("vsensor_operations_total", "counter", "Client operations by outcome.")
+        for o in ops:
+            base = labels(op=o["op"], slave=o["slave"])
+            lines.append(f'vsensor_operations_total{{{base},outcome="ok"}} {o["ok"]}')
+            lines.append(f'vsensor_operations_total{{{base},outcome="failed"}} {o["failed"]}')
+        header("vsensor_operation_latency_seconds", "histogram", "Client operation latency.")
+        for o in ops:
+            histogram(
+                "vsensor_operation_latency_seconds", labels(op=o["op"], slave=o["slave"]), o["latency"]
+            )
+
+        queues = snap["queues"]
+        header("vsensor_queue_delay_seconds", "histogram", "Time requests waited for the bus.")
+        for q in queues:
+            histogram("vsensor_queue_delay_seconds", labels(priority=q["priority"]), q["delay"])
+        header("vsensor_queue_dropped_total", "counter", "Requests dropped at their deadline.")
+        for q in queues:
+            lines.append(
+                f'vsensor_queue_dropped_total{{{labels(priority=q["priority"])}}} {q["dropped"]}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+class NullMetrics(Metrics):
+    """Collector used while metrics are disabled; records nothing."""
+
+    enabled = False
+
+    def record_transaction(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def record_operation(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def record_queue_delay(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+_active: Metrics = NullMetrics()
+
+
+def active() -> Metrics:
+    """Return the process-wide collector."""
+    return _active
+
+
+def enable(metrics: Optional[Metrics] = None) -> Metrics:
+    """Start collecting into ``metrics`` (a new :class:`Metrics` by default)."""
+    global _active
+    _active = metrics or Metrics()
+    return _active
+
+
+def disable() -> None:
+    """Stop collecting metrics."""
+    global _active
+    _active = NullMetrics()
+
+
+def serve_prometheus(
+    port: int = 9464, host: str = "127.0.0.1", metrics: Optional[Metrics] = None
+) -> "ThreadingHTTPServer":
+    """Serve ``/metrics`` in Prometheus format from a background thread.
+
+    Uses the active collector at request time unless ``metrics`` is given.
+    Call ``shutdown()`` on the returned server to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = (metrics or active()).render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="vsensor-metrics", daemon=True).start()
+    return server
@@ -13,7 +13,7 @@ class Mode(IntEnum):
     MANUAL = 1
 
 
-@dataclass
+@dataclass(frozen=True)
 class Telemetry:
     """Basic telemetry values returned by the sensor."""
 
@@ -21,3 +21,13 @@ class Telemetry:
     output_percent: float
     auto_setpoint: float
     mode: Mode
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Timestamped telemetry sample published by a poller."""
+
+    timestamp: float
+    telemetry: Telemetry
+    heartbeat: int
+    seq: int = 0
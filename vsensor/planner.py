@@ -0,0 +1,123 @@
+"""Coalesce register reads and writes into a minimal number of block requests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Modbus limits a single "read holding registers" request to 125 words.
+MAX_READ_COUNT = 125
+# ... and a single "write multiple registers" request to 123 words.
+MAX_WRITE_COUNT = 123
+# Number of unused registers that may be read to join two spans into one block.
+DEFAULT_MAX_GAP = 16
+
+
+@dataclass(frozen=True)
+class ReadBlock:
+    """Contiguous range of registers fetched with a single request.
+
+    Addresses are 1-based like the constants in :mod:`vsensor.registers`.
+    """
+
+    address: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        """First register address after this block."""
+        return self.address + self.count
+
+    def contains(self, address: int, width: int = 1) -> bool:
+        """Return ``True`` if ``width`` registers at ``address`` lie in the block."""
+        return self.address <= address and address + width <= self.end
+
+    def slice(self, regs: List[int], address: int, width: int = 1) -> List[int]:
+        """Extract the words of one register span from the block's response."""
+        offset = address - self.address
+        return regs[offset : offset + width]
+
+
+def plan_reads(
+    spans: Iterable[Tuple[int, int]],
+    max_gap: int = DEFAULT_MAX_GAP,
+    max_count: int = MAX_READ_COUNT,
+) -> List[ReadBlock]:
+    """Merge ``(address, width)`` spans into the fewest block reads.
+
+    Spans closer than ``max_gap`` unused registers are joined as long as the
+    resulting block does not exceed ``max_count`` registers.  Overlapping and
+    duplicate spans are allowed.
+    """
+    if max_count < 1 or max_count > MAX_READ_COUNT:
+        raise ValueError(f"max_count must be between 1 and {MAX_READ_COUNT}")
+    if max_gap < 0:
+        raise ValueError("max_gap must not be negative")
+
+    blocks: List[ReadBlock] = []
+    current: ReadBlock | None = None
+    for address, width in sorted((int(a), int(w)) for a, w in spans):
+        if width < 1 or width > max_count:
+            raise ValueError(f"invalid register width {width} at {address}")
+        if current is not None:
+            end = max(current.end, address + width)
+            if address - current.end <= max_gap and end - current.address <= max_count:
+                current = ReadBlock(current.address, end - current.address)
+                continue
+            blocks.append(current)
+        current = ReadBlock(address, width)
+    if current is not None:
+        blocks.append(current)
+    return blocks
+
+
+@dataclass(frozen=True)
+class WriteBlock:
+    """Contiguous registers written with a single request (1-based address)."""
+
+    address: int
+    values: Tuple[int, ...]
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    @property
+    def end(self) -> int:
+        """First register address after this block."""
+        return self.address + self.count
+
+    def contains(self, address: int, width: int = 1) -> bool:
+        """Return ``True`` if ``width`` registers at ``address`` lie in the block."""
+        return self.address <= address and address + width <= self.end
+
+
+def plan_writes(
+    writes: Iterable[Tuple[int, Sequence[int]]], max_count: int = MAX_WRITE_COUNT
+) -> List[WriteBlock]:
+    """Merge ``(address, words)`` writes into the fewest block writes.
+
+    Only directly adjacent writes are joined, since a gap would overwrite
+    registers nobody asked to change.  Later writes to the same register
+    win.
+    """
+    if max_count < 1 or max_count > MAX_WRITE_COUNT:
+        raise ValueError(f"max_count must be between 1 and {MAX_WRITE_COUNT}")
+    words: Dict[int, int] = {}
+    for address, values in writes:
+        for i, value in enumerate(values):
+            words[int(address) + i] = int(value)
+
+    blocks: List[WriteBlock] = []
+    start = 0
+    run: List[int] = []
+    for address in sorted(words):
+        if run and (address != start + len(run) or len(run) >= max_count):
+            blocks.append(WriteBlock(start, tuple(run)))
+            run = []
+        if not run:
+            start = address
+        run.append(words[address])
+    if run:
+        blocks.append(WriteBlock(start, tuple(run)))
+    return blocks
@@ -0,0 +1,129 @@
+"""Background polling with an in-memory latest-snapshot store."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Union
+
+from .adaptive import AdaptiveRate, probe_heartbeat
+from .client import VSensorClient
+from .errors import VSensorError
+from .models import Snapshot
+from .scheduler import Priority, priority
+from .subscription import Callback, Deadband, Subscription
+
+logger = logging.getLogger(__name__)
+
+# Return values are ignored, so a Subscription is a valid listener.
+Listener = Callable[[Snapshot], object]
+
+
+class Poller:
+    """Poll a client on a background thread and keep the latest snapshot.
+
+    Bus load depends only on ``interval``: :meth:`latest` returns the last
+    published :class:`~vsensor.models.Snapshot` without touching the bus, so
+    any number of readers can share one poller.
+
+    With an :class:`~vsensor.adaptive.AdaptiveRate` the interval follows the
+    signal dynamics instead, and while HEARTBEAT is stuck only HEARTBEAT is
+    read.
+    """
+
+    def __init__(
+        self,
+        client: VSensorClient,
+        interval: Optional[float] = None,
+        adaptive: Optional[AdaptiveRate] = None,
+    ) -> None:
+        self.client = client
+        self.interval = client.cfg.poll_interval if interval is None else interval
+        self.adaptive = adaptive
+        self._latest: Optional[Snapshot] = None
+        self._listeners: List[Listener] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seq = 0
+        self.errors = 0
+        self.last_error = ""
+
+    def latest(self) -> Optional[Snapshot]:
+        """Return the most recent snapshot or ``None`` before the first poll."""
+        return self._latest
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call ``listener`` with every new snapshot from the poll thread."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        self._listeners.remove(listener)
+
+    def subscribe(
+        self,
+        channels: Union[str, Iterable[str]],
+        callback: Callback,
+        deadband: Deadband = 0.0,
+        min_interval: float = 0.0,
+        max_interval: Optional[float] = None,
+    ) -> Subscription:
+        """Call ``callback`` when ``channels`` change, see :class:`Subscription`."""
+        sub = Subscription(
+            channels, callback, deadband, min_interval, max_interval, self.remove_listener
+        )
+        self.add_listener(sub)
+        return sub
+
+    def poll_once(self) -> Optional[Snapshot]:
+        """Read the device once and publish the result."""
+        adaptive = self.adaptive
+        # A poll still queued for the bus after one interval is dropped.
+        try:
+            with priority(Priority.BACKGROUND, self.interval or None):
+                if adaptive is not None and adaptive.stalled:
+                    if probe_heartbeat(self.client, adaptive):
+                        self.interval = adaptive.interval
+                        return None
+                snap = self.client.read_snapshot(self._seq + 1)
+        except (VSensorError, ValueError) as exc:
+            self.errors += 1
+            self.last_error = str(exc)
+            logger.debug("poll failed: %s", exc)
+            return None
+        self._seq += 1
+        if adaptive is not None:
+            self.interval = adaptive.update(snap)
+        self._latest = snap
+        self.last_error = ""
+        for listener in list(self._listeners):
+            try:
+                listener(snap)
+            except Exception:  # pragma: no cover - listener bugs must not stop polling
+                logger.exception("snapshot listener failed")
+        return snap
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll_once()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the poll thread if it is not already running."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vsensor-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the poll thread and wait for it to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -1,5 +1,11 @@
 """Register definitions using 1-based Modbus addresses."""
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Tuple
+
 # 1-basierte Registeradressen gemäß Gerätedoku
 
 
@@ -23,3 +29,78 @@ OUTPUT_PERCENT = 167 # 2 regs (float)
 # Alarme
 LOW_ALARM = 216 # 2 regs (float)
 HIGH_ALARM = 218 # 2 regs (float)
+
+
+class DataType(str, Enum):
+    """Encoding of a register value on the wire."""
+
+    FLOAT32 = "float32"
+    U16 = "u16"
+    S16 = "s16"
+
+
+class Access(str, Enum):
+    """Whether a register may be written."""
+
+    RO = "ro"
+    RW = "rw"
+
+
+class Volatility(str, Enum):
+    """How often a register value is expected to change."""
+
+    LIVE = "live"  # process values, changes on every sample
+    CONFIG = "config"  # settings, normally only changed by writes
+    STATIC = "static"  # fixed for the lifetime of the device
+
+
+@dataclass(frozen=True)
+class Register:
+    """Declarative description of a single device register."""
+
+    name: str
+    address: int
+    type: DataType
+    access: Access = Access.RO
+    volatility: Volatility = Volatility.LIVE
+    scale: float = 1.0
+
+    @property
+    def width(self) -> int:
+        """Number of 16 bit words occupied by the register."""
+        return 2 if self.type is DataType.FLOAT32 else 1
+
+    @property
+    def writable(self) -> bool:
+        return self.access is Access.RW
+
+
+REGISTERS: Tuple[Register, ...] = (
+    Register("HEARTBEAT", HEARTBEAT, DataType.U16),
+    Register("DISPLAY_VALUE", DISPLAY_VALUE, DataType.FLOAT32),
+    Register("PRESSURE_PA", PRESSURE_PA, DataType.FLOAT32),
+    Register("AUTO_SETPOINT", AUTO_SETPOINT, DataType.FLOAT32, Access.RW, Volatility.CONFIG),
+    Register("PID_OUTPUT_RAW", PID_OUTPUT_RAW, DataType.S16),
+    Register("MODE", MODE, DataType.U16, Access.RW, Volatility.CONFIG),
+    Register(
+        "HAND_SETPOINT_PERCENT",
+        HAND_SETPOINT_PERCENT,
+        DataType.FLOAT32,
+        Access.RW,
+        Volatility.CONFIG,
+    ),
+    Register("OUTPUT_PERCENT", OUTPUT_PERCENT, DataType.FLOAT32),
+    Register("LOW_ALARM", LOW_ALARM, DataType.FLOAT32, Access.RW, Volatility.CONFIG),
+    Register("HIGH_ALARM", HIGH_ALARM, DataType.FLOAT32, Access.RW, Volatility.CONFIG),
+)
+
+BY_NAME: Dict[str, Register] = {r.name: r for r in REGISTERS}
+BY_ADDRESS: Dict[int, Register] = {r.address: r for r in REGISTERS}
+
+
+def lookup(name: str) -> Register:
+    """Return the register called ``name`` (case-insensitive)."""
+    try:
+        return BY_NAME[name.upper()]
+    except KeyError:
+        raise KeyError(f"unknown register {name!r}") from None
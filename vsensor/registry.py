@@ -0,0 +1,140 @@
+"""Process-wide registry of shared, reference-counted bus transports."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import Config
+from .errors import TransportError
+from .transport import Transport, create_transport
+
+logger = logging.getLogger(__name__)
+
+PortKey = Tuple[object, ...]
+
+
+def port_key(cfg: Config) -> PortKey:
+    """Return the key identifying the physical line described by ``cfg``."""
+    if cfg.transport.lower() == "daemon":
+        return ("daemon", cfg.daemon_path())
+    if cfg.transport.lower() != "rtu":
+        return (cfg.transport.lower(), cfg.host, cfg.tcp_port)
+    return (cfg.port, cfg.baudrate, cfg.parity, cfg.stopbits, cfg.bytesize)
+
+
+def device_key(cfg: Config) -> PortKey:
+    """Return the key identifying the device ``cfg.slave_id`` on its line."""
+    return port_key(cfg) + (cfg.slave_id,)
+
+
+@dataclass
+class _Entry:
+    transport: Transport
+    refs: int = 0
+
+
+class SharedTransport(Transport):
+    """Reference to a shared transport, bound to one slave ID.
+
+    Closing the handle drops the reference; the port itself is closed once
+    the last handle is released.
+    """
+
+    def __init__(self, registry: "TransportRegistry", key: PortKey, view: Transport) -> None:
+        self._registry = registry
+        self._key = key
+        self._view: Optional[Transport] = view
+
+    def _target(self) -> Transport:
+        if self._view is None:
+            raise TransportError("transport released")
+        return self._view
+
+    def read_holding_registers(self, address: int, count: int) -> List[int]:
+        return self._target().read_holding_registers(address, count)
+
+    def write_register(self, address: int, value: int) -> None:
+        self._target().write_register(address, value)
+
+    def write_registers(self, address: int, values: Iterable[int]) -> None:
+        self._target().write_registers(address, values)
+
+    def read_write_registers(
+        self, read_address: int, read_count: int, write_address: int, values: Iterable[int]
+    ) -> List[int]:
+        return self._target().read_write_registers(
+            read_address, read_count, write_address, values
+        )
+
+    def for_slave(
+        self, slave_id: int, timeout: Optional[float] = None, retries: Optional[int] = None
+    ) -> Transport:
+        return self._target().for_slave(slave_id, timeout=timeout, retries=retries)
+
+    @property
+    def pipeline_depth(self) -> int:  # type: ignore[override]
+        return self._view.pipeline_depth if self._view is not None else 1
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view = None
+            self._registry._release(self._key)
+
+
+class TransportRegistry:
+    """Open each line once and share it between any number of clients."""
+
+    def __init__(self, factory: Callable[[Config], Transport] = create_transport) -> None:
+        self._factory = factory
+        self._entries: Dict[PortKey, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, cfg: Config) -> SharedTransport:
+        """Return a handle on the line of ``cfg`` addressing ``cfg.slave_id``."""
+        key = port_key(cfg)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                logger.debug("opening shared transport %s", key)
+                entry = _Entry(self._factory(cfg))
+                self._entries[key] = entry
+            entry.refs += 1
+            view = entry.transport.for_slave(cfg.slave_id, timeout=cfg.timeout)
+        return SharedTransport(self, key, view)
+
+    def _release(self, key: PortKey) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[key]
+        logger.debug("closing shared transport %s", key)
+        entry.transport.close()
+
+    def refcount(self, cfg: Config) -> int:
+        """Number of open handles on the line of ``cfg``."""
+        with self._lock:
+            entry = self._entries.get(port_key(cfg))
+            return entry.refs if entry else 0
+
+    def close_all(self) -> None:
+        """Close every open line regardless of outstanding handles."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.transport.close()
+
+
+registry = TransportRegistry()
+
+
+def acquire(cfg: Config) -> SharedTransport:
+    """Acquire a shared transport from the process-wide :data:`registry`."""
+    return registry.acquire(cfg)
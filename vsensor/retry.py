@@ -0,0 +1,248 @@
+"""Retry policies with backoff and deadlines, and per-device circuit breakers."""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+from .errors import CircuitOpenError, ModbusExceptionError, TimeoutError, TransportError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Exception responses that will not change on retry: illegal function,
+# data address and data value.
+PERMANENT_EXCEPTION_CODES = frozenset({1, 2, 3})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how patiently a logical operation is retried.
+
+    The n-th retry waits ``backoff * 2 ** (n - 1)`` seconds, capped at
+    ``backoff_max`` and randomised by ``±jitter`` (a fraction).  ``deadline``
+    bounds the whole operation including all attempts and waits: no attempt
+    starts after it, and :meth:`run_timed` hands each attempt the time left
+    to use as its timeout.
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.05
+    backoff_max: float = 1.0
+    jitter: float = 0.2
+    deadline: Optional[float] = None
+    retry_on: Tuple[Type[BaseException], ...] = (TransportError,)
+
+    def delay(self, retry: int) -> float:
+        """Return the wait before retry number ``retry`` (1-based)."""
+        base = min(self.backoff * 2 ** (retry - 1), self.backoff_max)
+        if self.jitter:
+            base *= 1 + random.uniform(-self.jitter, self.jitter)
+        return float(max(0.0, base))
+
+    def _retryable(self, exc: BaseException) -> bool:
+        if isinstance(exc, ModbusExceptionError) and exc.code in PERMANENT_EXCEPTION_CODES:
+            return False
+        return isinstance(exc, self.retry_on) and not isinstance(exc, CircuitOpenError)
+
+    def _budget(
+        self, started: float, now: float, exc: Optional[BaseException]
+    ) -> Optional[float]:
+        """Return the deadline budget left for an attempt, ``None`` without one."""
+        if self.deadline is None:
+            return None
+        left = self.deadline - (now - started)
+        if left <= 0:
+            raise TimeoutError(f"deadline of {self.deadline}s exceeded") from exc
+        return left
+
+    def _next_wait(self, attempt: int, exc: BaseException, started: float, now: float) -> float:
+        """Return the wait before the next attempt or re-raise ``exc``."""
+        if attempt >= self.max_attempts or not self._retryable(exc):
+            raise exc
+        wait = self.delay(attempt)
+        if self.deadline is not None and now + wait - started >= self.deadline:
+            raise TimeoutError(f"deadline of {self.deadline}s exceeded") from exc
+        logger.debug("retrying in %.3fs (attempt %s/%s): %s", wait, attempt, self.max_attempts, exc)
+        return wait
+
+    def run(
+        self,
+        func: Callable[[], T],
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> T:
+        """Call ``func`` until it succeeds or the policy gives up."""
+        return self.run_timed(lambda budget: func(), sleep, clock)
+
+    def run_timed(
+        self,
+        func: Callable[[Optional[float]], T],
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> T:
+        """Like :meth:`run`, passing each attempt the deadline budget left.
+
+        ``func`` gets ``None`` without a deadline and should not wait longer
+        than the budget otherwise.
+        """
+        started = clock()
+        attempt = 0
+        last: Optional[BaseException] = None
+        while True:
+            attempt += 1
+            budget = self._budget(started, clock(), last)
+            try:
+                return func(budget)
+            except Exception as exc:
+                last = exc
+                sleep(self._next_wait(attempt, exc, started, clock()))
+
+    async def run_async(
+        self,
+        func: Callable[[], Awaitable[T]],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> T:
+        """Asyncio variant of :meth:`run`."""
+        import asyncio  # only async callers pay for it
+
+        started = clock()
+        attempt = 0
+        last: Optional[BaseException] = None
+        while True:
+            attempt += 1
+            budget = self._budget(started, clock(), last)
+            try:
+                if budget is None:
+                    return await func()
+                try:
+                    return await asyncio.wait_for(func(), budget)
+                except asyncio.TimeoutError as exc:
+                    raise TimeoutError(f"deadline of {self.deadline}s exceeded") from exc
+            except Exception as exc:
+                last = exc
+                await asyncio.sleep(self._next_wait(attempt, exc, started, clock()))
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while a device is known to be down.
+
+    After ``failure_threshold`` consecutive failed operations the breaker
+    opens and calls raise :class:`~vsensor.errors.CircuitOpenError` without
+    touching the bus.  If a ``probe`` callable is given it is run on a
+    background thread every ``reset_timeout`` seconds until it succeeds;
+    otherwise the first call after ``reset_timeout`` is let through as probe.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        probe: Optional[Callable[[], object]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "",
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe = probe
+        self.name = name
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise :class:`CircuitOpenError` if the call must not reach the bus."""
+        with self._lock:
+            if self._state is BreakerState.CLOSED:
+                return
+            if (
+                self._state is BreakerState.OPEN
+                and self.probe is None
+                and self._clock() - self._opened_at >= self.reset_timeout
+            ):
+                self._state = BreakerState.HALF_OPEN
+                return
+            raise CircuitOpenError(f"circuit open for {self.name or 'device'}")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = BreakerState.CLOSED
+            self._cancel_probe()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state is BreakerState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state is not BreakerState.OPEN:
+                    logger.info("circuit for %s opened", self.name or "device")
+                self._state = BreakerState.OPEN
+                self._opened_at = self._clock()
+                self._schedule_probe()
+
+    def call(self, func: Callable[[], T]) -> T:
+        """Run ``func`` guarded by the breaker."""
+        self.before_call()
+        try:
+            result = func()
+        except ModbusExceptionError:
+            self.record_success()  # the device answered
+            raise
+        except TransportError:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def _schedule_probe(self) -> None:
+        if self.probe is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.reset_timeout, self._run_probe)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_probe(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _run_probe(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._state is not BreakerState.OPEN or self.probe is None:
+                return
+            probe = self.probe
+        try:
+            probe()
+        except Exception as exc:
+            logger.debug("probe for %s failed: %s", self.name or "device", exc)
+            with self._lock:
+                self._opened_at = self._clock()
+                self._schedule_probe()
+            return
+        logger.info("circuit for %s closed after probe", self.name or "device")
+        self.record_success()
+
+    def close(self) -> None:
+        """Stop background probing."""
+        with self._lock:
+            self._cancel_probe()
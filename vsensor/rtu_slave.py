@@ -0,0 +1,340 @@
+"""Modbus RTU slave simulator on Linux pseudo-terminals.
+
+:class:`RTUSlaveSimulator` opens a pty pair and answers RTU requests on it
+for one or more :class:`VirtualSensor` devices, so :class:`RTUTransport`
+can be exercised end-to-end (pyserial, pymodbus framer, timeouts, retries)
+without hardware.  Point ``Config.port`` at :attr:`RTUSlaveSimulator.port`.
+
+Each sensor implements the V-Sensor register map with live process values,
+a running HEARTBEAT and injectable :class:`Faults`.  Run
+``python -m vsensor.rtu_slave --sensors 8`` to serve virtual sensors for
+manual or load tests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import os
+import random
+import select
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from . import framing
+from . import registers as REG
+from .codec import RegisterCodec, Value
+from .models import Mode
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_PERIOD = 0.1  # seconds per HEARTBEAT increment
+
+
+@dataclass
+class Faults:
+    """Faults injected into the responses of one virtual sensor.
+
+    Rates are probabilities per request.  The fields may be changed while the
+    simulator is running.
+    """
+
+    delay: float = 0.0  # extra turnaround in seconds
+    drop_rate: float = 0.0  # request is not answered
+    crc_error_rate: float = 0.0  # response carries a wrong CRC
+    exception_rate: float = 0.0  # response is an exception with exception_code
+    exception_code: int = framing.SLAVE_DEVICE_FAILURE
+    freeze_heartbeat: bool = False
+
+
+@dataclass
+class SlaveStats:
+    requests: int = 0
+    responses: int = 0
+    dropped: int = 0
+    crc_errors: int = 0  # corrupted requests received
+    exceptions: int = 0
+
+
+class VirtualSensor:
+    """Register map of one simulated V-Sensor with live process values.
+
+    The pressure follows the output with a first-order lag plus ripple and
+    noise; in AUTO mode an integral controller drives the output towards
+    AUTO_SETPOINT, in MANUAL mode the output is HAND_SETPOINT_PERCENT.
+    """
+
+    SIZE = 256  # valid 0-based register addresses are 0..SIZE-1
+
+    def __init__(
+        self,
+        slave_id: int = 1,
+        float_format: int = 1,
+        faults: Optional[Faults] = None,
+        functions: Iterable[int] = (3, 6, 16, 23),
+        seed: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.slave_id = slave_id
+        self.faults = faults or Faults()
+        self.functions: FrozenSet[int] = frozenset(functions)
+        self.codec = RegisterCodec(float_format)
+        self.words: List[int] = [0] * self.SIZE
+        self.rng = random.Random(seed)
+        self._clock = clock
+        self._started = self._last = clock()
+        self._beat = 0.0
+        self._pressure = 0.0
+        self._output = 0.0
+        self._lock = threading.Lock()
+        for name, value in (
+            ("AUTO_SETPOINT", 100.0),
+            ("MODE", int(Mode.AUTO)),
+            ("HAND_SETPOINT_PERCENT", 50.0),
+            ("LOW_ALARM", 0.0),
+            ("HIGH_ALARM", 500.0),
+        ):
+            self.set(name, value)
+        self._publish()
+
+    def get(self, name: str) -> Value:
+        reg = REG.lookup(name)
+        start = reg.address - 1
+        return self.codec.decode(reg, self.words[start : start + reg.width])
+
+    def set(self, name: str, value: Value) -> None:
+        reg = REG.lookup(name)
+        start = reg.address - 1
+        self.words[start : start + reg.width] = self.codec.encode(reg, value)
+
+    def update(self, now: Optional[float] = None) -> None:
+        """Advance the process simulation to ``now``."""
+        now = self._clock() if now is None else now
+        dt = max(0.0, now - self._last)
+        self._last = now
+        if not self.faults.freeze_heartbeat:
+            self._beat += dt / HEARTBEAT_PERIOD
+        if self.get("MODE") == Mode.MANUAL:
+            self._output = float(self.get("HAND_SETPOINT_PERCENT"))
+        else:
+            error = float(self.get("AUTO_SETPOINT")) - self._pressure
+            self._output = min(100.0, max(0.0, self._output + 0.5 * error * dt))
+        target = self._output * 5.0  # Pa per percent
+        self._pressure += (target - self._pressure) * min(1.0, dt / 0.5)
+        self._publish(now)
+
+    def _publish(self, now: Optional[float] = None) -> None:
+        t = (self._started if now is None else now) - self._started
+        pressure = self._pressure + 0.5 * math.sin(t * 2 * math.pi / 5.0)
+        pressure += self.rng.gauss(0.0, 0.05)
+        self.set("PRESSURE_PA", pressure)
+        self.set("DISPLAY_VALUE", pressure)
+        self.set("OUTPUT_PERCENT", self._output)
+        self.set("PID_OUTPUT_RAW", round(self._output * 100))
+        self.words[REG.HEARTBEAT - 1] = int(self._beat) & 0xFFFF
+
+    def _writable(self, start: int, count: int) -> bool:
+        """Return whether the 0-based range only covers RW registers."""
+        for address in range(start + 1, start + count + 1):
+            reg = REG.BY_ADDRESS.get(address) or REG.BY_ADDRESS.get(address - 1)
+            if reg is None or not reg.writable or address >= reg.address + reg.width:
+                return False
+        return True
+
+    def _read(self, start: int, count: int) -> Optional[List[int]]:
+        if not 1 <= count <= 125 or start + count > self.SIZE:
+            return None
+        return self.words[start : start + count]
+
+    def handle(self, pdu: bytes) -> bytes:
+        """Process a request PDU and return the response PDU."""
+        fc = pdu[0]
+        if fc not in self.functions:
+            return framing.exception_pdu(fc, framing.ILLEGAL_FUNCTION)
+        with self._lock:
+            self.update()
+            try:
+                return self._dispatch(fc, pdu)
+            except (struct.error, IndexError):
+                return framing.exception_pdu(fc, framing.ILLEGAL_DATA_VALUE)
+
+    def _dispatch(self, fc: int, pdu: bytes) -> bytes:
+        illegal = framing.exception_pdu(fc, framing.ILLEGAL_DATA_ADDRESS)
+        if fc == framing.READ_HOLDING_REGISTERS:
+            start, count = struct.unpack(">HH", pdu[1:5])
+            words = self._read(start, count)
+            if words is None:
+                return illegal
+            return struct.pack(f">BB{count}H", fc, 2 * count, *words)
+        if fc == framing.WRITE_REGISTER:
+            start, value = struct.unpack(">HH", pdu[1:5])
+            if not self._writable(start, 1):
+                return illegal
+            self.words[start] = value
+            return pdu[:5]
+        if fc == framing.WRITE_REGISTERS:
+            start, count, nbytes = struct.unpack(">HHB", pdu[1:6])
+            values = struct.unpack(f">{count}H", pdu[6 : 6 + nbytes])
+            if not self._writable(start, count):
+                return illegal
+            self.words[start : start + count] = values
+            return pdu[:5]
+        # READ_WRITE_REGISTERS: the write is performed before the read.
+        rstart, rcount, wstart, wcount, nbytes = struct.unpack(">HHHHB", pdu[1:10])
+        values = struct.unpack(f">{wcount}H", pdu[10 : 10 + nbytes])
+        if not self._writable(wstart, wcount) or self._read(rstart, rcount) is None:
+            return illegal
+        self.words[wstart : wstart + wcount] = values
+        words = self.words[rstart : rstart + rcount]
+        return struct.pack(f">BB{rcount}H", fc, 2 * rcount, *words)
+
+
+class RTUSlaveSimulator:
+    """Serve :class:`VirtualSensor` devices on a pseudo-terminal.
+
+    All sensors share the line like devices on an RS-485 bus; requests to
+    unknown slave IDs and corrupted frames are ignored.  ``turnaround`` is
+    the reply delay of every device.
+    """
+
+    def __init__(
+        self, sensors: Optional[Iterable[VirtualSensor]] = None, turnaround: float = 0.0
+    ) -> None:
+        self.sensors: Dict[int, VirtualSensor] = {
+            s.slave_id: s for s in (sensors if sensors is not None else [VirtualSensor()])
+        }
+        self.turnaround = turnaround
+        self.stats = SlaveStats()
+        self._master = -1
+        self._slave = -1
+        self.port = ""
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sensor(self, slave_id: int) -> VirtualSensor:
+        return self.sensors[slave_id]
+
+    def start(self) -> "RTUSlaveSimulator":
+        import tty  # needs termios, which Windows lacks
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vsensor-rtu-slave", daemon=True)
+        self._thread.start()
+        logger.info("RTU slave simulator on %s (slaves %s)", self.port, sorted(self.sensors))
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd >= 0:
+                os.close(fd)
+        self._master = self._slave = -1
+
+    def __enter__(self) -> "RTUSlaveSimulator":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        buffer = b""
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._master], [], [], 0.05)
+            if not ready:
+                if buffer:
+                    # Silent interval: whatever is left is an incomplete frame.
+                    self.stats.crc_errors += 1
+                    buffer = b""
+                continue
+            try:
+                buffer += os.read(self._master, 1024)
+            except OSError:  # pragma: no cover - pty closed underneath us
+                return
+            while buffer:
+                length = framing.request_length(buffer)
+                if length is None or len(buffer) < length:
+                    break
+                frame, buffer = (buffer, b"") if length == 0 else (buffer[:length], buffer[length:])
+                if not framing.check_frame(frame):
+                    self.stats.crc_errors += 1
+                    buffer = b""
+                    break
+                self._serve(frame)
+
+    def _serve(self, frame: bytes) -> None:
+        slave, pdu = framing.decode_frame(frame)
+        sensor = self.sensors.get(slave)
+        if sensor is None and slave != 0:
+            return
+        self.stats.requests += 1
+        targets = [sensor] if sensor is not None else list(self.sensors.values())
+        for target in targets:
+            response = target.handle(pdu)
+        if slave == 0 or sensor is None:
+            return  # broadcast
+        faults = sensor.faults
+        rng = sensor.rng
+        if faults.exception_rate and rng.random() < faults.exception_rate:
+            response = framing.exception_pdu(pdu[0], faults.exception_code)
+        if faults.drop_rate and rng.random() < faults.drop_rate:
+            self.stats.dropped += 1
+            return
+        out = framing.encode_frame(slave, response)
+        if faults.crc_error_rate and rng.random() < faults.crc_error_rate:
+            out = out[:-1] + bytes((out[-1] ^ 0xFF,))
+        if response[0] & 0x80:
+            self.stats.exceptions += 1
+        delay = self.turnaround + faults.delay
+        if delay:
+            time.sleep(delay)
+        os.write(self._master, out)
+        self.stats.responses += 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Serve virtual sensors until interrupted."""
+    parser = argparse.ArgumentParser(description="Modbus RTU V-Sensor simulator on a pty")
+    parser.add_argument("--sensors", type=int, default=1, help="number of slave IDs (1..n)")
+    parser.add_argument("--float-format", type=int, choices=range(4), default=1)
+    parser.add_argument("--turnaround", type=float, default=0.0, help="reply delay [s]")
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--crc-error-rate", type=float, default=0.0)
+    parser.add_argument("--exception-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    sensors = [
+        VirtualSensor(
+            slave_id,
+            args.float_format,
+            Faults(
+                drop_rate=args.drop_rate,
+                crc_error_rate=args.crc_error_rate,
+                exception_rate=args.exception_rate,
+            ),
+        )
+        for slave_id in range(1, args.sensors + 1)
+    ]
+    with RTUSlaveSimulator(sensors, args.turnaround) as sim:
+        print(sim.port, flush=True)
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,251 @@
+"""Find devices and serial settings on RS-485 lines.
+
+Every slave ID is probed with a one-register HEARTBEAT read, a timeout
+just above the wire time of the exchange and no retries, so a silent ID
+costs tens of milliseconds instead of ``Config.timeout`` times the retry
+count.  Adapters are scanned in parallel; on one line the IDs are probed in
+turn.  The float format of each device found is inferred from one block
+read of its float registers.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from . import registers as REG
+from .codec import FLOAT_FORMATS, RegisterCodec
+from .config import Config, DeviceProfile
+from .errors import ModbusExceptionError, TransportError
+from .simulation import WireTiming
+from .transport import RTUTransport, Transport
+
+logger = logging.getLogger(__name__)
+
+BAUDRATES = (9600, 19200, 38400, 115200, 4800)
+PARITIES = ("N", "E", "O")
+SLAVE_IDS = range(1, 248)
+PROBE_MARGIN = 0.05  # seconds on top of the wire time: turnaround and USB latency
+
+# Block holding DISPLAY_VALUE .. OUTPUT_PERCENT, all floats but MODE/PID_OUTPUT_RAW.
+FLOAT_BLOCK = (REG.DISPLAY_VALUE, REG.OUTPUT_PERCENT + 2 - REG.DISPLAY_VALUE)
+
+# Plausible value ranges of the float registers.
+_RANGES: Dict[str, tuple[float, float]] = {
+    "DISPLAY_VALUE": (-1e5, 1e5),
+    "PRESSURE_PA": (-1e5, 1e5),
+    "AUTO_SETPOINT": (-1e5, 1e5),
+    "HAND_SETPOINT_PERCENT": (-1.0, 101.0),
+    "OUTPUT_PERCENT": (-1.0, 101.0),
+}
+
+
+@dataclass(frozen=True)
+class SerialSettings:
+    """One candidate line setting."""
+
+    baudrate: int = 9600
+    parity: str = "N"
+    stopbits: int = 1
+    bytesize: int = 8
+
+    def __str__(self) -> str:
+        return f"{self.baudrate} {self.bytesize}{self.parity}{self.stopbits}"
+
+    def timing(self, margin: float = PROBE_MARGIN) -> WireTiming:
+        return WireTiming(self.baudrate, self.bytesize, self.parity, self.stopbits, margin)
+
+
+def candidate_settings(
+    baudrates: Iterable[int] = BAUDRATES,
+    parities: Iterable[str] = PARITIES,
+    stopbits: Iterable[int] = (1,),
+) -> List[SerialSettings]:
+    """Return every combination, in the order given (most likely first)."""
+    return [SerialSettings(b, p, s) for b in baudrates for p in parities for s in stopbits]
+
+
+@dataclass(frozen=True)
+class Device:
+    """A device that answered a scan."""
+
+    port: str
+    settings: SerialSettings
+    slave_id: int
+    float_format: Optional[int] = None
+
+    def config(self, base: Optional[Config] = None) -> Config:
+        """Return ``base`` (default :class:`Config`) updated for this device."""
+        cfg = replace(
+            base or Config(),
+            port=self.port,
+            baudrate=self.settings.baudrate,
+            parity=self.settings.parity,
+            stopbits=self.settings.stopbits,
+            bytesize=self.settings.bytesize,
+            slave_id=self.slave_id,
+        )
+        if self.float_format is not None:
+            cfg.float_format = self.float_format
+        return cfg
+
+    def profile(self, base: Optional[Config] = None) -> DeviceProfile:
+        """Return the settings as a profile for :class:`~vsensor.config.ProfileStore`."""
+        return DeviceProfile.from_config(
+            self.config(base), float_format=self.float_format, verified=time.time()
+        )
+
+    def env(self) -> str:
+        """Return the settings as ``VSENSOR_*`` environment assignments."""
+        s = self.settings
+        parts = [
+            f"VSENSOR_PORT={self.port}",
+            f"VSENSOR_BAUD={s.baudrate}",
+            f"VSENSOR_PARITY={s.parity}",
+            f"VSENSOR_STOPBITS={s.stopbits}",
+            f"VSENSOR_BYTESIZE={s.bytesize}",
+            f"VSENSOR_SLAVE_ID={self.slave_id}",
+        ]
+        if self.float_format is not None:
+            parts.append(f"VSENSOR_FLOAT_FORMAT={self.float_format}")
+        return " ".join(parts)
+
+
+def canonical_format(float_format: int) -> int:
+    """Return the lowest float format putting the same words on the wire."""
+    words = RegisterCodec(float_format).pack_float(-1.2345e-6)
+    return min(f for f in FLOAT_FORMATS if RegisterCodec(f).pack_float(-1.2345e-6) == words)
+
+
+_DISTINCT_FORMATS = sorted({canonical_format(f) for f in FLOAT_FORMATS})
+
+
+def _plausibility(value: float, low: float, high: float, bits: int) -> float:
+    if not math.isfinite(value) or not low <= value <= high:
+        return 0.0
+    if value != 0.0 and abs(value) < 1e-3:
+        return 0.0  # denormals and tiny values come from swapped words
+    # Real readings and settings tend to have short mantissas; a wrong
+    # byte order scatters the bits.
+    mantissa = bits & 0x7FFFFF
+    trailing = (mantissa & -mantissa).bit_length() - 1 if mantissa else 23
+    return 1.0 + trailing / 23
+
+
+def infer_float_format(words: Sequence[int], address: int = FLOAT_BLOCK[0]) -> Optional[int]:
+    """Guess the float format from a block read starting at 1-based ``address``.
+
+    Every float register in the block is decoded in each format and scored
+    for plausibility.  Formats that put the same words on the wire cannot be
+    told apart; the lowest number of such a group is returned.  Returns
+    ``None`` if the block gives no clear winner, e.g. when all floats are
+    zero.
+    """
+    floats = [
+        r
+        for r in REG.REGISTERS
+        if r.name in _RANGES and address <= r.address and r.address + 1 < address + len(words)
+    ]
+    scores: Dict[int, float] = dict.fromkeys(_DISTINCT_FORMATS, 0.0)
+    for r in floats:
+        regs = list(words[r.address - address : r.address - address + 2])
+        if not any(regs):
+            continue  # zero in every format
+        low, high = _RANGES[r.name]
+        for fmt in scores:
+            value = RegisterCodec(fmt).unpack_float(regs)
+            bits = struct.unpack(">I", struct.pack(">f", value))[0] if math.isfinite(value) else 0
+            scores[fmt] += _plausibility(value, low, high, bits)
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    if scores[ranked[0]] == 0.0 or scores[ranked[0]] == scores[ranked[1]]:
+        return None
+    return ranked[0]
+
+
+def scan_port(
+    port: str,
+    settings: Iterable[SerialSettings],
+    slave_ids: Iterable[int] = SLAVE_IDS,
+    *,
+    margin: float = PROBE_MARGIN,
+    stop_on_first: bool = True,
+    base: Optional[Config] = None,
+    transport_factory: Optional[Callable[[Config], Transport]] = None,
+) -> List[Device]:
+    """Probe ``slave_ids`` on ``port`` for each of ``settings`` in turn.
+
+    All devices on one line share its settings, so with ``stop_on_first``
+    the sweep ends after the first setting at which any device answered.
+    """
+    transport_factory = transport_factory or RTUTransport
+    ids = list(slave_ids)
+    found: List[Device] = []
+    for s in settings:
+        timing = s.timing(margin)
+        probe_timeout = timing.transaction_time(8, 7)
+        block_timeout = timing.transaction_time(8, 5 + 2 * FLOAT_BLOCK[1])
+        cfg = replace(
+            base or Config(),
+            port=port,
+            baudrate=s.baudrate,
+            parity=s.parity,
+            stopbits=s.stopbits,
+            bytesize=s.bytesize,
+            timeout=probe_timeout,
+            retries=1,
+            breaker_threshold=0,
+        )
+        try:
+            transport = transport_factory(cfg)
+        except TransportError as exc:
+            logger.warning("%s: %s", port, exc)
+            return found
+        logger.info("%s: probing %d IDs at %s", port, len(ids), s)
+        try:
+            for slave_id in ids:
+                view = transport.for_slave(slave_id, timeout=probe_timeout, retries=1)
+                try:
+                    view.read_holding_registers(REG.HEARTBEAT - 1, 1)
+                except ModbusExceptionError:
+                    pass  # an exception response still proves the device is there
+                except TransportError:
+                    continue
+                float_format = None
+                try:
+                    block = transport.for_slave(slave_id, timeout=block_timeout, retries=1)
+                    words = block.read_holding_registers(FLOAT_BLOCK[0] - 1, FLOAT_BLOCK[1])
+                    float_format = infer_float_format(words)
+                except TransportError as exc:
+                    logger.debug("%s: float block of slave %s: %s", port, slave_id, exc)
+                device = Device(port, s, slave_id, float_format)
+                logger.info("%s: found slave %s at %s", port, slave_id, s)
+                found.append(device)
+        finally:
+            transport.close()
+        if found and stop_on_first:
+            break
+    return found
+
+
+def scan(
+    ports: Sequence[str],
+    settings: Optional[Iterable[SerialSettings]] = None,
+    slave_ids: Iterable[int] = SLAVE_IDS,
+    **kwargs: object,
+) -> List[Device]:
+    """Scan several adapters in parallel; see :func:`scan_port`."""
+    candidates = list(settings) if settings is not None else candidate_settings()
+    ids = list(slave_ids)
+    if not ports:
+        return []
+    with ThreadPoolExecutor(len(ports), thread_name_prefix="vsensor-scan") as pool:
+        results = pool.map(
+            lambda p: scan_port(p, candidates, ids, **kwargs),  # type: ignore[arg-type]
+            ports,
+        )
+        return [device for devices in results for device in devices]
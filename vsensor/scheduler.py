@@ -0,0 +1,178 @@
+"""Priority scheduling of bus access.
+
+Every bus transaction belongs to a :class:`Priority` class.  Without an
+explicit class, writes count as :attr:`~Priority.CONTROL` and reads as
+:attr:`~Priority.INTERACTIVE`; pollers run their reads as
+:attr:`~Priority.BACKGROUND` through :func:`priority`, which also sets a
+deadline after which queued requests are dropped instead of sent late::
+
+    with priority(Priority.BACKGROUND, deadline=0.5):
+        client.read_telemetry()
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import metrics as _metrics
+from .errors import DeadlineExceededError, TimeoutError
+
+
+class Priority(IntEnum):
+    """Request classes, served lowest value first."""
+
+    CONTROL = 0  # operator writes
+    INTERACTIVE = 1  # reads someone is waiting for
+    BACKGROUND = 2  # polling
+
+
+# Function codes that change device state.
+WRITE_FUNCTIONS = frozenset({6, 16, 23})
+
+_request: ContextVar[Tuple[Optional[Priority], Optional[float]]] = ContextVar(
+    "vsensor_request", default=(None, None)
+)
+
+
+@contextmanager
+def priority(level: Priority, deadline: Optional[float] = None) -> Iterator[None]:
+    """Run the bus requests of the block as ``level``.
+
+    ``deadline`` is in seconds from now; requests still queued then raise
+    :class:`~vsensor.errors.DeadlineExceededError`.  Without a deadline an
+    enclosing one still applies.
+    """
+    _, outer = _request.get()
+    absolute = outer if deadline is None else time.monotonic() + deadline
+    if outer is not None and absolute is not None:
+        absolute = min(absolute, outer)
+    token = _request.set((level, absolute))
+    try:
+        yield
+    finally:
+        _request.reset(token)
+
+
+def request_class(function_code: int) -> Tuple[Priority, Optional[float]]:
+    """Return the class and absolute deadline of a request made now."""
+    level, deadline = _request.get()
+    if level is None:
+        level = Priority.CONTROL if function_code in WRITE_FUNCTIONS else Priority.INTERACTIVE
+    return level, deadline
+
+
+@dataclass
+class QueueStats:
+    """Queueing figures of one priority class."""
+
+    granted: int = 0
+    dropped: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_total / self.granted if self.granted else 0.0
+
+
+class BusScheduler:
+    """Grant bus access by priority class, first come first served within one.
+
+    Up to ``slots`` requests hold the bus at once: 1 on a serial line, the
+    pipeline depth on Modbus TCP.  Queueing delay is recorded per class in
+    :meth:`stats` and, while enabled, in :mod:`vsensor.metrics`.
+    """
+
+    def __init__(self, slots: int = 1) -> None:
+        self.slots = max(1, slots)
+        self._cond = threading.Condition(threading.Lock())
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._stats: Dict[Priority, QueueStats] = {p: QueueStats() for p in Priority}
+
+    def acquire(
+        self,
+        level: Priority = Priority.INTERACTIVE,
+        deadline: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Wait for a slot.
+
+        ``deadline`` is an absolute :func:`time.monotonic` value; when it
+        passes first :class:`~vsensor.errors.DeadlineExceededError` is
+        raised, after ``timeout`` seconds :class:`~vsensor.errors.TimeoutError`.
+        """
+        enqueued = time.monotonic()
+        limit = deadline
+        if timeout is not None:
+            limit = enqueued + timeout if limit is None else min(limit, enqueued + timeout)
+        ticket = (int(level), next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if deadline is not None and now >= deadline:
+                        raise DeadlineExceededError(f"{level.name.lower()} request expired")
+                    if self._active < self.slots and self._queue[0] == ticket:
+                        break
+                    if limit is not None and now >= limit:
+                        raise TimeoutError("modbus timeout waiting for the bus")
+                    self._cond.wait(None if limit is None else limit - now)
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                self._stats[level].dropped += 1
+                _metrics.active().record_queue_delay(
+                    level.name.lower(), time.monotonic() - enqueued, dropped=True
+                )
+                raise
+            heapq.heappop(self._queue)
+            self._active += 1
+            self._cond.notify_all()
+            waited = time.monotonic() - enqueued
+            stats = self._stats[level]
+            stats.granted += 1
+            stats.wait_total += waited
+            stats.wait_max = max(stats.wait_max, waited)
+        _metrics.active().record_queue_delay(level.name.lower(), waited)
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(
+        self,
+        level: Priority = Priority.INTERACTIVE,
+        deadline: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[None]:
+        """Hold a slot for the duration of the block."""
+        self.acquire(level, deadline, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> Dict[Priority, QueueStats]:
+        """Return a copy of the queueing figures per class."""
+        with self._cond:
+            return {p: replace(s) for p, s in self._stats.items()}
@@ -0,0 +1,148 @@
+"""Simulated transport that models Modbus RTU wire timing."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional
+
+from .config import Config
+from .metrics import rtu_frame_sizes
+from .transport import FakeTransport, Transport
+
+
+@dataclass(frozen=True)
+class WireTiming:
+    """Timing model of one RTU line.
+
+    A character is start bit + data bits + optional parity bit + stop bits.
+    Frames are separated by the 3.5 character silent interval, which the
+    Modbus specification fixes at 1.75 ms above 19200 baud.  ``turnaround``
+    is the time the slave needs between request and response.
+    """
+
+    baudrate: int = 9600
+    bytesize: int = 8
+    parity: str = "N"
+    stopbits: int = 1
+    turnaround: float = 0.005
+
+    @classmethod
+    def from_config(cls, cfg: Config, turnaround: float = 0.005) -> "WireTiming":
+        return cls(cfg.baudrate, cfg.bytesize, cfg.parity, cfg.stopbits, turnaround)
+
+    @property
+    def bits_per_char(self) -> int:
+        return 1 + self.bytesize + (0 if self.parity.upper() == "N" else 1) + self.stopbits
+
+    @property
+    def char_time(self) -> float:
+        return self.bits_per_char / self.baudrate
+
+    @property
+    def frame_gap(self) -> float:
+        return 0.00175 if self.baudrate > 19200 else 3.5 * self.char_time
+
+    def frame_time(self, nbytes: int) -> float:
+        return nbytes * self.char_time
+
+    def transaction_time(self, request_bytes: int, response_bytes: int) -> float:
+        """Bus time of one request/response exchange including silent intervals."""
+        return (
+            self.frame_time(request_bytes)
+            + self.frame_gap
+            + self.turnaround
+            + self.frame_time(response_bytes)
+            + self.frame_gap
+        )
+
+
+class _Line:
+    """State shared by all simulated slaves on one line."""
+
+    def __init__(self, timing: WireTiming, sleep: Optional[Callable[[float], None]]) -> None:
+        self.timing = timing
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.bus_time = 0.0
+        self.transactions = 0
+        self.bytes = 0
+
+    def exchange(self, function_code: int, count: int) -> None:
+        request, response = rtu_frame_sizes(function_code, count)
+        duration = self.timing.transaction_time(request, response)
+        with self.lock:
+            if self.sleep is not None:
+                self.sleep(duration)
+            self.bus_time += duration
+            self.transactions += 1
+            self.bytes += request + response
+
+
+class SimulatedTransport(FakeTransport):
+    """:class:`FakeTransport` that occupies the line as long as real RTU would.
+
+    With ``realtime=False`` no time passes; the simulated bus time is only
+    accumulated in :attr:`bus_time`, which keeps tests fast.  Views returned
+    by :meth:`for_slave` share the line, so multi-drop polling is serialised
+    exactly like on a real RS-485 bus.
+    """
+
+    def __init__(
+        self,
+        cfg: Optional[Config] = None,
+        timing: Optional[WireTiming] = None,
+        realtime: bool = True,
+        _line: Optional[_Line] = None,
+    ) -> None:
+        super().__init__(cfg)
+        if _line is None:
+            timing = timing or (WireTiming.from_config(cfg) if cfg else WireTiming())
+            _line = _Line(timing, time.sleep if realtime else None)
+        self._line = _line
+
+    @property
+    def timing(self) -> WireTiming:
+        return self._line.timing
+
+    @property
+    def bus_time(self) -> float:
+        """Total simulated seconds the line has been busy."""
+        return self._line.bus_time
+
+    @property
+    def transactions(self) -> int:
+        return self._line.transactions
+
+    def read_holding_registers(self, address: int, count: int) -> List[int]:
+        self._line.exchange(3, count)
+        return super().read_holding_registers(address, count)
+
+    def write_register(self, address: int, value: int) -> None:
+        self._line.exchange(6, 1)
+        super().write_register(address, value)
+
+    def write_registers(self, address: int, values: Iterable[int]) -> None:
+        values = list(values)
+        self._line.exchange(16, len(values))
+        super().write_registers(address, values)
+
+    def read_write_registers(
+        self, read_address: int, read_count: int, write_address: int, values: Iterable[int]
+    ) -> List[int]:
+        self._line.exchange(23, read_count)
+        # One FC23 transaction: touch the registers without billing FC16 + FC03.
+        FakeTransport.write_registers(self, write_address, values)
+        return FakeTransport.read_holding_registers(self, read_address, read_count)
+
+    def for_slave(
+        self, slave_id: int, timeout: Optional[float] = None, retries: Optional[int] = None
+    ) -> Transport:
+        if slave_id == self.slave_id:
+            return self
+        if slave_id not in self._slaves:
+            sim = SimulatedTransport(_line=self._line)
+            sim.slave_id = slave_id
+            self._slaves[slave_id] = sim
+        return self._slaves[slave_id]
@@ -0,0 +1,138 @@
+"""Change-driven subscriptions on top of a :class:`~vsensor.poller.Poller`."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from .models import Snapshot
+
+# Channels of a snapshot: the telemetry fields and the heartbeat counter.
+CHANNELS: Tuple[str, ...] = (
+    "pressure_pa",
+    "output_percent",
+    "auto_setpoint",
+    "mode",
+    "heartbeat",
+)
+
+ChannelValue = Union[float, int]
+Deadband = Union[float, Mapping[str, float]]
+
+
+def channel_value(snap: Snapshot, channel: str) -> ChannelValue:
+    """Return the value of ``channel`` in ``snap``."""
+    if channel == "heartbeat":
+        return snap.heartbeat
+    value: ChannelValue = getattr(snap.telemetry, channel)
+    return value
+
+
+def _channels(channels: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    names = [channels] if isinstance(channels, str) else list(channels)
+    out = []
+    for name in names:
+        key = name.lower()
+        if key not in CHANNELS:
+            raise ValueError(f"unknown channel {name!r}")
+        if key not in out:
+            out.append(key)
+    if not out:
+        raise ValueError("no channels given")
+    return tuple(out)
+
+
+@dataclass(frozen=True)
+class Change:
+    """Event passed to a subscription callback.
+
+    ``values`` holds every subscribed channel, ``changed`` the channels that
+    moved beyond their deadband.  Keep-alive events have ``keepalive`` set
+    and may have no changed channels.
+    """
+
+    snapshot: Snapshot
+    values: Mapping[str, ChannelValue]
+    changed: Tuple[str, ...]
+    keepalive: bool = False
+
+
+Callback = Callable[[Change], None]
+
+
+class Subscription:
+    """Forward snapshots to ``callback`` only when subscribed channels change.
+
+    A float channel counts as changed once it differs from the last
+    delivered value by more than its deadband; ``mode`` and ``heartbeat``
+    change on any difference.  Events are at least ``min_interval`` seconds
+    apart (a change seen earlier is delivered with the first snapshot after
+    that) and at most ``max_interval`` apart, sending a keep-alive when
+    nothing changed.  The first snapshot is always delivered.
+    """
+
+    def __init__(
+        self,
+        channels: Union[str, Iterable[str]],
+        callback: Callback,
+        deadband: Deadband = 0.0,
+        min_interval: float = 0.0,
+        max_interval: Optional[float] = None,
+        on_cancel: Optional[Callable[["Subscription"], None]] = None,
+    ) -> None:
+        self.channels = _channels(channels)
+        self.callback = callback
+        if isinstance(deadband, Mapping):
+            bands = {k.lower(): float(v) for k, v in deadband.items()}
+            unknown = set(bands) - set(self.channels)
+            if unknown:
+                raise ValueError(f"deadband for unsubscribed channels {sorted(unknown)}")
+            self.deadband: Dict[str, float] = {c: bands.get(c, 0.0) for c in self.channels}
+        else:
+            self.deadband = dict.fromkeys(self.channels, float(deadband))
+        if max_interval is not None and max_interval < min_interval:
+            raise ValueError("max_interval must not be below min_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.events = 0
+        self._on_cancel = on_cancel
+        self._sent: Optional[Dict[str, ChannelValue]] = None
+        self._sent_at = 0.0
+        self.active = True
+
+    def _significant(self, channel: str, value: ChannelValue) -> bool:
+        assert self._sent is not None
+        old = self._sent[channel]
+        if isinstance(value, float):
+            return abs(value - old) > self.deadband[channel]
+        return value != old
+
+    def __call__(self, snap: Snapshot) -> Optional[Change]:
+        """Feed one snapshot; return the delivered event if any."""
+        if not self.active:
+            return None
+        values = {c: channel_value(snap, c) for c in self.channels}
+        now = snap.timestamp
+        if self._sent is None:
+            changed = self.channels
+        else:
+            elapsed = now - self._sent_at
+            changed = tuple(c for c in self.channels if self._significant(c, values[c]))
+            if changed and elapsed < self.min_interval:
+                return None
+            if not changed and (self.max_interval is None or elapsed < self.max_interval):
+                return None
+        event = Change(snap, values, changed, keepalive=not changed)
+        self._sent = values
+        self._sent_at = now
+        self.events += 1
+        self.callback(event)
+        return event
+
+    def cancel(self) -> None:
+        """Stop delivering events."""
+        if not self.active:
+            return
+        self.active = False
+        if self._on_cancel is not None:
+            self._on_cancel(self)
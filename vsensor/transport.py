@@ -3,22 +3,58 @@
 from __future__ import annotations
 
 import logging
+import socket
 import threading
-from typing import Any, Callable, Iterable, List
-
-from pymodbus.client import ModbusSerialClient
-from pymodbus.exceptions import ModbusException, ModbusIOException
-from pymodbus.framer.rtu import FramerRTU
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
+from . import framing
+from . import metrics as _metrics
+from . import registers as REG
+from .compat import (
+    PYMODBUS_NAMES,
+    client_kwargs,
+    pymodbus,
+    rtu_framer,
+    unit_kwarg,
+)
 from .config import Config
-from .errors import TimeoutError, TransportError
+from .errors import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    ModbusExceptionError,
+    TimeoutError,
+    TransportError,
+)
+from .retry import CircuitBreaker, RetryPolicy
+from .scheduler import BusScheduler, Priority, priority, request_class
 
 logger = logging.getLogger(__name__)
 
 
+def __getattr__(name: str) -> Any:
+    """Resolve the pymodbus names on first access (see :mod:`vsensor.compat`)."""
+    if name not in PYMODBUS_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = pymodbus(name)
+    return value
+
+
+def _pymodbus(name: str) -> Any:
+    # Module globals first, so tests can substitute the serial client.
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
 class Transport:
     """Abstract base class for transport implementations."""
 
+    #: Number of requests the transport can keep in flight at once.
+    pipeline_depth = 1
+
     def read_holding_registers(self, address: int, count: int) -> List[int]:
         raise NotImplementedError
 
@@ -28,74 +64,596 @@ class Transport:
     def write_registers(self, address: int, values: Iterable[int]) -> None:
         raise NotImplementedError
 
+    def read_write_registers(
+        self, read_address: int, read_count: int, write_address: int, values: Iterable[int]
+    ) -> List[int]:
+        """Write ``values`` and read registers in one FC23 transaction.
+
+        The device performs the write before the read.  Transports without
+        FC23 raise :class:`NotImplementedError`.
+        """
+        raise NotImplementedError
+
     def close(self) -> None:  # pragma: no cover - default
         """Close transport resources."""
 
+    def for_slave(
+        self, slave_id: int, timeout: Optional[float] = None, retries: Optional[int] = None
+    ) -> "Transport":
+        """Return a view addressing ``slave_id`` on the same bus.
+
+        ``timeout`` and ``retries`` override the transport defaults for
+        requests made through the view.  Closing a view leaves the bus open.
+        """
+        raise NotImplementedError
+
+
+def _outcome(exc: BaseException) -> str:
+    """Classify a failed transaction for :mod:`vsensor.metrics`."""
+    if isinstance(exc, CircuitOpenError):
+        return _metrics.CIRCUIT_OPEN
+    if isinstance(exc, DeadlineExceededError):
+        return _metrics.DROPPED
+    if isinstance(exc, TimeoutError):
+        return _metrics.TIMEOUT
+    if isinstance(exc, ModbusExceptionError):
+        return _metrics.EXCEPTION
+    return _metrics.ERROR
+
 
-class RTUTransport(Transport):
-    """Serial RTU transport based on pymodbus."""
-
-    def __init__(self, cfg: Config) -> None:
-        self._client = ModbusSerialClient(
-            port=cfg.port,
-            baudrate=cfg.baudrate,
-            parity=cfg.parity,
-            stopbits=cfg.stopbits,
-            bytesize=cfg.bytesize,
-            timeout=cfg.timeout,
-            close_comm_on_error=True,
-            framer=FramerRTU,  # type: ignore[arg-type]
-        )  # type: ignore[call-arg]
+class _ManagedTransport(Transport):
+    """Retry, circuit breaker and metrics handling shared by the bus transports.
+
+    The request methods accept the keyword overrides ``slave``, ``timeout``
+    and ``retries``; :meth:`for_slave` binds them into a reusable view.
+
+    Failed requests are retried according to ``policy`` (by default
+    :meth:`Config.retry_policy`).  Each slave gets a
+    :class:`~vsensor.retry.CircuitBreaker` unless ``cfg.breaker_threshold``
+    is 0; open breakers probe HEARTBEAT in the background.
+
+    Bus access is granted by :attr:`scheduler` in priority order, see
+    :mod:`vsensor.scheduler`.
+    """
+
+    scheduler: BusScheduler
+
+    def __init__(self, cfg: Config, policy: Optional[RetryPolicy] = None) -> None:
         self._slave_id = cfg.slave_id
-        self._lock = threading.Lock()
-        self._retries = 3
+        self._timeout = cfg.timeout
+        self._policy = policy or cfg.retry_policy()
+        self._breaker_threshold = cfg.breaker_threshold
+        self._breaker_reset = cfg.breaker_reset
+        self._breakers: dict[int, CircuitBreaker] = {}
+
+    def breaker(self, slave_id: int) -> Optional[CircuitBreaker]:
+        """Return the circuit breaker guarding ``slave_id``."""
+        if self._breaker_threshold <= 0:
+            return None
+        breaker = self._breakers.get(slave_id)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                self._breaker_threshold,
+                self._breaker_reset,
+                probe=lambda: self._background_probe(slave_id),
+                name=f"slave {slave_id}",
+            )
+            self._breakers[slave_id] = breaker
+        return breaker
+
+    def _background_probe(self, slave_id: int) -> None:
+        with priority(Priority.BACKGROUND):
+            self._probe(slave_id)
+
+    def _probe(self, slave_id: int) -> None:
+        raise NotImplementedError
+
+    def _run(
+        self,
+        attempt: Callable[[Optional[float]], Any],
+        fc: int,
+        slave: int,
+        address: int,
+        count: int,
+        retries: Optional[int] = None,
+    ) -> Any:
+        """Run ``attempt`` under the retry policy, breaker and metrics.
+
+        ``attempt`` gets the deadline budget left (see
+        :meth:`RetryPolicy.run_timed`); ``address`` is the 0-based start
+        register of the transaction.
+        """
+        policy = self._policy
+        if retries is not None:
+            policy = replace(policy, max_attempts=max(1, retries))
+
+        attempts = 0
+
+        def counted(budget: Optional[float]) -> Any:
+            nonlocal attempts
+            attempts += 1
+            return attempt(budget)
+
+        def operation() -> Any:
+            return policy.run_timed(counted)
+
+        breaker = self.breaker(slave)
+        metrics = _metrics.active()
+        if not metrics.enabled:
+            return breaker.call(operation) if breaker is not None else operation()
+
+        started = time.perf_counter()
+        outcome = _metrics.OK
+        try:
+            return breaker.call(operation) if breaker is not None else operation()
+        except Exception as exc:
+            outcome = _outcome(exc)
+            raise
+        finally:
+            metrics.record_transaction(
+                fc, slave, address + 1, count, time.perf_counter() - started, attempts, outcome
+            )
+
+    def for_slave(
+        self, slave_id: int, timeout: Optional[float] = None, retries: Optional[int] = None
+    ) -> Transport:
+        return SlaveTransport(self, slave_id, timeout=timeout, retries=retries)
+
+    def _close_breakers(self) -> None:
+        for breaker in self._breakers.values():
+            breaker.close()
+
+
+def _bounded(
+    timeout: Optional[float], default: float, budget: Optional[float]
+) -> Optional[float]:
+    """Return the attempt timeout, cut down to the deadline ``budget``."""
+    if budget is None:
+        return timeout
+    return min(default if timeout is None else timeout, budget)
+
+
+class RTUTransport(_ManagedTransport):
+    """Serial RTU transport based on pymodbus.
+
+    The bus is held for single attempts only and released while backing
+    off between retries, so a control write never waits behind queued
+    reads, only for the transaction in progress.
+    """
+
+    def __init__(self, cfg: Config, policy: Optional[RetryPolicy] = None) -> None:
+        super().__init__(cfg, policy)
+        client_cls = _pymodbus("ModbusSerialClient")
+        self._client = client_cls(
+            **client_kwargs(
+                client_cls,
+                port=cfg.port,
+                baudrate=cfg.baudrate,
+                parity=cfg.parity,
+                stopbits=cfg.stopbits,
+                bytesize=cfg.bytesize,
+                timeout=cfg.timeout,
+                retries=0,
+                close_comm_on_error=True,
+                framer=rtu_framer(),
+            )
+        )
+        self._unit = unit_kwarg(self._client)
+        self.scheduler = BusScheduler()
         if not self._client.connect():
             raise TransportError(f"Serial connection failed on {cfg.port}")
 
-    def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
-        for attempt in range(1, self._retries + 1):
+    @contextmanager
+    def _timeout_override(self, timeout: Optional[float]) -> Iterator[None]:
+        """Temporarily change the response timeout of the serial client."""
+        if timeout is None or timeout == self._timeout:
+            yield
+            return
+        params = getattr(self._client, "comm_params", None)
+        sock = getattr(self._client, "socket", None)
+        if params is not None:
+            params.timeout_connect = timeout
+        if sock is not None:
+            sock.timeout = timeout
+        try:
+            yield
+        finally:
+            if params is not None:
+                params.timeout_connect = self._timeout
+            if sock is not None:
+                sock.timeout = self._timeout
+
+    def _probe(self, slave_id: int) -> None:
+        self._attempt(
+            self._client.read_holding_registers,
+            3,
+            slave_id,
+            None,
+            {"address": REG.HEARTBEAT - 1, "count": 1},
+        )
+
+    def _attempt(
+        self,
+        func: Callable[..., Any],
+        fc: int,
+        slave: int,
+        timeout: Optional[float],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        with self.scheduler.slot(*request_class(fc)), self._timeout_override(timeout):
+            try:
+                result = func(**kwargs, **{self._unit: slave})
+            except _pymodbus("ModbusIOException") as exc:
+                raise TimeoutError("modbus timeout") from exc
+            except _pymodbus("ModbusException") as exc:
+                raise TransportError(str(exc)) from exc
+        if result is None:
+            raise TimeoutError("modbus timeout")
+        if result.isError():
+            raise ModbusExceptionError(str(result), getattr(result, "exception_code", None))
+        return result
+
+    def _call(
+        self,
+        func: Callable[..., Any],
+        fc: int,
+        slave: Optional[int] = None,
+        retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        slave = self._slave_id if slave is None else slave
+        count = (
+            kwargs.get("count") or kwargs.get("read_count") or len(kwargs.get("values") or ()) or 1
+        )
+        address = kwargs["address"] if "address" in kwargs else kwargs["write_address"]
+        return self._run(
+            lambda budget: self._attempt(
+                func, fc, slave, _bounded(timeout, self._timeout, budget), kwargs
+            ),
+            fc,
+            slave,
+            address,
+            count,
+            retries,
+        )
+
+    def read_holding_registers(self, address: int, count: int, **opts: Any) -> List[int]:
+        rr = self._call(
+            self._client.read_holding_registers, 3, address=address, count=count, **opts
+        )
+        return list(rr.registers)
+
+    def write_register(self, address: int, value: int, **opts: Any) -> None:
+        self._call(self._client.write_register, 6, address=address, value=value, **opts)
+
+    def write_registers(self, address: int, values: Iterable[int], **opts: Any) -> None:
+        self._call(
+            self._client.write_registers, 16, address=address, values=list(values), **opts
+        )
+
+    def read_write_registers(
+        self,
+        read_address: int,
+        read_count: int,
+        write_address: int,
+        values: Iterable[int],
+        **opts: Any,
+    ) -> List[int]:
+        rr = self._call(
+            self._client.readwrite_registers,
+            23,
+            read_address=read_address,
+            read_count=read_count,
+            write_address=write_address,
+            values=list(values),
+            **opts,
+        )
+        return list(rr.registers)
+
+    def close(self) -> None:
+        self._close_breakers()
+        with self.scheduler.slot(Priority.CONTROL):
+            self._client.close()
+
+
+def _registers(pdu: bytes) -> List[int]:
+    """Decode a read response, treating a garbled PDU as a transport error."""
+    try:
+        return framing.register_values(pdu)
+    except ValueError as exc:
+        raise TransportError(f"{exc}: {pdu.hex()}") from exc
+
+
+class TcpTransport(_ManagedTransport):
+    """Modbus TCP transport keeping several requests in flight.
+
+    Requests are tagged with MBAP transaction IDs and a reader thread hands
+    each response to the caller waiting for it, so up to
+    ``cfg.pipeline_depth`` callers (typically views of different unit IDs
+    behind one gateway) share the connection without waiting for each
+    other's round trip.  The connection is re-established on the next
+    request after it was lost.
+    """
+
+    def __init__(self, cfg: Config, policy: Optional[RetryPolicy] = None) -> None:
+        super().__init__(cfg, policy)
+        self.host = cfg.host
+        self.port = cfg.tcp_port
+        self.pipeline_depth = max(1, cfg.pipeline_depth)
+        self.scheduler = BusScheduler(self.pipeline_depth)
+        self._send_lock = threading.Lock()
+        self._conn_lock = threading.Lock()
+        self._pending: dict[int, Future[bytes]] = {}
+        self._next_tid = 0
+        self._sock: Optional[socket.socket] = None
+        self._connect()
+
+    def _connect(self) -> socket.socket:
+        with self._conn_lock:
+            if self._sock is not None:
+                return self._sock
             try:
-                result = func(*args, **kwargs, slave=self._slave_id)
-            except ModbusIOException as exc:
-                logger.debug("transport timeout (attempt %s/%s): %s", attempt, self._retries, exc)
-                if attempt == self._retries:
-                    raise TimeoutError("modbus timeout") from exc
-                continue
-            except ModbusException as exc:
-                logger.debug("transport error (attempt %s/%s): %s", attempt, self._retries, exc)
-                if attempt == self._retries:
-                    raise TransportError(str(exc)) from exc
-                continue
-            if result is None:
-                if attempt == self._retries:
-                    raise TimeoutError("modbus timeout")
-                continue
-            if result.isError():
-                if attempt == self._retries:
-                    raise TransportError(str(result))
-                continue
-            return result
-        raise TransportError("modbus error")
+                sock = socket.create_connection((self.host, self.port), timeout=self._timeout)
+            except OSError as exc:
+                raise TransportError(f"TCP connection to {self.host}:{self.port} failed") from exc
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(None)
+            self._sock = sock
+            threading.Thread(
+                target=self._read_loop, args=(sock,), name="vsensor-tcp-reader", daemon=True
+            ).start()
+            return sock
+
+    def _disconnect(self, sock: socket.socket, reason: str) -> None:
+        """Drop ``sock`` and fail every request still waiting on it."""
+        with self._conn_lock:
+            if self._sock is sock:
+                self._sock = None
+        try:
+            sock.close()
+        except OSError:  # pragma: no cover - already closed
+            pass
+        with self._send_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(TransportError(reason))
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, n: int) -> bytes:
+        data = b""
+        while len(data) < n:
+            chunk = sock.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("connection closed by peer")
+            data += chunk
+        return data
+
+    def _encode(self, tid: int, unit: int, pdu: bytes) -> bytes:
+        return framing.encode_mbap(tid, unit, pdu)
+
+    def _read_response(self, sock: socket.socket) -> Tuple[int, bytes]:
+        """Read one response and return ``(transaction id, pdu)``."""
+        tid, protocol, length, _ = framing.MBAP_HEADER.unpack(
+            self._recv_exact(sock, framing.MBAP_HEADER.size)
+        )
+        # The stream cannot be resynchronised after a bad header.
+        if protocol != 0 or not 2 <= length <= framing.MAX_MBAP_LENGTH:
+            raise ValueError(f"malformed MBAP header (protocol {protocol}, length {length})")
+        return tid, self._recv_exact(sock, length - 1)
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        try:
+            while True:
+                tid, pdu = self._read_response(sock)
+                with self._send_lock:
+                    future = self._pending.pop(tid, None)
+                if future is None:
+                    logger.debug("dropping response to abandoned transaction %s", tid)
+                elif not future.done():
+                    future.set_result(pdu)
+        except (OSError, ValueError) as exc:
+            self._disconnect(sock, f"connection lost: {exc}")
+        except Exception as exc:
+            # Without its reader the connection is useless; never leave callers waiting.
+            logger.exception("TCP reader failed")
+            self._disconnect(sock, f"reader failed: {exc}")
+
+    def _allocate_tid(self) -> int:
+        self._next_tid = self._next_tid % 0xFFFF + 1
+        return self._next_tid
+
+    def _transact(self, unit: int, pdu: bytes, timeout: Optional[float]) -> bytes:
+        timeout = self._timeout if timeout is None else timeout
+        self.scheduler.acquire(*request_class(pdu[0]), timeout=timeout)
+        try:
+            sock = self._connect()
+            future: Future[bytes] = Future()
+            with self._send_lock:
+                tid = self._allocate_tid()
+                self._pending[tid] = future
+                try:
+                    sock.sendall(self._encode(tid, unit, pdu))
+                except OSError as exc:
+                    del self._pending[tid]
+                    raise TransportError(f"send failed: {exc}") from exc
+            try:
+                response = future.result(timeout)
+            except FutureTimeout as exc:
+                with self._send_lock:
+                    self._pending.pop(tid, None)
+                self._abandoned(sock)
+                raise TimeoutError("modbus timeout") from exc
+        finally:
+            self.scheduler.release()
+        if response[0] & 0x80:
+            code = response[1] if len(response) > 1 else None
+            raise ModbusExceptionError(f"exception response {response.hex()}", code)
+        return response
+
+    def _abandoned(self, sock: socket.socket) -> None:
+        """Hook for a transaction that timed out; late MBAP replies are ignored."""
+
+    def _call(
+        self,
+        fc: int,
+        pdu: bytes,
+        address: int,
+        count: int,
+        slave: Optional[int] = None,
+        retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        unit = self._slave_id if slave is None else slave
+        return self._run(  # type: ignore[no-any-return]
+            lambda budget: self._transact(unit, pdu, _bounded(timeout, self._timeout, budget)),
+            fc,
+            unit,
+            address,
+            count,
+            retries,
+        )
+
+    def _probe(self, slave_id: int) -> None:
+        self._transact(slave_id, framing.read_registers_pdu(REG.HEARTBEAT - 1, 1), None)
+
+    def read_holding_registers(self, address: int, count: int, **opts: Any) -> List[int]:
+        pdu = framing.read_registers_pdu(address, count)
+        return _registers(self._call(3, pdu, address, count, **opts))
+
+    def write_register(self, address: int, value: int, **opts: Any) -> None:
+        self._call(6, framing.write_register_pdu(address, value), address, 1, **opts)
+
+    def write_registers(self, address: int, values: Iterable[int], **opts: Any) -> None:
+        values = list(values)
+        pdu = framing.write_registers_pdu(address, values)
+        self._call(16, pdu, address, len(values), **opts)
+
+    def read_write_registers(
+        self,
+        read_address: int,
+        read_count: int,
+        write_address: int,
+        values: Iterable[int],
+        **opts: Any,
+    ) -> List[int]:
+        pdu = framing.read_write_registers_pdu(
+            read_address, read_count, write_address, list(values)
+        )
+        return _registers(self._call(23, pdu, write_address, read_count, **opts))
+
+    def close(self) -> None:
+        self._close_breakers()
+        sock = self._sock
+        if sock is not None:
+            self._disconnect(sock, "transport closed")
+
+
+class RtuOverTcpTransport(TcpTransport):
+    """RTU frames tunnelled through a raw TCP socket (transparent gateways).
+
+    RTU frames carry no transaction ID, so only one request is in flight and
+    the connection is reset after a timeout to discard late replies.
+    """
+
+    def __init__(self, cfg: Config, policy: Optional[RetryPolicy] = None) -> None:
+        super().__init__(replace(cfg, pipeline_depth=1), policy)
+
+    def _encode(self, tid: int, unit: int, pdu: bytes) -> bytes:
+        return framing.encode_frame(unit, pdu)
+
+    def _read_response(self, sock: socket.socket) -> Tuple[int, bytes]:
+        frame = self._recv_exact(sock, 3)
+        length = framing.response_length(frame) or len(frame)
+        frame += self._recv_exact(sock, length - len(frame))
+        _, pdu = framing.decode_frame(frame)
+        # The single in-flight request always holds the newest transaction ID.
+        return self._next_tid, pdu
+
+    def _abandoned(self, sock: socket.socket) -> None:
+        self._disconnect(sock, "reset after timeout")
+
+
+def _daemon_transport(cfg: Config) -> Transport:
+    from .daemon import DaemonTransport
+
+    return DaemonTransport(cfg)
+
+
+TRANSPORTS: dict[str, Callable[[Config], Transport]] = {
+    "rtu": RTUTransport,
+    "tcp": TcpTransport,
+    "rtu-over-tcp": RtuOverTcpTransport,
+    "daemon": _daemon_transport,
+}
+
+
+def create_transport(cfg: Config) -> Transport:
+    """Open the transport selected by ``cfg.transport``.
+
+    For ``rtu`` a running ``vsensord`` serving the port is used instead of
+    opening the port, see :mod:`vsensor.daemon`.
+    """
+    if cfg.transport.lower() == "rtu":
+        from .daemon import connect_daemon
+
+        daemon = connect_daemon(cfg)
+        if daemon is not None:
+            return daemon
+    try:
+        factory = TRANSPORTS[cfg.transport.lower()]
+    except KeyError:
+        raise ValueError(
+            f"unknown transport {cfg.transport!r}, expected one of {', '.join(TRANSPORTS)}"
+        ) from None
+    return factory(cfg)
+
+
+class SlaveTransport(Transport):
+    """Lightweight view of a bus transport bound to one slave ID.
+
+    All views share the connection and lock of their parent transport.
+    """
+
+    def __init__(
+        self,
+        bus: Transport,
+        slave_id: int,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> None:
+        self.bus = bus
+        self.slave_id = slave_id
+        self._opts: dict[str, Any] = {"slave": slave_id, "timeout": timeout, "retries": retries}
+
+    @property
+    def pipeline_depth(self) -> int:  # type: ignore[override]
+        return self.bus.pipeline_depth
 
     def read_holding_registers(self, address: int, count: int) -> List[int]:
-        with self._lock:
-            rr = self._call(self._client.read_holding_registers, address=address, count=count)
-            return list(rr.registers)
+        return self.bus.read_holding_registers(address, count, **self._opts)
 
     def write_register(self, address: int, value: int) -> None:
-        with self._lock:
-            self._call(self._client.write_register, address=address, value=value)
+        self.bus.write_register(address, value, **self._opts)
 
     def write_registers(self, address: int, values: Iterable[int]) -> None:
-        with self._lock:
-            self._call(self._client.write_registers, address=address, values=list(values))
+        self.bus.write_registers(address, values, **self._opts)
+
+    def read_write_registers(
+        self, read_address: int, read_count: int, write_address: int, values: Iterable[int]
+    ) -> List[int]:
+        return self.bus.read_write_registers(
+            read_address, read_count, write_address, values, **self._opts
+        )
+
+    def for_slave(
+        self, slave_id: int, timeout: Optional[float] = None, retries: Optional[int] = None
+    ) -> Transport:
+        return self.bus.for_slave(slave_id, timeout=timeout, retries=retries)
 
     def close(self) -> None:
-        with self._lock:
-            try:
-                self._client.close()  # type: ignore[no-untyped-call]
-            finally:
-                pass
+        """Views do not own the port; closing them is a no-op."""
 
 
 class FakeTransport(Transport):
@@ -104,15 +662,13 @@ class FakeTransport(Transport):
     def __init__(self, cfg: Config | None = None) -> None:
         self._regs: dict[int, int] = {}
         self._hb = 0
+        self._slaves: dict[int, FakeTransport] = {}
+        self.slave_id = cfg.slave_id if cfg is not None else 1
 
     def read_holding_registers(self, address: int, count: int) -> List[int]:
-        try:
-            from . import registers as REG
-            if address == REG.HEARTBEAT - 1:
-                self._hb = (self._hb + 1) & 0xFFFF
-                self._regs[address] = self._hb
-        except Exception:  # pragma: no cover - optional
-            pass
+        if address <= REG.HEARTBEAT - 1 < address + count:
+            self._hb = (self._hb + 1) & 0xFFFF
+            self._regs[REG.HEARTBEAT - 1] = self._hb
         return [self._regs.get(address + i, 0) for i in range(count)]
 
     def write_register(self, address: int, value: int) -> None:
@@ -122,5 +678,23 @@ class FakeTransport(Transport):
         for i, v in enumerate(values):
             self._regs[address + i] = int(v)
 
+    def read_write_registers(
+        self, read_address: int, read_count: int, write_address: int, values: Iterable[int]
+    ) -> List[int]:
+        self.write_registers(write_address, values)
+        return self.read_holding_registers(read_address, read_count)
+
+    def for_slave(
+        self, slave_id: int, timeout: Optional[float] = None, retries: Optional[int] = None
+    ) -> Transport:
+        """Return the simulated device with ``slave_id``, creating it on demand."""
+        if slave_id == self.slave_id:
+            return self
+        if slave_id not in self._slaves:
+            sim = FakeTransport()
+            sim.slave_id = slave_id
+            self._slaves[slave_id] = sim
+        return self._slaves[slave_id]
+
     def close(self) -> None:  # pragma: no cover - nothing to do
         pass
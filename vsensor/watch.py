@@ -0,0 +1,186 @@
+"""Stream register values over one open connection as NDJSON or CSV."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
+
+from . import registers as REG
+from .client import TELEMETRY_REGISTERS, VSensorClient
+from .codec import Value
+from .errors import VSensorError
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv")
+DEFAULT_CHANNELS = TELEMETRY_REGISTERS + ("HEARTBEAT",)
+
+
+@dataclass
+class WatchStats:
+    """Outcome of a :func:`watch` run."""
+
+    samples: int = 0
+    dropped: int = 0
+    elapsed: float = 0.0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def rate(self) -> float:
+        """Samples per second actually achieved."""
+        return self.samples / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        text = (
+            f"{self.samples} samples in {self.elapsed:.1f} s ({self.rate:.1f}/s), "
+            f"{self.error_count} errors, {self.dropped} dropped"
+        )
+        if self.errors:
+            text += " (" + ", ".join(f"{k}: {n}" for k, n in sorted(self.errors.items())) + ")"
+        return text
+
+
+class _Formatter:
+    def __init__(self, fmt: str, names: List[str]) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt!r}")
+        self.fmt = fmt
+        self.names = names
+
+    def header(self) -> Optional[str]:
+        if self.fmt != "csv":
+            return None
+        return self._csv(["ts", "seq", *self.names])
+
+    def line(self, ts: float, seq: int, values: Dict[str, Value]) -> str:
+        if self.fmt == "csv":
+            return self._csv([f"{ts:.6f}", seq, *(values[n] for n in self.names)])
+        return json.dumps({"ts": round(ts, 6), "seq": seq, **values}) + "\n"
+
+    @staticmethod
+    def _csv(row: Iterable[object]) -> str:
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerow(row)
+        return buf.getvalue()
+
+
+class _Writer(threading.Thread):
+    """Write queued lines to ``out``; flush every ``flush_every`` lines and when idle."""
+
+    def __init__(self, out: TextIO, buffer: int, flush_every: int, stop: threading.Event) -> None:
+        super().__init__(name="vsensor-watch-writer", daemon=True)
+        self.out = out
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max(1, buffer))
+        self.flush_every = max(1, flush_every)
+        self.stop = stop
+        self.broken = False
+
+    def run(self) -> None:
+        pending = 0
+        try:
+            while True:
+                line = self.lines.get()
+                if line is None:
+                    break
+                self.out.write(line)
+                pending += 1
+                if pending >= self.flush_every or self.lines.empty():
+                    self.out.flush()
+                    pending = 0
+            self.out.flush()
+        except (BrokenPipeError, ValueError):
+            # Reader went away (e.g. ``| head``): stop polling.
+            self.broken = True
+            self.stop.set()
+
+    def put(self, line: str) -> bool:
+        """Queue ``line``; return ``False`` if the buffer is full."""
+        try:
+            self.lines.put_nowait(line)
+        except queue.Full:
+            return False
+        return True
+
+    def finish(self) -> None:
+        if not self.broken:
+            self.lines.put(None)
+        self.join()
+
+
+def watch(
+    client: VSensorClient,
+    channels: Iterable[str] = DEFAULT_CHANNELS,
+    out: Optional[TextIO] = None,
+    *,
+    rate: float = 1.0,
+    fmt: str = "ndjson",
+    count: Optional[int] = None,
+    duration: Optional[float] = None,
+    buffer: int = 1000,
+    flush_every: int = 1,
+    stop: Optional[threading.Event] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> WatchStats:
+    """Poll ``channels`` on the open ``client`` and stream one line per sample.
+
+    ``rate`` is in samples per second (0 polls as fast as the bus allows);
+    the schedule does not drift and samples missed by slow reads are
+    skipped.  Lines go through a queue of ``buffer`` lines to ``out``; when
+    the consumer falls behind, new samples are dropped and counted instead
+    of stalling the poll loop.  Stops after ``count`` polls, ``duration``
+    seconds, on Ctrl-C or when ``stop`` is set.
+    """
+    names = [REG.lookup(c).name for c in channels]
+    formatter = _Formatter(fmt, names)
+    stop = stop or threading.Event()
+    writer = _Writer(out or sys.stdout, buffer, flush_every, stop)
+    stats = WatchStats()
+    header = formatter.header()
+    if header is not None:
+        writer.put(header)
+    writer.start()
+    period = 1.0 / rate if rate > 0 else 0.0
+    started = clock()
+    next_at = started
+    seq = 0
+    try:
+        while not stop.is_set():
+            if count is not None and seq >= count:
+                break
+            if duration is not None and clock() - started >= duration:
+                break
+            try:
+                values = client.read(*names)
+            except (VSensorError, ValueError) as exc:
+                name = type(exc).__name__
+                stats.errors[name] = stats.errors.get(name, 0) + 1
+                logger.debug("read failed: %s", exc)
+            else:
+                stats.samples += 1
+                if not writer.put(formatter.line(time.time(), seq, values)):
+                    stats.dropped += 1
+            seq += 1
+            if period:
+                next_at += period
+                now = clock()
+                if next_at < now:  # fell behind: skip the missed slots
+                    next_at += period * ((now - next_at) // period + 1)
+                stop.wait(next_at - now)
+    except KeyboardInterrupt:
+        pass  # Ctrl-C ends the stream; the summary still counts
+    finally:
+        stats.elapsed = clock() - started
+        writer.finish()
+    return stats